@@ -0,0 +1,153 @@
+"""
+Teste de carga da autenticação: cliente Redis síncrono contra o pool assíncrono.
+
+Monta uma aplicação FastAPI mínima com uma rota protegida por dependência que
+faz o mesmo trabalho do get_current_user antes da consulta ao banco: consulta a
+blacklist no Redis e decodifica o JWT. No cenário "síncrono" a consulta usa um
+redis.StrictRedis dentro da dependência assíncrona, como antes, bloqueando o
+event loop durante a ida ao Redis; no "assíncrono" usa o cliente compartilhado
+de src/redis_client.py. As requisições são enviadas em processo pelo
+ASGITransport do httpx, sem rede entre cliente e aplicação, então a diferença
+medida vem apenas do acesso ao Redis e cresce com a latência até ele.
+
+Uso:
+    python -m benchmarks.auth_benchmark --redis-host localhost --concurrency 100
+    python -m benchmarks.auth_benchmark --requests 20000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+import redis
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src import redis_client
+from src.security import create_access_token, decode_access_token
+
+bearer_scheme = HTTPBearer()
+
+
+def build_app(sync_client: redis.StrictRedis) -> FastAPI:
+    app = FastAPI()
+
+    async def user_sync(token: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+        if sync_client.exists(f"blacklist:{token.credentials}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        return decode_access_token(token.credentials)["sub"]
+
+    async def user_async(token: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+        if await redis_client.get_redis().exists(f"blacklist:{token.credentials}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        return decode_access_token(token.credentials)["sub"]
+
+    @app.get("/sincrono")
+    async def sincrono(sub: str = Depends(user_sync)):
+        return {"sub": sub}
+
+    @app.get("/assincrono")
+    async def assincrono(sub: str = Depends(user_async)):
+        return {"sub": sub}
+
+    return app
+
+
+async def run_scenario(app: FastAPI, path: str, args, token: str) -> dict:
+    latencies, errors = [], 0
+    remaining = iter(range(args.requests))
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        # Aquecimento: abre as conexões com o Redis antes de medir
+        await client.get(path, headers=headers)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+    return {
+        "requisicoes": len(latencies),
+        "vazao": len(latencies) / elapsed,
+        "p50": percentile(0.50) if latencies else 0.0,
+        "p95": percentile(0.95) if latencies else 0.0,
+        "p99": percentile(0.99) if latencies else 0.0,
+        "media": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "erros": errors,
+    }
+
+
+def report(results: list[tuple[str, dict]]) -> None:
+    header = (
+        f"{'cliente Redis':<26} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'média ms':>9} {'erros':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, r in results:
+        print(
+            f"{name:<26} {r['vazao']:>9.1f} {r['p50']:>8.2f} {r['p95']:>8.2f} "
+            f"{r['p99']:>8.2f} {r['media']:>9.2f} {r['erros']:>6}"
+        )
+    if len(results) == 2 and results[0][1]["vazao"]:
+        ganho = results[1][1]["vazao"] / results[0][1]["vazao"]
+        print(f"\nVazão com o pool assíncrono: {ganho:.2f}x a do cliente síncrono")
+
+
+async def main_async(args) -> None:
+    redis_client.REDIS_HOST = args.redis_host
+    redis_client.REDIS_PORT = args.redis_port
+    if args.max_connections is not None:
+        redis_client.REDIS_MAX_CONNECTIONS = args.max_connections
+
+    sync_client = redis.StrictRedis(host=args.redis_host, port=args.redis_port, db=0)
+    app = build_app(sync_client)
+    token = create_access_token({"sub": "1"})
+
+    results = []
+    try:
+        for name, path in (
+            ("síncrono (StrictRedis)", "/sincrono"),
+            (f"assíncrono (pool {redis_client.REDIS_MAX_CONNECTIONS})", "/assincrono"),
+        ):
+            print(f"Executando: {name}...", file=sys.stderr)
+            results.append((name, await run_scenario(app, path, args, token)))
+    finally:
+        sync_client.close()
+        await redis_client.close_redis()
+    report(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-host", default=os.getenv("REDIS_HOST", "localhost"))
+    parser.add_argument("--redis-port", type=int, default=int(os.getenv("REDIS_PORT", "6379")))
+    parser.add_argument("--concurrency", type=int, default=50, help="Clientes simultâneos")
+    parser.add_argument("--requests", type=int, default=5000, help="Requisições por cenário")
+    parser.add_argument(
+        "--max-connections", type=int, help="Sobrescreve REDIS_MAX_CONNECTIONS"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
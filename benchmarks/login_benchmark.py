@@ -0,0 +1,133 @@
+"""
+Teste de carga do login com o Argon2 no event loop e no pool de threads dedicado.
+
+Monta uma aplicação FastAPI mínima com duas rotas: /login, que verifica uma
+senha com o pwd_context configurado pelas variáveis ARGON2_* (src/security.py),
+e /ping, uma rota leve que representa o restante do tráfego. Clientes de login e
+de ping rodam ao mesmo tempo. No cenário "no event loop" a verificação é feita
+de forma síncrona dentro do handler, como antes; no "pool dedicado" usa o
+verify_password assíncrono (PASSWORD_HASH_WORKERS threads). Mede a vazão de
+logins e a latência do ping, que mostra o quanto os logins atrasam as demais
+requisições. Não usa banco nem Redis.
+
+Uso:
+    python -m benchmarks.login_benchmark
+    python -m benchmarks.login_benchmark --login-clients 16 --ping-clients 32 --duration 15
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.security import (
+    PASSWORD_HASH_WORKERS,
+    password_hasher,
+    pwd_context,
+    verify_password,
+)
+
+SENHA = "senha-de-teste"
+
+
+def build_app(hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login-sincrono")
+    async def login_sincrono():
+        return {"ok": pwd_context.verify(SENHA, hashed)}
+
+    @app.post("/login")
+    async def login():
+        return {"ok": await verify_password(SENHA, hashed)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def run_scenario(app: FastAPI, login_path: str, args) -> dict:
+    logins, pings = [], []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + args.duration
+
+        async def login_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.post(login_path)
+                logins.append(time.perf_counter() - start)
+
+        async def ping_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/ping")
+                pings.append(time.perf_counter() - start)
+                await asyncio.sleep(args.ping_interval / 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(login_client() for _ in range(args.login_clients)),
+            *(ping_client() for _ in range(args.ping_clients)),
+        )
+        elapsed = time.perf_counter() - start
+
+    pings.sort()
+
+    def percentile(values, p):
+        return values[min(int(len(values) * p), len(values) - 1)] * 1000 if values else 0.0
+
+    return {
+        "logins_s": len(logins) / elapsed,
+        "pings_s": len(pings) / elapsed,
+        "ping_p50": percentile(pings, 0.50),
+        "ping_p95": percentile(pings, 0.95),
+        "ping_p99": percentile(pings, 0.99),
+    }
+
+
+def report(results: list[tuple[str, dict]]) -> None:
+    header = (
+        f"{'Argon2':<22} {'logins/s':>9} {'pings/s':>9} "
+        f"{'ping p50 ms':>12} {'ping p95 ms':>12} {'ping p99 ms':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, r in results:
+        print(
+            f"{name:<22} {r['logins_s']:>9.1f} {r['pings_s']:>9.1f} "
+            f"{r['ping_p50']:>12.2f} {r['ping_p95']:>12.2f} {r['ping_p99']:>12.2f}"
+        )
+    print(f"\nPool dedicado: {password_hasher.status()}")
+
+
+async def main_async(args) -> None:
+    hashed = pwd_context.hash(SENHA)
+    app = build_app(hashed)
+    results = []
+    for name, path in (
+        ("no event loop", "/login-sincrono"),
+        (f"pool dedicado ({PASSWORD_HASH_WORKERS})", "/login"),
+    ):
+        print(f"Executando: {name}...", file=sys.stderr)
+        results.append((name, await run_scenario(app, path, args)))
+    report(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--login-clients", type=int, default=8, help="Clientes fazendo login")
+    parser.add_argument("--ping-clients", type=int, default=16, help="Clientes do tráfego leve")
+    parser.add_argument(
+        "--ping-interval", type=float, default=10, help="Pausa (ms) entre pings de cada cliente"
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Segundos por cenário")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark dos motores de VAD: tempo de detecção e número de segmentos por arquivo.
+
+Por padrão gera um corpus sintético determinístico com três perfis de gravação
+(limpo, ruidoso e baixo volume) contendo vocalizações em posições conhecidas.
+Também aceita um diretório com arquivos WAV reais via --corpus.
+
+Uso:
+    python -m benchmarks.vad_benchmark
+    python -m benchmarks.vad_benchmark --files 20 --duration 60
+    python -m benchmarks.vad_benchmark --corpus ./amostras
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+from src.preprocessing.vad import VAD_ENGINES, audio_to_array, get_engine
+
+SAMPLE_RATE = 16000
+
+# (ruído de fundo dBFS, pico das vocalizações dBFS)
+PROFILES = {
+    "limpo": (-65.0, -12.0),
+    "ruidoso": (-36.0, -12.0),
+    "baixo": (-72.0, -46.0),
+}
+
+
+def _db_to_amplitude(db: float) -> float:
+    return 10 ** (db / 20)
+
+
+def synthesize(rng: np.random.Generator, duration: float, noise_db: float, peak_db: float):
+    """Gera um áudio com vocalizações harmônicas sobre ruído gaussiano."""
+    total = int(duration * SAMPLE_RATE)
+    # Ruído gaussiano com RMS = noise_db
+    signal = rng.normal(0, _db_to_amplitude(noise_db), total)
+
+    events = 0
+    cursor = rng.uniform(0.5, 1.5)
+    while True:
+        length = rng.uniform(0.3, 1.5)
+        if cursor + length > duration - 0.5:
+            break
+        n = int(length * SAMPLE_RATE)
+        t = np.arange(n) / SAMPLE_RATE
+        f0 = rng.uniform(200, 500)
+        tone = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in (1, 2, 3))
+        tone *= np.hanning(n) * _db_to_amplitude(peak_db) / np.max(np.abs(tone))
+        start = int(cursor * SAMPLE_RATE)
+        signal[start : start + n] += tone
+        events += 1
+        cursor += length + rng.uniform(0.6, 3.0)
+
+    pcm = np.clip(signal * 32767, -32768, 32767).astype(np.int16)
+    audio = AudioSegment(pcm.tobytes(), frame_rate=SAMPLE_RATE, sample_width=2, channels=1)
+    return audio, events
+
+
+def build_corpus(files: int, duration: float, seed: int):
+    rng = np.random.default_rng(seed)
+    corpus = {}
+    for profile, (noise_db, peak_db) in PROFILES.items():
+        corpus[profile] = [synthesize(rng, duration, noise_db, peak_db) for _ in range(files)]
+    return corpus
+
+
+def load_corpus(directory: str):
+    audios = [
+        (AudioSegment.from_file(path, format="wav"), None)
+        for path in sorted(Path(directory).glob("*.wav"))
+    ]
+    return {"corpus": audios}
+
+
+def run_pydub(audio: AudioSegment) -> int:
+    return len(detect_nonsilent(audio, min_silence_len=300, silence_thresh=-40))
+
+
+def run_engine(name: str, audio: AudioSegment) -> int:
+    engine = get_engine(name)
+    return len(engine.detect(audio_to_array(audio), audio.frame_rate).ranges)
+
+
+def benchmark(corpus: dict, repeat: int):
+    runners = {"pydub (legado)": run_pydub}
+    for name in sorted(VAD_ENGINES):
+        runners[name] = lambda audio, name=name: run_engine(name, audio)
+
+    header = f"{'perfil':<10} {'motor':<16} {'ms/arquivo':>11} {'segmentos':>10} {'eventos':>8}"
+    print(header)
+    print("-" * len(header))
+    for profile, audios in corpus.items():
+        known = [events for _, events in audios if events is not None]
+        expected = f"{np.mean(known):.1f}" if known else "-"
+        for label, runner in runners.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                counts = [runner(audio) for audio, _ in audios]
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{profile:<10} {label:<16} {best * 1000 / len(audios):>11.2f} "
+                f"{np.mean(counts):>10.1f} {expected:>8}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=10, help="Arquivos por perfil")
+    parser.add_argument("--duration", type=float, default=30.0, help="Duração (s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por motor")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--corpus", help="Diretório com arquivos WAV")
+    args = parser.parse_args()
+
+    corpus = (
+        load_corpus(args.corpus)
+        if args.corpus
+        else build_corpus(args.files, args.duration, args.seed)
+    )
+    benchmark(corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
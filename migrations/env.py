@@ -2,9 +2,11 @@ import asyncio
 from logging.config import fileConfig
 
 from alembic import context
-from src.database import DATABASE_URL, Base, engine, ENV_TYPE
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from src.database import DATABASE_URL, Base, ENV_TYPE
 
-from src.models import Audio, Classificacao, Participante, Usuario, Vocalizacao
+from src.models import Audio, Classificacao, ContagemAudio, Participante, Segmento, StorageOutbox, Usuario, Vocalizacao
 
 config = context.config
 if config.config_file_name is not None:
@@ -34,10 +36,15 @@ def do_run_migrations(connection):
 
 
 async def run_migrations_online() -> None:
-    connectable = engine
-
-    async with connectable.connect() as connection:
-        await connection.run_sync(do_run_migrations)
+    # Conexão única, sem pool nem statement_timeout da aplicação: migrações
+    # (índices, backfills) podem demorar mais que o limite das requisições
+    connectable = create_async_engine(DATABASE_URL, poolclass=NullPool)
+
+    try:
+        async with connectable.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+    finally:
+        await connectable.dispose()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,127 @@
+"""add contagem_audio summary table maintained by triggers
+
+Revision ID: 2f7b3e9c4d15
+Revises: 8d1f4c7a2b90
+Create Date: 2026-10-19 15:40:12.507316
+
+Os contadores são mantidos por triggers de instrução (FOR EACH STATEMENT) com
+tabelas de transição, então inserções, remoções em lote, remoções em cascata
+(usuário, participante, vocalização) e trocas de rótulo aplicam um único delta
+agregado por (participante, vocalização) na mesma transação da escrita.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7b3e9c4d15'
+down_revision: Union[str, None] = '8d1f4c7a2b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Remoções só atualizam linhas existentes: em cascatas de participante ou
+# vocalização a linha do contador já pode ter sido removida pela própria cascata.
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION contagem_audio_aplicar_delta() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO contagem_audio AS c (id_participante, id_vocalizacao, quantidade, duracao_total)
+        SELECT id_participante, id_vocalizacao, count(*), coalesce(sum(duracao), 0)
+        FROM novos
+        GROUP BY id_participante, id_vocalizacao
+        ON CONFLICT (id_participante, id_vocalizacao) DO UPDATE
+        SET quantidade = c.quantidade + EXCLUDED.quantidade,
+            duracao_total = c.duracao_total + EXCLUDED.duracao_total,
+            updated_at = now();
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE contagem_audio AS c
+        SET quantidade = c.quantidade - d.quantidade,
+            duracao_total = c.duracao_total - d.duracao_total,
+            updated_at = now()
+        FROM (
+            SELECT id_participante, id_vocalizacao,
+                   count(*) AS quantidade, coalesce(sum(duracao), 0) AS duracao_total
+            FROM antigos
+            GROUP BY id_participante, id_vocalizacao
+        ) d
+        WHERE c.id_participante = d.id_participante
+          AND c.id_vocalizacao = d.id_vocalizacao;
+    ELSE
+        INSERT INTO contagem_audio AS c (id_participante, id_vocalizacao, quantidade, duracao_total)
+        SELECT id_participante, id_vocalizacao, sum(quantidade), sum(duracao_total)
+        FROM (
+            SELECT id_participante, id_vocalizacao, 1 AS quantidade,
+                   coalesce(duracao, 0) AS duracao_total
+            FROM novos
+            UNION ALL
+            SELECT id_participante, id_vocalizacao, -1, -coalesce(duracao, 0)
+            FROM antigos
+        ) delta
+        GROUP BY id_participante, id_vocalizacao
+        HAVING sum(quantidade) <> 0 OR sum(duracao_total) <> 0
+        ON CONFLICT (id_participante, id_vocalizacao) DO UPDATE
+        SET quantidade = c.quantidade + EXCLUDED.quantidade,
+            duracao_total = c.duracao_total + EXCLUDED.duracao_total,
+            updated_at = now();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = [
+    "CREATE TRIGGER contagem_audio_insert AFTER INSERT ON audio "
+    "REFERENCING NEW TABLE AS novos "
+    "FOR EACH STATEMENT EXECUTE FUNCTION contagem_audio_aplicar_delta()",
+    "CREATE TRIGGER contagem_audio_delete AFTER DELETE ON audio "
+    "REFERENCING OLD TABLE AS antigos "
+    "FOR EACH STATEMENT EXECUTE FUNCTION contagem_audio_aplicar_delta()",
+    "CREATE TRIGGER contagem_audio_update AFTER UPDATE ON audio "
+    "REFERENCING OLD TABLE AS antigos NEW TABLE AS novos "
+    "FOR EACH STATEMENT EXECUTE FUNCTION contagem_audio_aplicar_delta()",
+]
+
+BACKFILL = """
+INSERT INTO contagem_audio (id_participante, id_vocalizacao, quantidade, duracao_total)
+SELECT id_participante, id_vocalizacao, count(*), coalesce(sum(duracao), 0)
+FROM audio
+GROUP BY id_participante, id_vocalizacao
+"""
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('contagem_audio',
+    sa.Column('id_participante', sa.Integer(), nullable=False),
+    sa.Column('id_vocalizacao', sa.Integer(), nullable=False),
+    sa.Column('quantidade', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('duracao_total', sa.Float(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['id_participante'], ['participante.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['id_vocalizacao'], ['vocalizacao.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id_participante', 'id_vocalizacao')
+    )
+    op.create_index(op.f('ix_contagem_audio_id_vocalizacao'), 'contagem_audio', ['id_vocalizacao'], unique=False)
+    # ### end Alembic commands ###
+
+    # Bloqueia escritas em audio até o fim da migração para o backfill não
+    # perder inserções feitas entre a contagem e a criação dos triggers.
+    op.execute("LOCK TABLE audio IN SHARE MODE")
+    op.execute(TRIGGER_FUNCTION)
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS contagem_audio_update ON audio")
+    op.execute("DROP TRIGGER IF EXISTS contagem_audio_delete ON audio")
+    op.execute("DROP TRIGGER IF EXISTS contagem_audio_insert ON audio")
+    op.execute("DROP FUNCTION IF EXISTS contagem_audio_aplicar_delta()")
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f('ix_contagem_audio_id_vocalizacao'), table_name='contagem_audio')
+    op.drop_table('contagem_audio')
+    # ### end Alembic commands ###
@@ -0,0 +1,55 @@
+"""add foreign key indexes to audio, participante and vocalizacao
+
+Revision ID: 5e6a0b9d2f47
+Revises: c51f08e3a7d9
+Create Date: 2026-10-19 14:15:10.662391
+
+Os índices são criados com CREATE INDEX CONCURRENTLY para não bloquear escritas
+nas tabelas em produção. CONCURRENTLY não pode rodar dentro de uma transação,
+por isso as operações ficam em um autocommit_block. O índice composto
+(id_participante, duracao) da migração anterior já atende buscas só por
+id_participante, e (id_participante, created_at) atende a listagem ordenada.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e6a0b9d2f47'
+down_revision: Union[str, None] = 'c51f08e3a7d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_audio_id_participante_created_at', 'audio', ['id_participante', 'created_at']),
+    ('ix_audio_id_usuario_created_at', 'audio', ['id_usuario', 'created_at']),
+    ('ix_audio_id_vocalizacao_created_at', 'audio', ['id_vocalizacao', 'created_at']),
+    ('ix_participante_id_usuario', 'participante', ['id_usuario']),
+    ('ix_vocalizacao_id_usuario', 'vocalizacao', ['id_usuario']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,51 @@
+"""add (created_at, id) indexes for keyset pagination
+
+Revision ID: 8d1f4c7a2b90
+Revises: 5e6a0b9d2f47
+Create Date: 2026-10-19 15:02:41.318204
+
+Listagens paginadas por keyset ordenam por (created_at, id). Sem filtro, esses
+índices servem a varredura; com filtro por participante, usuário ou vocalização,
+os índices compostos (fk, created_at) da migração anterior já atendem.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f4c7a2b90'
+down_revision: Union[str, None] = '5e6a0b9d2f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_audio_created_at_id', 'audio', ['created_at', 'id']),
+    ('ix_participante_created_at_id', 'participante', ['created_at', 'id']),
+    ('ix_usuario_created_at_id', 'usuario', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,51 @@
+"""add COLLATE "C" indexes on audio and segmento file names
+
+Revision ID: b7e1d3f9a6c2
+Revises: d4e2a8b6c1f3
+Create Date: 2026-10-19 17:48:06.925417
+
+A reconciliação com o S3 percorre as chaves por faixas na ordem binária
+(COLLATE "C"), a mesma da listagem do bucket. Com esses índices cada faixa é
+lida em ordem, sem ordenar a tabela inteira.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1d3f9a6c2'
+down_revision: Union[str, None] = 'd4e2a8b6c1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_audio_nome_arquivo_c', 'audio'),
+    ('ix_segmento_nome_arquivo_c', 'segmento'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text('nome_arquivo COLLATE "C"')],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,44 @@
+"""add (created_at, id) index on segmento for keyset pagination
+
+Revision ID: c8a4f2e6d1b9
+Revises: b7e1d3f9a6c2
+Create Date: 2026-10-19 21:14:52.604117
+
+As listagens de segmentos passaram a ser paginadas por keyset em
+(created_at, id), como as de usuários, participantes e áudios. Sem filtro,
+este índice serve a varredura da maior tabela; por áudio, o índice de
+id_audio já limita as linhas.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8a4f2e6d1b9'
+down_revision: Union[str, None] = 'b7e1d3f9a6c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_segmento_created_at_id',
+            'segmento',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_segmento_created_at_id',
+            table_name='segmento',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,58 @@
+"""generalize pending_object_deletion into storage_outbox
+
+Revision ID: d4e2a8b6c1f3
+Revises: 9a3c6e1f7b28
+Create Date: 2026-10-19 17:05:33.184620
+
+A fila de remoções passa a registrar qualquer operação no S3 (remoção e
+movimentação de chaves ou prefixos). As linhas pendentes são preservadas.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e2a8b6c1f3'
+down_revision: Union[str, None] = '9a3c6e1f7b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.rename_table('pending_object_deletion', 'storage_outbox')
+    op.execute('ALTER SEQUENCE pending_object_deletion_id_seq RENAME TO storage_outbox_id_seq')
+    op.execute('ALTER INDEX pending_object_deletion_pkey RENAME TO storage_outbox_pkey')
+    op.execute(
+        'ALTER INDEX ix_pending_object_deletion_disponivel_em '
+        'RENAME TO ix_storage_outbox_disponivel_em'
+    )
+    op.add_column('storage_outbox', sa.Column('operacao', sa.String(), nullable=True))
+    op.add_column('storage_outbox', sa.Column('destino', sa.String(), nullable=True))
+    op.execute(
+        "UPDATE storage_outbox "
+        "SET operacao = CASE WHEN prefixo THEN 'delete_prefix' ELSE 'delete' END"
+    )
+    op.alter_column('storage_outbox', 'operacao', nullable=False)
+    op.drop_column('storage_outbox', 'prefixo')
+
+
+def downgrade() -> None:
+    op.add_column(
+        'storage_outbox',
+        sa.Column('prefixo', sa.Boolean(), server_default='false', nullable=False),
+    )
+    # Movimentações pendentes não têm equivalente na tabela antiga
+    op.execute("DELETE FROM storage_outbox WHERE operacao NOT IN ('delete', 'delete_prefix')")
+    op.execute("UPDATE storage_outbox SET prefixo = (operacao = 'delete_prefix')")
+    op.drop_column('storage_outbox', 'destino')
+    op.drop_column('storage_outbox', 'operacao')
+    op.execute(
+        'ALTER INDEX ix_storage_outbox_disponivel_em '
+        'RENAME TO ix_pending_object_deletion_disponivel_em'
+    )
+    op.execute('ALTER INDEX storage_outbox_pkey RENAME TO pending_object_deletion_pkey')
+    op.execute('ALTER SEQUENCE storage_outbox_id_seq RENAME TO pending_object_deletion_id_seq')
+    op.rename_table('storage_outbox', 'pending_object_deletion')
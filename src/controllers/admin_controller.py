@@ -0,0 +1,109 @@
+from fastapi import APIRouter, Depends, status
+
+from src.database import engine, replica_engine, replica_health
+from src.schemas.admin_schema import (
+    AdmissionStatus,
+    CircuitBreakerStatus,
+    ClaimsCacheStatus,
+    PasswordHasherStatus,
+    PoolStatus,
+    ReplicaStatus,
+    RevocationStatus,
+)
+from src.security import password_hasher, verify_role
+from src.utils.admission import upload_admission
+from src.utils.claims_cache import claims_cache
+from src.utils.pool_metrics import pool_metrics, pool_status
+from src.utils.resilience import breakers_status
+from src.utils.token_revocation import revocation_filter
+
+router = APIRouter(dependencies=[Depends(verify_role("admin"))])
+
+
+@router.get("/db/pool", response_model=PoolStatus)
+async def db_pool():
+    """
+    Estado do pool de conexões deste processo (conexões em uso, overflow) e a
+    espera acumulada por conexão desde o início ou o último reset.
+    """
+    return pool_status(engine.pool)
+
+
+@router.post("/db/pool/reset", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_db_pool_metrics():
+    """Zera os contadores de espera por conexão (primário e réplica)"""
+    pool_metrics.reset()
+    if replica_engine is not None:
+        replica_engine.pool.metrics.reset()
+
+
+@router.get("/db/replica", response_model=ReplicaStatus)
+async def db_replica():
+    """
+    Saúde da réplica de leitura (verificada agora, sem cache) e estado do seu
+    pool. Com a réplica indisponível, as leituras vão ao primário.
+    """
+    if replica_engine is None:
+        return replica_health.status()
+    await replica_health.check()
+    return {**replica_health.status(), "pool": pool_status(replica_engine.pool)}
+
+
+@router.get("/auth/revocation", response_model=RevocationStatus)
+async def auth_revocation():
+    """
+    Filtro local de tokens revogados deste processo: sincronização com o Redis,
+    tamanho e quantas verificações foram resolvidas sem consultar o Redis.
+    """
+    return revocation_filter.status()
+
+
+@router.get("/auth/claims-cache", response_model=ClaimsCacheStatus)
+async def auth_claims_cache():
+    """Cache de tokens já verificados deste processo: ocupação e taxa de acerto"""
+    return claims_cache.status()
+
+
+@router.post("/auth/claims-cache/reset", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_auth_claims_cache_metrics():
+    """Zera os contadores de acerto do cache de tokens"""
+    claims_cache.reset()
+
+
+@router.get("/auth/password-hasher", response_model=PasswordHasherStatus)
+async def auth_password_hasher():
+    """
+    Pool de threads do Argon2 deste processo: hashes em execução e na fila e o
+    tempo médio de espera e de cálculo desde o início ou o último reset.
+    """
+    return password_hasher.status()
+
+
+@router.post("/auth/password-hasher/reset", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_auth_password_hasher_metrics():
+    """Zera os contadores de espera e de cálculo dos hashes de senha"""
+    password_hasher.reset()
+
+
+@router.get("/uploads/admission", response_model=AdmissionStatus)
+async def uploads_admission():
+    """
+    Controle de admissão dos uploads deste processo: decodificações em
+    andamento, bytes em processamento, fila e espera, e uploads rejeitados.
+    """
+    return upload_admission.status()
+
+
+@router.post("/uploads/admission/reset", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_uploads_admission_metrics():
+    """Zera os contadores de admissão dos uploads"""
+    upload_admission.reset()
+
+
+@router.get("/dependencies/circuit-breakers", response_model=list[CircuitBreakerStatus])
+async def dependency_circuit_breakers():
+    """
+    Disjuntores do S3, do Redis e do envio de emails deste processo: estado,
+    falhas seguidas, chamadas rejeitadas com o disjuntor aberto e último erro.
+    """
+    return breakers_status()
@@ -1,21 +1,57 @@
 from datetime import datetime
+import json
 import os
 from tempfile import NamedTemporaryFile
-
-from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile, status
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import get_db, get_read_db
 from src.models.participante_model import Participante
 from src.preprocessing.preprocessing import AudioSegment
 from src.schemas.audio_schema import AudioResponse
+from src.schemas.pagination_schema import ListFormat, Page
+from src.schemas.segmento_schema import SegmentoResponse
+from src.schemas.resegmentacao_schema import ResegmentacaoRequest, ResegmentacaoStatus
 from src.schemas.usuario_schema import UsuarioResponse
 from src.security import get_current_user, verify_role
 from src.services.audio_service import AudioService
+from src.services.storage_outbox_service import drain_storage_outbox
+from src.services.stats_service import StatsService
+from src.services.resegmentation_service import (
+    STATUS_DONE,
+    STATUS_PENDING,
+    STATUS_RUNNING,
+    JobLockedError,
+    ResegmentationJob,
+    checkpoint_path_for,
+)
+from src.utils.admission import upload_admission, upload_size
+from src.utils.idempotency import (
+    IDEMPOTENCY_HEADER,
+    fingerprint,
+    fingerprint_file,
+    run_idempotent,
+)
+from src.utils.pagination import PageParams
+from src.utils.rate_limit import AUDIO_UPLOAD, rate_limit
+from src.utils.streaming import ndjson_response
 
 router = APIRouter()
 service = AudioService()
+stats_service = StatsService()
 
 
 @router.post(
@@ -29,34 +65,248 @@ async def audio_upload(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    vad_engine: Optional[str] = None,
+    vad_params: Optional[str] = None,
 ):
+    """
+    Upload de um áudio. `vad_engine` e `vad_params` (objeto JSON) permitem escolher
+    o motor de segmentação desta requisição, sobrepondo o configurado na vocalização.
+    """
+    await rate_limit(AUDIO_UPLOAD, f"usuario:{current_user.id}")
+
     if not file.content_type.startswith("audio"):
         raise HTTPException(
             status_code=400, detail="Arquivo de áudio inválido.")
 
-    with NamedTemporaryFile(delete=False, suffix=".wav") as temp_wav_file:
-        temp_wav_path = temp_wav_file.name
+    parsed_vad_params = None
+    if vad_params:
+        try:
+            parsed_vad_params = json.loads(vad_params)
+        except json.JSONDecodeError:
+            parsed_vad_params = None
+        if not isinstance(parsed_vad_params, dict):
+            raise HTTPException(
+                status_code=400, detail="vad_params deve ser um objeto JSON.")
+
+    def decode_to_wav() -> bytes:
+        with NamedTemporaryFile(delete=False, suffix=".wav") as temp_wav_file:
+            temp_wav_path = temp_wav_file.name
+
+        try:
+            audio = AudioSegment.from_file(file.file)
+            audio.export(temp_wav_path, format="wav")
+
+            # Salvar áudio original
+            with open(temp_wav_path, "rb") as audio_file:
+                return audio_file.read()
+        finally:
+            os.remove(temp_wav_path)
+
+    async def process_upload():
+        # A decodificação (ffmpeg) e a segmentação só começam com capacidade livre,
+        # e rodam em threads para não bloquear o event loop
+        async with upload_admission.admit(upload_size(file)):
+            file_data = await run_in_threadpool(decode_to_wav)
+            return await service.upload_audio(
+                id_vocalizacao=id_vocalizacao,
+                id_participante=id_participante,
+                file_data=file_data,
+                current_user=current_user,
+                db=db,
+                original_filename=file.filename,
+                vad_engine=vad_engine,
+                vad_params=parsed_vad_params,
+            )
+
+    request_fingerprint = None
+    if idempotency_key:
+        # O hash lê o arquivo inteiro (possivelmente do disco): fora do event loop
+        request_fingerprint = fingerprint(
+            "POST /audios",
+            id_vocalizacao,
+            id_participante,
+            vad_engine,
+            vad_params,
+            await run_in_threadpool(fingerprint_file, file.file),
+        )
+
+    return await run_idempotent(
+        key=idempotency_key,
+        scope=f"audios:{current_user.id}",
+        request_fingerprint=request_fingerprint,
+        operation=process_upload,
+        response_model=AudioResponse,
+    )
+
+
+@router.get(
+    "",
+    response_model=Page[AudioResponse],
+    dependencies=[Depends(verify_role("admin"))],
+)
+async def list_audios(
+    id_vocalizacao: Optional[int] = None,
+    id_participante: Optional[int] = None,
+    id_usuario: Optional[int] = None,
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    format: ListFormat = ListFormat.JSON,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Lista os áudios paginados por cursor, do mais recente ao mais antigo. Para a
+    próxima página, envie o `next_cursor` da resposta como `cursor`. Com
+    `format=ndjson`, exporta todos os áudios filtrados em streaming (sem paginação).
+    """
+    if format == ListFormat.NDJSON:
+        return ndjson_response(
+            service.export_audios_query(
+                id_vocalizacao, id_participante, id_usuario, data_inicio, data_fim
+            ),
+            AudioResponse,
+            "audios",
+        )
 
+    return await service.list_audios(
+        db,
+        page,
+        id_vocalizacao=id_vocalizacao,
+        id_participante=id_participante,
+        id_usuario=id_usuario,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    )
+
+
+@router.post(
+    "/resegmentacao",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ResegmentacaoStatus,
+    dependencies=[Depends(verify_role("admin"))],
+)
+async def resegment(request: ResegmentacaoRequest):
+    """
+    Cria um reprocessamento da segmentação dos áudios filtrados por vocalização,
+    participante e/ou período. O job fica pendente até ser executado pela linha
+    de comando (`python -m src.jobs.resegment --pendentes`); o progresso é
+    consultado pelo job_id retornado.
+    """
     try:
-        audio = AudioSegment.from_file(file.file)
-        audio.export(temp_wav_path, format="wav")
-
-        # Salvar áudio original
-        with open(temp_wav_path, "rb") as audio_file:
-            file_data = audio_file.read()
-
-        audio_record = await service.upload_audio(
-            id_vocalizacao=id_vocalizacao,
-            id_participante=id_participante,
-            file_data=file_data,
-            current_user=current_user,
-            db=db,
-            original_filename=file.filename,
+        job = ResegmentationJob.create(**request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return job.state
+
+
+def _load_resegmentation_job(job_id: str) -> ResegmentationJob:
+    path = checkpoint_path_for(job_id)
+    if not job_id.isalnum() or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado."
         )
+    return ResegmentationJob.load(path)
+
+
+@router.get(
+    "/resegmentacao/{job_id}",
+    response_model=ResegmentacaoStatus,
+    dependencies=[Depends(verify_role("admin"))],
+)
+async def resegment_status(job_id: str):
+    return _load_resegmentation_job(job_id).state
 
-        return audio_record
-    finally:
-        os.remove(temp_wav_path)
+
+@router.post(
+    "/resegmentacao/{job_id}/retomar",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ResegmentacaoStatus,
+    dependencies=[Depends(verify_role("admin"))],
+)
+async def resume_resegment(job_id: str, forcar: bool = False):
+    """
+    Devolve o job à fila de pendentes para ser retomado do último checkpoint.
+    Jobs cuja trava está com um executor são recusados; jobs marcados como em
+    execução sem executor (ex.: o processo foi encerrado) só são retomados com
+    `forcar=true`.
+    """
+    job = _load_resegmentation_job(job_id)
+    try:
+        with job.lock():
+            job.reload()
+            if job.state["status"] == STATUS_DONE:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Job já concluído."
+                )
+            if job.state["status"] == STATUS_RUNNING and not forcar:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT, detail="Job em execução."
+                )
+            job.state["status"] = STATUS_PENDING
+            job.save()
+    except JobLockedError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job em execução.")
+    return job.state
+
+
+@router.get(
+    "/segmentos",
+    response_model=Page[SegmentoResponse],
+    dependencies=[Depends(verify_role("admin"))],
+)
+async def list_segmentos(
+    id_vocalizacao: Optional[int] = None,
+    id_participante: Optional[int] = None,
+    min_snr: Optional[float] = None,
+    max_clipping: Optional[float] = None,
+    min_duration: Optional[float] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Lista segmentos filtrando por qualidade: SNR estimada mínima (dB), taxa
+    máxima de clipping (0 a 1) e duração mínima (s). Paginado por cursor, do
+    mais recente ao mais antigo.
+    """
+    return await service.list_segmentos(
+        db,
+        page,
+        id_vocalizacao=id_vocalizacao,
+        id_participante=id_participante,
+        min_snr=min_snr,
+        max_clipping=max_clipping,
+        min_duration=min_duration,
+    )
+
+
+@router.get("/{id}/segmentos", response_model=Page[SegmentoResponse])
+async def list_segmentos_by_audio(
+    id: int,
+    min_snr: Optional[float] = None,
+    max_clipping: Optional[float] = None,
+    min_duration: Optional[float] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UsuarioResponse = Depends(get_current_user),
+):
+    """Lista os segmentos de um áudio com suas métricas de qualidade, paginados por cursor"""
+    audio_db = await service._get_one(id, db)
+
+    if current_user.role != "admin" and current_user.id != audio_db.id_usuario:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Sem permissão para acessar esse áudio.",
+        )
+
+    return await service.list_segmentos(
+        db,
+        page,
+        id_audio=id,
+        min_snr=min_snr,
+        max_clipping=max_clipping,
+        min_duration=min_duration,
+    )
 
 
 @router.get("/{id}/play")
@@ -91,11 +341,13 @@ async def get_audio_url(
 async def update(
     id: int,
     audio_data: dict,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Atualiza um áudio específico, incluindo a possibilidade de alterar a vocalização
-    e renomear o arquivo no S3 de acordo com o novo rótulo
+    e renomear o arquivo no S3 de acordo com o novo rótulo. O novo nome é gravado
+    na mesma transação que registra as movimentações no outbox de armazenamento.
     """
     audio_db = await service._get_one(id, db)
 
@@ -125,84 +377,9 @@ async def update(
             timestamp_str=timestamp,
         )
 
-        try:
-            service.s3_client.copy_object(
-                Bucket=os.getenv("S3_BUCKET_NAME"),
-                CopySource=f"{os.getenv('S3_BUCKET_NAME')}/{audio_db.nome_arquivo}",
-                Key=novo_nome_arquivo,
-            )
-
-            service.s3_client.delete_object(
-                Bucket=os.getenv("S3_BUCKET_NAME"), Key=audio_db.nome_arquivo
-            )
-
-            audio_data["nome_arquivo"] = novo_nome_arquivo
-
-            if hasattr(audio_db, "segments") and audio_db.segments:
-                base_old_filename = audio_db.nome_arquivo[:-4]
-                base_new_filename = novo_nome_arquivo[:-4]
-
-                updated_segments = []
-
-                for segment_name in audio_db.segments:
-                    segment_number = segment_name.split("_segment_")[-1]
-                    novo_segment_name = f"{base_new_filename}_segment_{segment_number}"
-
-                    service.s3_client.copy_object(
-                        Bucket=os.getenv("S3_BUCKET_NAME"),
-                        CopySource=f"{os.getenv('S3_BUCKET_NAME')}/{segment_name}",
-                        Key=novo_segment_name,
-                    )
-
-                    service.s3_client.delete_object(
-                        Bucket=os.getenv("S3_BUCKET_NAME"), Key=segment_name
-                    )
-
-                    updated_segments.append(novo_segment_name)
-
-                audio_data["segments"] = updated_segments
-            else:
-                try:
-                    base_old_filename = audio_db.nome_arquivo[:-4]
-                    base_new_filename = novo_nome_arquivo[:-4]
-
-                    response = service.s3_client.list_objects_v2(
-                        Bucket=os.getenv("S3_BUCKET_NAME"),
-                        Prefix=f"{base_old_filename}_segment_",
-                    )
-
-                    updated_segments = []
-
-                    if "Contents" in response:
-                        for obj in response["Contents"]:
-                            old_key = obj["Key"]
-                            segment_number = old_key.split("_segment_")[-1]
-                            novo_segment_name = (
-                                f"{base_new_filename}_segment_{segment_number}"
-                            )
-
-                            service.s3_client.copy_object(
-                                Bucket=os.getenv("S3_BUCKET_NAME"),
-                                CopySource=f"{os.getenv('S3_BUCKET_NAME')}/{old_key}",
-                                Key=novo_segment_name,
-                            )
-
-                            service.s3_client.delete_object(
-                                Bucket=os.getenv("S3_BUCKET_NAME"), Key=old_key
-                            )
-
-                            updated_segments.append(novo_segment_name)
-
-                        audio_data["segments"] = updated_segments
-
-                except Exception as e:
-                    print(f"Erro ao processar segmentos: {str(e)}")
-
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Erro ao renomear arquivo no S3: {str(e)}",
-            )
+        await service.move_audio_objects(audio_db, novo_nome_arquivo, db)
+        audio_data["nome_arquivo"] = novo_nome_arquivo
+        background_tasks.add_task(drain_storage_outbox)
 
     return await service.update(id, audio_data, db)
 
@@ -211,8 +388,11 @@ async def update(
     "/{id}",
     dependencies=[Depends(verify_role("admin"))],
 )
-async def delete(id: int, db: AsyncSession = Depends(get_db)):
+async def delete(
+    id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)
+):
     await service.delete_audio(id, db)
+    background_tasks.add_task(drain_storage_outbox)
     return {"message": "Áudio deletado com sucesso"}
 
 
@@ -220,42 +400,64 @@ async def delete(id: int, db: AsyncSession = Depends(get_db)):
     "/usuario/{id_usuario}",
     dependencies=[Depends(verify_role("admin"))],
 )
-async def delete_audios_by_user(id_usuario: int, db: AsyncSession = Depends(get_db)):
+async def delete_audios_by_user(
+    id_usuario: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
     """Endpoint para deletar todos os áudios associados a um usuário específico"""
     await service.delete_all_audios_by_user(id_usuario, db)
+    background_tasks.add_task(drain_storage_outbox)
     return {"message": "Todos os áudios do usuário foram deletados com sucesso"}
 
 
 @router.get(
     "/usuario/{id_usuario}",
-    response_model=list[AudioResponse],
+    response_model=Page[AudioResponse],
     dependencies=[Depends(verify_role("admin"))],
 )
 async def list_audios_by_user(
     id_usuario: int,
-    db: AsyncSession = Depends(get_db),
+    id_vocalizacao: Optional[int] = None,
+    id_participante: Optional[int] = None,
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UsuarioResponse = Depends(get_current_user),
 ):
-    """Endpoint para listar todos os áudios associados a um usuário específico"""
+    """Endpoint para listar os áudios (paginados) associados a um usuário específico"""
     if current_user.role != "admin" and current_user.id != id_usuario:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Sem permissão para acessar esses áudios",
         )
 
-    return await service.list_audios_by_user(id_usuario, db)
+    return await service.list_audios_by_user(
+        id_usuario,
+        db,
+        page,
+        id_vocalizacao=id_vocalizacao,
+        id_participante=id_participante,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    )
 
 
 @router.get(
     "/participante/{id_participante}",
-    response_model=list[AudioResponse],
+    response_model=Page[AudioResponse],
 )
 async def list_audios_by_participante(
     id_participante: int,
-    db: AsyncSession = Depends(get_db),
+    id_vocalizacao: Optional[int] = None,
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UsuarioResponse = Depends(get_current_user),
 ):
-    """Endpoint para listar todos os áudios associados a um participante específico"""
+    """Endpoint para listar os áudios (paginados) associados a um participante específico"""
     if current_user.role != "admin":
         result = await db.execute(
             select(Participante).where(
@@ -270,14 +472,21 @@ async def list_audios_by_participante(
                 detail="Sem permissão para acessar os áudios deste participante",
             )
 
-    return await service.list_audios_by_participante(id_participante, db)
+    return await service.list_audios_by_participante(
+        id_participante,
+        db,
+        page,
+        id_vocalizacao=id_vocalizacao,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    )
 
 
 @router.get("/amount/participante/{id_participante}", dependencies=[Depends(verify_role("admin"))])
 async def amount_audios_by_participante(
     id_participante: int,
     current_user: UsuarioResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -290,7 +499,7 @@ async def amount_audios_by_participante(
             detail="O ID do participante informado é inválido.",
         )
     try:
-        quantidade = await service.get_amount_audios_participante(id_participante, db)
+        quantidade = await stats_service.count_participante(id_participante, db)
         return {"quantidade": quantidade}
     except Exception as e:
         raise HTTPException(
@@ -305,6 +514,7 @@ async def amount_audios_by_participante(
 )
 async def delete_audios_by_participante(
     id_participante: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: UsuarioResponse = Depends(get_current_user),
 ):
@@ -324,4 +534,5 @@ async def delete_audios_by_participante(
             )
 
     await service.delete_all_audios_by_participante(id_participante, db)
+    background_tasks.add_task(drain_storage_outbox)
     return {"message": "Todos os áudios do participante foram deletados com sucesso"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status, Header
+from fastapi import APIRouter, Depends, Request, status, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
@@ -16,6 +16,13 @@ from src.schemas.auth_schema import (
 from src.schemas.usuario_schema import UsuarioResponse
 from src.services.auth_service import AuthService
 from src.security import get_current_user
+from src.utils.rate_limit import (
+    LOGIN,
+    PASSWORD_RESET,
+    RESEND_CODE,
+    client_ip,
+    rate_limit,
+)
 
 router = APIRouter()
 service = AuthService()
@@ -29,7 +36,10 @@ async def register(usuario: AuthRegister, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(login: AuthLogin, db: AsyncSession = Depends(get_db)):
+async def login(
+    login: AuthLogin, request: Request, db: AsyncSession = Depends(get_db)
+):
+    await rate_limit(LOGIN, f"ip:{client_ip(request)}", f"email:{login.email.lower()}")
     tokens = await service.authenticate(login, db)
     return tokens
 
@@ -44,8 +54,11 @@ async def refresh_token(
 
 @router.post("/password-reset", response_model=dict)
 async def request_password_reset(
-    request: EmailRequest, db: AsyncSession = Depends(get_db)
+    request: EmailRequest, http_request: Request, db: AsyncSession = Depends(get_db)
 ):
+    await rate_limit(
+        PASSWORD_RESET, f"ip:{client_ip(http_request)}", f"email:{request.email.lower()}"
+    )
     await service.request_password_reset(request.email, db)
     return {"detail": "Código de redefinição de senha enviado para o e-mail."}
 
@@ -70,8 +83,11 @@ async def confirm_registration(
 
 @router.post("/resend-confirmation-code", response_model=dict)
 async def resend_confirmation_code(
-    confirm: EmailRequest, db: AsyncSession = Depends(get_db)
+    confirm: EmailRequest, request: Request, db: AsyncSession = Depends(get_db)
 ):
+    await rate_limit(
+        RESEND_CODE, f"ip:{client_ip(request)}", f"email:{confirm.email.lower()}"
+    )
     await service.resend_confirmation_code(confirm.email, db)
     return {"detail": "Novo código de confirmação enviado para o e-mail."}
 
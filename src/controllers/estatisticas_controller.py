@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_read_db
+from src.schemas.estatisticas_schema import (
+    Balanceamento,
+    Dashboard,
+    QuantidadeDia,
+    QuantidadeParticipante,
+    QuantidadeParticipanteVocalizacao,
+    QuantidadeUsuario,
+    QuantidadeVocalizacao,
+)
+from src.security import verify_role
+from src.services.stats_service import StatsService
+
+router = APIRouter(dependencies=[Depends(verify_role("admin"))])
+service = StatsService()
+
+
+@router.get("/dashboard", response_model=Dashboard)
+async def dashboard(db: AsyncSession = Depends(get_read_db)):
+    """Todas as estatísticas dos áudios em uma única chamada"""
+    return await service.dashboard(db)
+
+
+@router.get("/participantes", response_model=list[QuantidadeParticipante])
+async def por_participante(db: AsyncSession = Depends(get_read_db)):
+    return await service.by_participante(db)
+
+
+@router.get("/contagem", response_model=QuantidadeParticipanteVocalizacao)
+async def contagem(
+    id_participante: int, id_vocalizacao: int, db: AsyncSession = Depends(get_read_db)
+):
+    """Quantidade e duração total de áudios de um participante em uma vocalização"""
+    return await service.count(id_participante, id_vocalizacao, db)
+
+
+@router.get("/usuarios", response_model=list[QuantidadeUsuario])
+async def por_usuario(db: AsyncSession = Depends(get_read_db)):
+    return await service.by_usuario(db)
+
+
+@router.get("/vocalizacoes", response_model=list[QuantidadeVocalizacao])
+async def por_vocalizacao(db: AsyncSession = Depends(get_read_db)):
+    return await service.by_vocalizacao(db)
+
+
+@router.get("/diario", response_model=list[QuantidadeDia])
+async def por_dia(
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Total de áudios e de segundos gravados por dia no período [data_inicio, data_fim)"""
+    return await service.by_day(db, data_inicio=data_inicio, data_fim=data_fim)
+
+
+@router.get("/balanceamento", response_model=Balanceamento)
+async def balanceamento(db: AsyncSession = Depends(get_read_db)):
+    """Distribuição dos áudios entre as vocalizações (balanceamento das classes)"""
+    return await service.class_balance(db)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Response, status
+
+from src.schemas.health_schema import Liveness, Readiness
+from src.services.health_service import HealthService
+
+router = APIRouter()
+service = HealthService()
+
+
+@router.get("/live", response_model=Liveness)
+async def live():
+    """O processo está de pé e o event loop responde; não consulta dependências"""
+    return {"status": "vivo"}
+
+
+@router.get(
+    "/ready",
+    response_model=Readiness,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": Readiness}},
+)
+async def ready(response: Response):
+    """
+    Postgres, Redis e S3 respondem (resultado em cache por alguns segundos),
+    mais a saturação do pool do banco, as filas e os disjuntores do processo.
+    Responde 503 quando alguma dependência obrigatória falha.
+    """
+    readiness = await service.readiness()
+    if not readiness["pronto"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    response.headers["Cache-Control"] = "no-store"
+    return readiness
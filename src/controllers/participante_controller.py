@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import get_db, get_read_db
+from src.schemas.pagination_schema import ListFormat, Page
 from src.schemas.participante_schema import (
     ParticipanteCreate,
     ParticipanteResponse,
@@ -9,7 +13,11 @@ from src.schemas.participante_schema import (
 )
 from src.schemas.usuario_schema import UsuarioResponse
 from src.security import get_current_user, verify_role
+from src.services.storage_outbox_service import drain_storage_outbox
 from src.services.participante_service import ParticipanteService
+from src.utils.idempotency import IDEMPOTENCY_HEADER, fingerprint, run_idempotent
+from src.utils.pagination import PageParams
+from src.utils.streaming import ndjson_response
 
 router = APIRouter()
 service = ParticipanteService()
@@ -17,11 +25,31 @@ service = ParticipanteService()
 
 @router.get(
     "",
-    response_model=list[ParticipanteResponse],
+    response_model=Page[ParticipanteResponse],
     dependencies=[Depends(verify_role("admin"))],
 )
-async def get_all(db: AsyncSession = Depends(get_db)):
-    return await service.get_all(db)
+async def get_all(
+    id_usuario: Optional[int] = None,
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    format: ListFormat = ListFormat.JSON,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Lista os participantes paginados por cursor, do mais recente ao mais antigo.
+    Com `format=ndjson`, exporta todos os filtrados em streaming.
+    """
+    if format == ListFormat.NDJSON:
+        return ndjson_response(
+            service.export_query(id_usuario, data_inicio, data_fim),
+            ParticipanteResponse,
+            "participantes",
+        )
+
+    return await service.get_all(
+        db, page, id_usuario=id_usuario, data_inicio=data_inicio, data_fim=data_fim
+    )
 
 
 @router.get(
@@ -29,7 +57,7 @@ async def get_all(db: AsyncSession = Depends(get_db)):
     response_model=ParticipanteResponse,
     dependencies=[Depends(get_current_user)],
 )
-async def get_by_id(id: int, db: AsyncSession = Depends(get_db)):
+async def get_by_id(id: int, db: AsyncSession = Depends(get_read_db)):
     return await service.get_one(id, db)
 
 
@@ -40,7 +68,7 @@ async def get_by_id(id: int, db: AsyncSession = Depends(get_db)):
 )
 async def get_by_usuario(
     usuario_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UsuarioResponse = Depends(get_current_user),
 ):
     if current_user.role == "admin" or usuario_id == current_user.id:
@@ -59,9 +87,18 @@ async def create(
     participante: ParticipanteCreate,
     db: AsyncSession = Depends(get_db),
     current_user: UsuarioResponse = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
 ):
     usuario_id = current_user.id
-    return await service.create(participante, usuario_id, db)
+    return await run_idempotent(
+        key=idempotency_key,
+        scope=f"participantes:{usuario_id}",
+        request_fingerprint=fingerprint(
+            "POST /participantes", participante.model_dump_json()
+        ),
+        operation=lambda: service.create(participante, usuario_id, db),
+        response_model=ParticipanteResponse,
+    )
 
 
 @router.patch(
@@ -85,12 +122,14 @@ async def update(
 )
 async def delete(
     id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: UsuarioResponse = Depends(get_current_user),
 ):
     participante = await service.get_one(id, db)
     if current_user.role == "admin" or participante.id_usuario == current_user.id:
         await service.delete(id, db)
+        background_tasks.add_task(drain_storage_outbox)
     else:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.security import get_current_user, verify_role
-from src.database import get_db
+from src.database import get_db, get_read_db
+from src.schemas.pagination_schema import ListFormat, Page
 from src.schemas.usuario_schema import UsuarioPayload, UsuarioResponse, UsuarioUpdate
 from src.services.usuario_service import UsuarioService
 from src.services.auth_service import AuthService
+from src.services.storage_outbox_service import drain_storage_outbox
+from src.utils.pagination import PageParams
+from src.utils.streaming import ndjson_response
 
 router = APIRouter()
 service = UsuarioService()
@@ -14,11 +21,26 @@ auth_service = AuthService()
 
 @router.get(
     "",
-    response_model=list[UsuarioResponse],
+    response_model=Page[UsuarioResponse],
     dependencies=[Depends(verify_role("admin"))],
 )
-async def get_all(db: AsyncSession = Depends(get_db)):
-    return await service.get_all(db)
+async def get_all(
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    format: ListFormat = ListFormat.JSON,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Lista os usuários paginados por cursor, do mais recente ao mais antigo.
+    Com `format=ndjson`, exporta todos os filtrados em streaming.
+    """
+    if format == ListFormat.NDJSON:
+        return ndjson_response(
+            service.export_query(data_inicio, data_fim), UsuarioResponse, "usuarios"
+        )
+
+    return await service.get_all(db, page, data_inicio=data_inicio, data_fim=data_fim)
 
 
 @router.get(
@@ -26,7 +48,7 @@ async def get_all(db: AsyncSession = Depends(get_db)):
     response_model=UsuarioPayload or None,
     dependencies=[Depends(get_current_user)],
 )
-async def get_by_id(id: int, db: AsyncSession = Depends(get_db)):
+async def get_by_id(id: int, db: AsyncSession = Depends(get_read_db)):
     return await service.get_one(id, db)
 
 
@@ -76,5 +98,8 @@ async def update(
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(get_current_user)],
 )
-async def delete(id: int, db: AsyncSession = Depends(get_db)):
+async def delete(
+    id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)
+):
     await service.delete(id, db)
+    background_tasks.add_task(drain_storage_outbox)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Response
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, status, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import get_db, get_read_db
 from src.schemas.usuario_schema import UsuarioResponse
 from src.schemas.vocalizacao_schema import (
     VocalizacaoCreate,
@@ -9,7 +11,9 @@ from src.schemas.vocalizacao_schema import (
     VocalizacaoUpdate,
 )
 from src.security import get_current_user, verify_role
+from src.services.storage_outbox_service import drain_storage_outbox
 from src.services.vocalizacao_service import VocalizacaoService
+from src.utils.idempotency import IDEMPOTENCY_HEADER, fingerprint, run_idempotent
 
 router = APIRouter()
 service = VocalizacaoService()
@@ -20,7 +24,7 @@ service = VocalizacaoService()
     response_model=list[VocalizacaoResponse],
     dependencies=[Depends(get_current_user)],
 )
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def get_all(db: AsyncSession = Depends(get_read_db)):
     return await service.get_all(db)
 
 
@@ -29,7 +33,7 @@ async def get_all(db: AsyncSession = Depends(get_db)):
     response_model=VocalizacaoResponse,
     dependencies=[Depends(get_current_user)],
 )
-async def get_by_id(id: int, db: AsyncSession = Depends(get_db)):
+async def get_by_id(id: int, db: AsyncSession = Depends(get_read_db)):
     return await service.get_one(id, db)
 
 
@@ -42,9 +46,18 @@ async def create(
     vocalizacao: VocalizacaoCreate,
     db: AsyncSession = Depends(get_db),
     current_user: UsuarioResponse = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
 ):
     usuario_id = current_user.id
-    return await service.create(vocalizacao, db, usuario_id)
+    return await run_idempotent(
+        key=idempotency_key,
+        scope=f"vocalizacoes:{usuario_id}",
+        request_fingerprint=fingerprint(
+            "POST /vocalizacoes", vocalizacao.model_dump_json()
+        ),
+        operation=lambda: service.create(vocalizacao, db, usuario_id),
+        response_model=VocalizacaoResponse,
+    )
 
 
 @router.patch(
@@ -54,6 +67,7 @@ async def create(
 async def update(
     id: int,
     vocalizacao: VocalizacaoUpdate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: UsuarioResponse = Depends(get_current_user),
 ):
@@ -61,6 +75,7 @@ async def update(
         updated = await service.update(
             id, vocalizacao, current_user.id, current_user.role, db
         )
+        background_tasks.add_task(drain_storage_outbox)
         return updated
     except HTTPException as e:
         raise e
@@ -77,12 +92,14 @@ async def update(
 )
 async def delete(
     id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: UsuarioResponse = Depends(verify_role("admin")),
 ):
     try:
         if current_user.role == "admin":
             await service.delete(id, db)
+            background_tasks.add_task(drain_storage_outbox)
         else:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,10 +1,20 @@
+import asyncio
 import os
 import socket
+import time
 from dotenv import load_dotenv
+from fastapi import Request
+from jose import JWTError, jwt
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from src.redis_client import get_redis
+from src.utils.pool_metrics import InstrumentedAsyncPool, PoolMetrics
+
 
 def load_environment():
     env_type = os.getenv("ENV_TYPE", "main").lower()
@@ -24,8 +34,49 @@ def load_environment():
 ENV_TYPE = load_environment()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+# Log de SQL só por padrão em DEV: o echo escreve cada instrução de forma síncrona
+DB_ECHO = os.getenv("DB_ECHO", str(ENV_TYPE == "dev")).lower() == "true"
+
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", 5))
+REPLICA_HEALTH_TIMEOUT = float(os.getenv("REPLICA_HEALTH_TIMEOUT", 1))
+
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+def engine_options() -> dict:
+    """
+    Parâmetros do engine a partir das variáveis de ambiente. O statement_timeout
+    é aplicado pelo servidor a cada conexão (0 desativa); jobs longos podem
+    sobrescrever DB_STATEMENT_TIMEOUT_MS na própria execução.
+    """
+    server_settings = {"application_name": f"vocalizeai-{ENV_TYPE}"}
+    if DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(DB_STATEMENT_TIMEOUT_MS)
+    return {
+        "echo": DB_ECHO,
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        },
+    }
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options())
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 Base = declarative_base()
 
@@ -33,3 +84,143 @@ Base = declarative_base()
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+replica_engine = None
+replica_session = None
+if DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(DATABASE_REPLICA_URL, **engine_options())
+    replica_engine.pool.metrics = PoolMetrics()
+    replica_session = sessionmaker(
+        replica_engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+# Atraso de replicação: zero quando todo o WAL recebido já foi aplicado (réplica
+# em dia com um primário ocioso), senão o tempo desde a última transação aplicada
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END AS lag"
+)
+
+
+class ReplicaHealth:
+    """
+    Saúde da réplica verificada no máximo a cada REPLICA_HEALTH_INTERVAL
+    segundos, sob demanda. A réplica é considerada indisponível se a consulta
+    de atraso falhar, demorar mais que REPLICA_HEALTH_TIMEOUT ou se o atraso
+    passar de REPLICA_MAX_LAG_SECONDS; nesse caso as leituras vão ao primário.
+    """
+
+    def __init__(self):
+        self.healthy = False
+        self.lag = None
+        self.error = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _lag(self) -> float:
+        async with replica_engine.connect() as conn:
+            return float(await conn.scalar(REPLICA_LAG_QUERY))
+
+    async def check(self) -> bool:
+        try:
+            self.lag = await asyncio.wait_for(self._lag(), REPLICA_HEALTH_TIMEOUT)
+            self.healthy = self.lag <= REPLICA_MAX_LAG_SECONDS
+            self.error = None if self.healthy else f"Atraso de {self.lag:.1f}s"
+        except Exception as e:
+            self.healthy = False
+            self.error = str(e) or type(e).__name__
+        self.checked_at = time.monotonic()
+        return self.healthy
+
+    async def is_healthy(self) -> bool:
+        if time.monotonic() - self.checked_at < REPLICA_HEALTH_INTERVAL:
+            return self.healthy
+        async with self._lock:
+            if time.monotonic() - self.checked_at >= REPLICA_HEALTH_INTERVAL:
+                await self.check()
+        return self.healthy
+
+    def mark_unhealthy(self, error: Exception) -> None:
+        self.healthy = False
+        self.error = str(error)
+        self.checked_at = time.monotonic()
+
+    def status(self) -> dict:
+        return {
+            "configurada": replica_engine is not None,
+            "saudavel": self.healthy,
+            "atraso_segundos": self.lag,
+            "erro": self.error,
+        }
+
+
+replica_health = ReplicaHealth()
+
+
+def _sticky_key(request: Request) -> str | None:
+    """Chave de leitura-após-escrita do usuário, a partir do `sub` do token."""
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        # Só escolhe o banco da leitura; a assinatura é validada pela autenticação
+        sub = jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+    return f"leitura_primario:{sub}" if sub else None
+
+
+async def mark_recent_write(request: Request) -> None:
+    """Após uma escrita do usuário, suas leituras vão ao primário por REPLICA_STICKY_SECONDS."""
+    if replica_engine is None:
+        return
+    key = _sticky_key(request)
+    if key is None:
+        return
+    try:
+        await get_redis().set(key, 1, ex=REPLICA_STICKY_SECONDS)
+    except RedisError as e:
+        print(f"Erro ao registrar escrita recente: {str(e)}")
+
+
+async def _use_replica(request: Request) -> bool:
+    if replica_engine is None or not await replica_health.is_healthy():
+        return False
+    key = _sticky_key(request)
+    if key is None:
+        return True
+    try:
+        return not await get_redis().exists(key)
+    except RedisError:
+        # Sem saber se houve escrita recente, lê do primário
+        return False
+
+
+async def read_sessionmaker() -> sessionmaker:
+    """Fábrica de sessões de leitura fora de requisições (exportações em streaming)."""
+    if replica_engine is not None and await replica_health.is_healthy():
+        return replica_session
+    return async_session
+
+
+async def get_read_db(request: Request):
+    """
+    Sessão para endpoints somente leitura: usa a réplica quando configurada e
+    saudável, exceto logo após uma escrita do próprio usuário (leitura das
+    próprias escritas). Falhas de conexão com a réplica a marcam como indisponível.
+    """
+    if not await _use_replica(request):
+        async with async_session() as session:
+            yield session
+        return
+
+    async with replica_session() as session:
+        try:
+            yield session
+        except (DBAPIError, OSError) as e:
+            if isinstance(e, OSError) or e.connection_invalidated:
+                replica_health.mark_unhealthy(e)
+            raise
@@ -0,0 +1,125 @@
+"""
+Preenche os metadados (duração, taxa de amostragem, canais, codec, tamanho e
+quantidade de segmentos) dos áudios ingeridos antes dessas colunas existirem.
+
+Lê somente o cabeçalho WAV de cada objeto via GET com Range; o tamanho total vem
+do Content-Range da mesma resposta, sem baixar o arquivo.
+
+Uso:
+    python -m src.jobs.backfill_audio_metadata
+    python -m src.jobs.backfill_audio_metadata --batch-size 500 --threads 16
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select, update
+
+from src.database import async_session
+from src.models import Audio, Segmento
+from src.preprocessing.metadata import (
+    WAV_HEADER_BYTES,
+    WAV_HEADER_MAX_BYTES,
+    IncompleteHeaderError,
+    parse_wav_header,
+)
+from src.services.audio_service import AudioService
+
+
+def read_metadata(service: AudioService, key: str) -> dict:
+    nbytes = WAV_HEADER_BYTES
+    while True:
+        header, total_size = service.read_object_header(key, nbytes)
+        try:
+            return parse_wav_header(header, total_size)
+        except IncompleteHeaderError:
+            # Chunks extras (LIST, etc.) antes de "data": amplia a leitura
+            if nbytes >= WAV_HEADER_MAX_BYTES or len(header) < nbytes:
+                raise
+            nbytes *= 4
+
+
+async def _count_segments(db, rows, service: AudioService, loop, pool) -> dict[int, int]:
+    ids = [row.id for row in rows]
+    result = await db.execute(
+        select(Segmento.id_audio, func.count(Segmento.id))
+        .where(Segmento.id_audio.in_(ids))
+        .group_by(Segmento.id_audio)
+    )
+    counts = dict(result.all())
+
+    # Áudios anteriores ao manifesto: conta os segmentos pelo prefixo no S3
+    legacy = [row for row in rows if row.id not in counts and row.versao_segmentacao == 1]
+    listings = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool, service.list_s3_keys, f"{row.nome_arquivo[:-4]}_segment_"
+            )
+            for row in legacy
+        ),
+        return_exceptions=True,
+    )
+    for row, keys in zip(legacy, listings):
+        if not isinstance(keys, BaseException):
+            counts[row.id] = len(keys)
+    return counts
+
+
+async def backfill(batch_size: int, threads: int, force: bool) -> None:
+    service = AudioService()
+    loop = asyncio.get_running_loop()
+    last_id = 0
+    updated = failed = 0
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        while True:
+            async with async_session() as db:
+                query = select(
+                    Audio.id, Audio.nome_arquivo, Audio.versao_segmentacao
+                ).where(Audio.id > last_id, Audio.nome_arquivo != "temp")
+                if not force:
+                    query = query.where(Audio.duracao.is_(None))
+                rows = (
+                    await db.execute(query.order_by(Audio.id).limit(batch_size))
+                ).all()
+                if not rows:
+                    break
+
+                metadata = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(pool, read_metadata, service, row.nome_arquivo)
+                        for row in rows
+                    ),
+                    return_exceptions=True,
+                )
+                counts = await _count_segments(db, rows, service, loop, pool)
+
+                values = []
+                for row, meta in zip(rows, metadata):
+                    if isinstance(meta, BaseException):
+                        failed += 1
+                        print(f"Erro ao ler metadados do áudio {row.id} ({row.nome_arquivo}): {str(meta)}")
+                        continue
+                    values.append({"id": row.id, "qtd_segmentos": counts.get(row.id), **meta})
+
+                if values:
+                    await db.execute(update(Audio), values)
+                    await db.commit()
+                updated += len(values)
+                last_id = rows[-1].id
+                print(f"Até o áudio {last_id}: {updated} atualizados, {failed} falhas.")
+
+    print(f"Concluído: {updated} áudios atualizados, {failed} falhas.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preenche os metadados dos áudios.")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8, help="Requisições S3 simultâneas")
+    parser.add_argument("--force", action="store_true", help="Reprocessa também áudios já preenchidos")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.threads, args.force))
+
+
+if __name__ == "__main__":
+    main()
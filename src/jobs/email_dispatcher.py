@@ -0,0 +1,54 @@
+"""
+Envia os emails enfileirados no Redis (códigos de confirmação e de redefinição
+de senha) fora da API, por exemplo com EMAIL_DISPATCHER_ENABLED=false nos workers.
+
+Uso:
+    python -m src.jobs.email_dispatcher
+    python -m src.jobs.email_dispatcher --loop --interval 1
+    python -m src.jobs.email_dispatcher --requeue-failed
+"""
+import argparse
+import asyncio
+
+from src.redis_client import close_redis
+from src.services.email_outbox_service import EMAIL_BATCH_SIZE, EmailDispatcher
+
+
+async def process(batch_size: int, loop: bool, interval: float, requeue_failed: bool) -> None:
+    dispatcher = EmailDispatcher()
+    try:
+        if requeue_failed:
+            print(f"reenfileirados={await dispatcher.requeue_failed()}")
+        while True:
+            totals = await dispatcher.run(batch_size=batch_size)
+            pendentes = await dispatcher.pending()
+            print(
+                f"enviados={totals['enviados']} reenfileirados={totals['reenfileirados']} "
+                f"falhas={totals['falhas']} na_fila={pendentes['na_fila']} "
+                f"falhas_total={pendentes['falhas']}"
+            )
+            if not loop:
+                break
+            await asyncio.sleep(interval)
+    finally:
+        await close_redis()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=EMAIL_BATCH_SIZE)
+    parser.add_argument("--loop", action="store_true", help="Executa continuamente")
+    parser.add_argument(
+        "--interval", type=float, default=1, help="Segundos entre execuções com --loop"
+    )
+    parser.add_argument(
+        "--requeue-failed",
+        action="store_true",
+        help="Devolve à fila os emails que esgotaram as tentativas",
+    )
+    args = parser.parse_args()
+    asyncio.run(process(args.batch_size, args.loop, args.interval, args.requeue_failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Reconstrói a tabela de contadores contagem_audio a partir da tabela audio e
+informa as divergências encontradas (contagens mantidas pelos triggers que não
+batem com a contagem real).
+
+Uso:
+    python -m src.jobs.reconcile_counters
+    python -m src.jobs.reconcile_counters --dry-run
+"""
+import argparse
+import asyncio
+import sys
+
+from src.database import async_session
+from src.services.stats_service import StatsService
+
+
+async def reconcile(dry_run: bool) -> int:
+    async with async_session() as db:
+        drift = await StatsService().reconcile_counters(db, apply=not dry_run)
+
+    for item in drift:
+        print(
+            f"participante {item['id_participante']} / vocalização {item['id_vocalizacao']}: "
+            f"quantidade {item['quantidade']} (esperado {item['quantidade_esperada']}), "
+            f"duração {item['duracao_total']:.1f}s (esperado {item['duracao_esperada']:.1f}s)"
+        )
+    acao = "encontradas" if dry_run else "corrigidas"
+    print(f"Reconciliação concluída: {len(drift)} divergências {acao}.")
+    return len(drift)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Apenas informa as divergências, sem reconstruir a tabela",
+    )
+    args = parser.parse_args()
+    drift = asyncio.run(reconcile(args.dry_run))
+    if args.dry_run and drift:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compara o bucket S3 com o banco e informa objetos órfãos (sem áudio, segmento
+ou operação pendente que os referencie) e áudios ou segmentos sem objeto.
+
+Lista o bucket inteiro com paginação, em faixas de chaves varridas em paralelo,
+e compara cada faixa com as chaves do banco em ordem, com memória constante.
+Com --delete, a remoção dos órfãos é registrada no outbox de armazenamento e as
+linhas sem objeto são removidas, após confirmar cada achado novamente.
+
+Uso:
+    python -m src.jobs.reconcile_storage
+    python -m src.jobs.reconcile_storage --shards 32 --workers 8 --output achados.ndjson
+    python -m src.jobs.reconcile_storage --delete
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from src.services.storage_outbox_service import drain_storage_outbox
+from src.services.storage_reconciliation_service import (
+    RECONCILE_MIN_AGE_SECONDS,
+    RECONCILE_SHARDS,
+    RECONCILE_WORKERS,
+    StorageReconciler,
+)
+
+
+async def reconcile(args) -> dict:
+    output = open(args.output, "w") if args.output else sys.stdout
+
+    def report(item: dict) -> None:
+        output.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+    try:
+        totals = await StorageReconciler(min_age_seconds=args.min_age).run(
+            shards=args.shards,
+            workers=args.workers,
+            apply=args.delete,
+            on_finding=report,
+        )
+    finally:
+        if args.output:
+            output.close()
+
+    if args.delete and totals["orfaos"]:
+        await drain_storage_outbox()
+    print(
+        f"faixas={totals['faixas']} orfaos={totals['orfaos']} "
+        f"pendentes={totals['pendentes']} removidos={totals['removidos']}",
+        file=sys.stderr,
+    )
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shards", type=int, default=RECONCILE_SHARDS)
+    parser.add_argument(
+        "--workers", type=int, default=RECONCILE_WORKERS, help="Faixas varridas ao mesmo tempo"
+    )
+    parser.add_argument(
+        "--min-age",
+        type=int,
+        default=RECONCILE_MIN_AGE_SECONDS,
+        help="Ignora objetos modificados há menos segundos que isso",
+    )
+    parser.add_argument("--output", help="Arquivo NDJSON com os achados (padrão: stdout)")
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="Remove os órfãos (via outbox) e as linhas sem objeto",
+    )
+    args = parser.parse_args()
+    totals = asyncio.run(reconcile(args))
+    if not args.delete and (totals["orfaos"] or totals["pendentes"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
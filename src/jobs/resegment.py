@@ -0,0 +1,101 @@
+"""
+Reprocessa a segmentação dos áudios já armazenados.
+
+Uso:
+    python -m src.jobs.resegment --vocalizacao 3 --engine adaptive --params '{"margin_db": 12}'
+    python -m src.jobs.resegment --participante 5 --desde 2025-01-01 --ate 2025-07-01
+    python -m src.jobs.resegment --resume /tmp/vocalizeai-resegment/<job_id>.json
+    python -m src.jobs.resegment --pendentes --loop --interval 60
+
+Os jobs criados pela API (POST /audios/resegmentacao) ficam pendentes até serem
+executados com --pendentes.
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+from src.services.resegmentation_service import (
+    JobLockedError,
+    ResegmentationJob,
+    pending_checkpoints,
+)
+
+
+def _print_progress(state: dict) -> None:
+    total = state["total"] or 0
+    percent = state["processados"] * 100 / total if total else 100.0
+    print(
+        f"[{state['job_id']}] {state['processados']}/{total} ({percent:.1f}%) "
+        f"falhas={state['falhas']} segmentos={state['segmentos_criados']} "
+        f"remocoes={state['remocoes_registradas']} ultimo_id={state['ultimo_id']}"
+    )
+
+
+def _print_done(state: dict) -> None:
+    print(f"Job {state['job_id']} {state['status']}: {state['processados']} áudios processados, {state['falhas']} falhas.")
+
+
+async def run_pending(loop: bool, interval: float) -> None:
+    """Executa os jobs pendentes; os que outro executor já detém são ignorados."""
+    while True:
+        for path in pending_checkpoints():
+            job = ResegmentationJob.load(path)
+            print(f"Checkpoint: {path}")
+            try:
+                _print_done(await job.run(on_progress=_print_progress))
+            except JobLockedError as e:
+                print(str(e))
+            except Exception as e:
+                print(f"Erro no job {job.state['job_id']}: {str(e)}")
+        if not loop:
+            break
+        await asyncio.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprocessa a segmentação dos áudios.")
+    parser.add_argument("--vocalizacao", type=int, help="Filtra por id da vocalização")
+    parser.add_argument("--participante", type=int, help="Filtra por id do participante")
+    parser.add_argument("--desde", type=datetime.fromisoformat, help="Criados a partir de (ISO 8601)")
+    parser.add_argument("--ate", type=datetime.fromisoformat, help="Criados antes de (ISO 8601)")
+    parser.add_argument("--engine", help="Motor de VAD (padrão: o da vocalização)")
+    parser.add_argument("--params", type=json.loads, help="Parâmetros do motor em JSON")
+    parser.add_argument("--workers", type=int, help="Processos do pool")
+    parser.add_argument("--checkpoint", help="Caminho do arquivo de checkpoint")
+    parser.add_argument("--resume", metavar="CHECKPOINT", help="Retoma a partir de um checkpoint")
+    parser.add_argument("--pendentes", action="store_true", help="Executa os jobs pendentes criados pela API")
+    parser.add_argument("--loop", action="store_true", help="Com --pendentes, executa continuamente")
+    parser.add_argument("--interval", type=float, default=60, help="Segundos entre execuções com --loop")
+    args = parser.parse_args()
+
+    if args.pendentes:
+        asyncio.run(run_pending(args.loop, args.interval))
+        return
+    if args.resume:
+        job = ResegmentationJob.load(args.resume)
+    else:
+        try:
+            job = ResegmentationJob.create(
+                id_vocalizacao=args.vocalizacao,
+                id_participante=args.participante,
+                data_inicio=args.desde,
+                data_fim=args.ate,
+                vad_engine=args.engine,
+                vad_params=args.params,
+                workers=args.workers,
+                checkpoint_path=args.checkpoint,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+
+    print(f"Checkpoint: {job.checkpoint_path}")
+    try:
+        state = asyncio.run(job.run(on_progress=_print_progress))
+    except JobLockedError as e:
+        parser.exit(1, f"{e}\n")
+    _print_done(state)
+
+
+if __name__ == "__main__":
+    main()
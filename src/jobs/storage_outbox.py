@@ -0,0 +1,44 @@
+"""
+Aplica no S3 as operações registradas na tabela storage_outbox (remoções e
+movimentações de objetos) pelas escritas de áudios, vocalizações,
+participantes e usuários.
+
+Uso:
+    python -m src.jobs.storage_outbox
+    python -m src.jobs.storage_outbox --loop --interval 60
+"""
+import argparse
+import asyncio
+
+from src.database import async_session
+from src.services.storage_outbox_service import OUTBOX_BATCH_SIZE, StorageOutboxWorker
+
+
+async def process(batch_size: int, loop: bool, interval: float) -> None:
+    worker = StorageOutboxWorker()
+    while True:
+        totals = await worker.run(batch_size=batch_size)
+        async with async_session() as db:
+            pendentes = await worker.pending(db)
+        print(
+            f"linhas={totals['linhas']} objetos={totals['objetos']} "
+            f"falhas={totals['falhas']} pendentes={pendentes}"
+        )
+        if not loop:
+            break
+        await asyncio.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+    parser.add_argument("--loop", action="store_true", help="Executa continuamente")
+    parser.add_argument(
+        "--interval", type=float, default=60, help="Segundos entre execuções com --loop"
+    )
+    args = parser.parse_args()
+    asyncio.run(process(args.batch_size, args.loop, args.interval))
+
+
+if __name__ == "__main__":
+    main()
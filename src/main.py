@@ -1,24 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
 from src.controllers import (
+    admin_controller,
     audio_controller,
     auth_controller,
+    estatisticas_controller,
+    health_controller,
     participante_controller,
     usuario_controller,
     vocalizacao_controller,
 )
 from src.security import get_api_key
-from src.database import ENV_TYPE
+from src.database import ENV_TYPE, mark_recent_write
+from src.redis_client import close_redis, init_redis
+from src.services.email_outbox_service import EMAIL_DISPATCHER_ENABLED, dispatch_emails
+from src.utils.principal_cache import listen_invalidations
+from src.utils.token_revocation import sync_revocations
 
 root_path = os.getenv("API_ROOT_PATH", "")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Um único pool Redis por processo, aberto na subida e fechado no
+    desligamento, e as tarefas de fundo que dependem dele
+    """
+    await init_redis()
+    tasks = [
+        asyncio.create_task(listen_invalidations()),
+        asyncio.create_task(sync_revocations()),
+    ]
+    if EMAIL_DISPATCHER_ENABLED:
+        tasks.append(asyncio.create_task(dispatch_emails()))
+    yield
+    for task in tasks:
+        task.cancel()
+    with suppress(asyncio.CancelledError):
+        await asyncio.gather(*tasks)
+    await close_redis()
+
+
 app = FastAPI(
     title=f"VocalizeAI API - {ENV_TYPE.upper()}",
     description=f"API para o projeto VocalizeAI - Ambiente: {ENV_TYPE.upper()}",
     redoc_url=None,
-    root_path=root_path
+    root_path=root_path,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -30,6 +63,15 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def read_your_writes(request, call_next):
+    """Escritas bem-sucedidas direcionam as leituras do usuário ao primário por alguns segundos"""
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        await mark_recent_write(request)
+    return response
+
+
 @app.middleware("http")
 async def add_environment_header(request, call_next):
     response = await call_next(request)
@@ -37,6 +79,12 @@ async def add_environment_header(request, call_next):
     return response
 
 
+app.include_router(
+    admin_controller.router,
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(get_api_key)],
+)
 app.include_router(
     audio_controller.router,
     prefix="/audios",
@@ -49,6 +97,18 @@ app.include_router(
     tags=["Auth"],
     dependencies=[Depends(get_api_key)],
 )
+app.include_router(
+    estatisticas_controller.router,
+    prefix="/estatisticas",
+    tags=["Estatisticas"],
+    dependencies=[Depends(get_api_key)],
+)
+# Sem API key: usado pelos probes do orquestrador
+app.include_router(
+    health_controller.router,
+    prefix="/health",
+    tags=["Status"],
+)
 app.include_router(
     participante_controller.router,
     prefix="/participantes",
@@ -1,7 +1,19 @@
 from .audio_model import Audio
 from .classificacao_model import Classificacao
+from .contagem_audio_model import ContagemAudio
 from .participante_model import Participante
+from .segmento_model import Segmento
+from .storage_outbox_model import StorageOutbox
 from .usuario_model import Usuario
 from .vocalizacao_model import Vocalizacao
 
-__all__ = ["Audio", "Classificacao", "Participante", "Usuario", "Vocalizacao"]
+__all__ = [
+    "Audio",
+    "Classificacao",
+    "ContagemAudio",
+    "Participante",
+    "Segmento",
+    "StorageOutbox",
+    "Usuario",
+    "Vocalizacao",
+]
@@ -1,10 +1,20 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, DateTime, func
+from typing import Optional
+
+from sqlalchemy import BigInteger, Float, Index, Integer, String, ForeignKey, DateTime, func, text
 from src.database import Base
 
 
 class Audio(Base):
     __tablename__ = "audio"
+    __table_args__ = (
+        Index("ix_audio_id_participante_duracao", "id_participante", "duracao"),
+        Index("ix_audio_id_participante_created_at", "id_participante", "created_at"),
+        Index("ix_audio_id_usuario_created_at", "id_usuario", "created_at"),
+        Index("ix_audio_id_vocalizacao_created_at", "id_vocalizacao", "created_at"),
+        Index("ix_audio_created_at_id", "created_at", "id"),
+        Index("ix_audio_nome_arquivo_c", text('nome_arquivo COLLATE "C"')),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     nome_arquivo: Mapped[str] = mapped_column(String, nullable=False)
@@ -17,6 +27,15 @@ class Audio(Base):
     id_participante: Mapped[int] = mapped_column(
         ForeignKey("participante.id", ondelete="CASCADE"), nullable=False
     )
+    duracao: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    taxa_amostragem: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    canais: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    codec: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    tamanho_bytes: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    qtd_segmentos: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    versao_segmentacao: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -27,3 +46,9 @@ class Audio(Base):
     vocalizacao: Mapped["Vocalizacao"] = relationship(back_populates="audios")
     usuario: Mapped["Usuario"] = relationship(back_populates="audios")
     participante: Mapped["Participante"] = relationship(back_populates="audios")
+    segmentos: Mapped[list["Segmento"]] = relationship(
+        back_populates="audio",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="Segmento.numero",
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class ContagemAudio(Base):
+    """
+    Quantidade e duração total dos áudios por participante e vocalização.
+    Mantida por triggers na tabela audio (migração 2f7b3e9c4d15); não escrever
+    diretamente pela aplicação. Reconstruída por `python -m src.jobs.reconcile_counters`.
+    """
+
+    __tablename__ = "contagem_audio"
+
+    id_participante: Mapped[int] = mapped_column(
+        ForeignKey("participante.id", ondelete="CASCADE"), primary_key=True
+    )
+    id_vocalizacao: Mapped[int] = mapped_column(
+        ForeignKey("vocalizacao.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    quantidade: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    duracao_total: Mapped[float] = mapped_column(
+        Float, nullable=False, server_default="0"
+    )
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
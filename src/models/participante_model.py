@@ -1,14 +1,15 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, DateTime, func
+from sqlalchemy import Index, String, ForeignKey, DateTime, func
 from src.database import Base
 
 
 class Participante(Base):
     __tablename__ = "participante"
+    __table_args__ = (Index("ix_participante_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     id_usuario: Mapped[int] = mapped_column(
-        ForeignKey("usuario.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("usuario.id", ondelete="CASCADE"), nullable=False, index=True
     )
     nome: Mapped[str] = mapped_column(
         String, nullable=False, server_default="Participante"
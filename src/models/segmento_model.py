@@ -0,0 +1,36 @@
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.database import Base
+
+
+class Segmento(Base):
+    __tablename__ = "segmento"
+    __table_args__ = (
+        Index("ix_segmento_nome_arquivo_c", text('nome_arquivo COLLATE "C"')),
+        Index("ix_segmento_created_at_id", "created_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id_audio: Mapped[int] = mapped_column(
+        ForeignKey("audio.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    numero: Mapped[int] = mapped_column(Integer, nullable=False)
+    versao: Mapped[int] = mapped_column(Integer, nullable=False)
+    nome_arquivo: Mapped[str] = mapped_column(String, nullable=False)
+    inicio: Mapped[float] = mapped_column(Float, nullable=False)
+    fim: Mapped[float] = mapped_column(Float, nullable=False)
+    duracao: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    pico_db: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rms_db: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    snr_db: Mapped[Optional[float]] = mapped_column(Float, nullable=True, index=True)
+    taxa_clipping: Mapped[Optional[float]] = mapped_column(
+        Float, nullable=True, index=True
+    )
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    audio: Mapped["Audio"] = relationship(back_populates="segmentos")
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+OUTBOX_DELETE = "delete"
+OUTBOX_DELETE_PREFIX = "delete_prefix"
+OUTBOX_MOVE = "move"
+OUTBOX_MOVE_PREFIX = "move_prefix"
+
+
+class StorageOutbox(Base):
+    """
+    Operação no S3 pendente, gravada na mesma transação da alteração no banco e
+    aplicada depois pelo worker. `chave` é a chave (ou prefixo) de origem e
+    `destino`, nas movimentações, a chave (ou prefixo) de destino.
+    """
+
+    __tablename__ = "storage_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    operacao: Mapped[str] = mapped_column(String, nullable=False)
+    chave: Mapped[str] = mapped_column(String, nullable=False)
+    destino: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    tentativas: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    ultimo_erro: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    disponivel_em: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, DateTime, String, func, text
+from sqlalchemy import Boolean, DateTime, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -6,6 +6,7 @@ from src.database import Base
 
 class Usuario(Base):
     __tablename__ = "usuario"
+    __table_args__ = (Index("ix_usuario_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     nome: Mapped[str] = mapped_column(String, nullable=False)
@@ -1,4 +1,6 @@
-from sqlalchemy import DateTime, ForeignKey, String, func
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, ForeignKey, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -10,11 +12,13 @@ class Vocalizacao(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     nome: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     descricao: Mapped[str] = mapped_column(String)
+    vad_engine: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    vad_params: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
     id_usuario: Mapped[int] = mapped_column(
-        ForeignKey("usuario.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("usuario.id", ondelete="CASCADE"), nullable=False, index=True
     )
     updated_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
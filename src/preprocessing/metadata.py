@@ -0,0 +1,73 @@
+import struct
+
+WAV_HEADER_BYTES = 4096
+WAV_HEADER_MAX_BYTES = 65536
+
+_FORMAT_PCM = 0x0001
+_FORMAT_FLOAT = 0x0003
+_FORMAT_ALAW = 0x0006
+_FORMAT_MULAW = 0x0007
+_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class IncompleteHeaderError(ValueError):
+    """O trecho lido não contém o cabeçalho WAV completo."""
+
+
+def _codec_name(format_tag: int, bits: int) -> str:
+    if format_tag == _FORMAT_PCM:
+        return "pcm_u8" if bits == 8 else f"pcm_s{bits}le"
+    if format_tag == _FORMAT_FLOAT:
+        return f"pcm_f{bits}le"
+    if format_tag == _FORMAT_ALAW:
+        return "pcm_alaw"
+    if format_tag == _FORMAT_MULAW:
+        return "pcm_mulaw"
+    return f"wav_0x{format_tag:04x}"
+
+
+def parse_wav_header(header: bytes, total_size: int = None) -> dict:
+    """
+    Extrai os metadados de um WAV lendo apenas o cabeçalho (chunks RIFF até o
+    início de "data"). `total_size` é o tamanho do arquivo completo, usado quando
+    o cabeçalho não informa o tamanho dos dados (WAV gerado em streaming).
+    """
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Arquivo não é um WAV válido.")
+
+    fmt = None
+    data_size = None
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id, size = struct.unpack_from("<4sI", header, offset)
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            if body + 16 > len(header):
+                raise IncompleteHeaderError("Chunk fmt incompleto.")
+            format_tag, channels, sample_rate, byte_rate, _, bits = struct.unpack_from(
+                "<HHIIHH", header, body
+            )
+            if format_tag == _FORMAT_EXTENSIBLE and size >= 40 and body + 26 <= len(header):
+                # Formato real nos dois primeiros bytes do GUID do subformato
+                (format_tag,) = struct.unpack_from("<H", header, body + 24)
+            fmt = (format_tag, channels, sample_rate, byte_rate, bits)
+        elif chunk_id == b"data":
+            data_size = size
+            if size in (0, 0xFFFFFFFF) and total_size:
+                data_size = total_size - body
+            break
+
+        offset = body + size + (size & 1)
+
+    if fmt is None or data_size is None:
+        raise IncompleteHeaderError("Cabeçalho WAV incompleto.")
+
+    format_tag, channels, sample_rate, byte_rate, bits = fmt
+    return {
+        "duracao": data_size / byte_rate if byte_rate else None,
+        "taxa_amostragem": sample_rate,
+        "canais": channels,
+        "codec": _codec_name(format_tag, bits),
+        "tamanho_bytes": total_size,
+    }
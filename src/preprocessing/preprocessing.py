@@ -1,30 +1,86 @@
+import numpy as np
 from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
 
+from src.preprocessing.vad import VADEngine, audio_to_array, get_engine
 
-def segment_data(file_path, final_padding=200, min_silence_len=300, silence_thresh=-40):
+CLIPPING_LEVEL = 0.999
+_EPS = 1e-10
+
+
+def segment_metrics(
+    samples: np.ndarray, sample_rate: int, ranges_ms, noise_floor_db: float
+) -> dict:
+    """
+    Calcula pico, RMS, SNR estimada e taxa de clipping de cada trecho a partir do
+    sinal já decodificado. Energia e contagem de clipping por trecho vêm de somas
+    acumuladas calculadas em uma única passada, o pico de um único reduceat, e os
+    trechos podem se sobrepor.
+    """
+    if not len(ranges_ms):
+        empty = np.empty(0)
+        return {
+            "peak_db": empty,
+            "rms_db": empty,
+            "snr_db": empty,
+            "clipping_ratio": empty,
+        }
+
+    bounds = (np.asarray(ranges_ms, dtype=np.int64) * sample_rate) // 1000
+    starts = np.minimum(bounds[:, 0], samples.size)
+    ends = np.minimum(np.maximum(bounds[:, 1], starts + 1), samples.size)
+    # Trechos vazios (a partir do fim do sinal) têm pico, energia e clipping zero
+    lengths = ends - starts
+    nonempty = lengths > 0
+    divisors = np.maximum(lengths, 1)
+
+    # Uma posição extra zerada torna válido, no reduceat dos picos, o índice
+    # igual ao tamanho do sinal
+    padded = np.zeros(samples.size + 1, dtype=samples.dtype)
+    magnitude = np.abs(samples, out=padded[:-1])
+    energy = np.concatenate(([0.0], np.cumsum(np.square(samples, dtype=np.float64))))
+    clipped = np.concatenate(([0], np.cumsum(magnitude >= CLIPPING_LEVEL)))
+
+    rms_db = 10 * np.log10((energy[ends] - energy[starts]) / divisors + _EPS)
+    # Pico por trecho com um único reduceat sobre os índices intercalados
+    # [início, fim]: as posições pares cobrem cada trecho, mesmo sobrepostos
+    peaks = np.maximum.reduceat(padded, np.column_stack((starts, ends)).ravel())[::2]
+    peaks = np.where(nonempty, peaks, 0.0)
+    return {
+        "peak_db": 20 * np.log10(peaks + _EPS),
+        "rms_db": rms_db,
+        "snr_db": rms_db - noise_floor_db,
+        "clipping_ratio": (clipped[ends] - clipped[starts]) / divisors,
+    }
+
+
+def segment_data(file_path, final_padding=200, engine=None, engine_params=None):
     """
     Segmenta o áudio em partes não silenciosas e retorna os segmentos processados.
     Args:
         file_path: Caminho do arquivo de áudio.
         final_padding: Padding final adicionado em milissegundos.
-        min_silence_len: Duração mínima do silêncio (ms).
-        silence_thresh: Limite de volume para considerar silêncio.
+        engine: Nome do motor de VAD registrado ou uma instância de VADEngine.
+        engine_params: Parâmetros do motor (ex.: min_silence_len, margin_db).
     Returns:
-        Lista de dicionários com dados dos segmentos.
+        Lista de dicionários com dados dos segmentos, incluindo métricas de
+        qualidade (pico, RMS e SNR em dB e taxa de clipping).
     """
+    vad = engine if isinstance(engine, VADEngine) else get_engine(engine, engine_params)
+
     audio = AudioSegment.from_file(file_path, format="wav")
-    nonsilent_ranges = detect_nonsilent(
-        audio, min_silence_len=min_silence_len, silence_thresh=silence_thresh
-    )
+    samples = audio_to_array(audio)
+    result = vad.detect(samples, audio.frame_rate)
 
-    segments_info = []
+    # Adiciona padding ao início e ao final
+    ranges = [
+        (max(0, start - final_padding), min(len(audio), end + final_padding))
+        for start, end in result.ranges
+    ]
+    metrics = segment_metrics(samples, audio.frame_rate, ranges, result.noise_floor_db)
 
-    for idx, (start, end) in enumerate(nonsilent_ranges):
-        # Adiciona padding ao início e ao final
-        start = max(0, start - final_padding)
-        end = min(len(audio), end + final_padding)
+    segments_info = []
 
+    for idx, (start, end) in enumerate(ranges):
         segment = audio[start:end]
         segments_info.append(
             {
@@ -32,6 +88,10 @@ def segment_data(file_path, final_padding=200, min_silence_len=300, silence_thre
                 "start_time": start / 1000,
                 "end_time": end / 1000,
                 "duration": (end - start) / 1000,
+                "peak_db": float(metrics["peak_db"][idx]),
+                "rms_db": float(metrics["rms_db"][idx]),
+                "snr_db": float(metrics["snr_db"][idx]),
+                "clipping_ratio": float(metrics["clipping_ratio"][idx]),
             }
         )
 
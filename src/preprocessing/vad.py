@@ -0,0 +1,221 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from pydub import AudioSegment
+
+DEFAULT_VAD_ENGINE = os.getenv("VAD_ENGINE", "adaptive")
+
+VAD_ENGINES: dict[str, type["VADEngine"]] = {}
+
+_EPS = 1e-10
+
+
+def register_engine(name: str):
+    """Registra um motor de VAD no registro global com o nome informado."""
+
+    def decorator(cls):
+        cls.name = name
+        VAD_ENGINES[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_engine(name: str = None, params: dict = None) -> "VADEngine":
+    """
+    Instancia o motor de VAD pelo nome.
+    Levanta ValueError para motores desconhecidos ou parâmetros inválidos.
+    """
+    name = name or DEFAULT_VAD_ENGINE
+    engine_cls = VAD_ENGINES.get(name)
+    if engine_cls is None:
+        raise ValueError(
+            f"Motor de VAD desconhecido: '{name}'. "
+            f"Disponíveis: {', '.join(sorted(VAD_ENGINES))}."
+        )
+    try:
+        return engine_cls(**(params or {}))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Parâmetros inválidos para o motor '{name}': {str(e)}")
+
+
+def _number(name: str, value, minimum: float = None, maximum: float = None) -> float:
+    """
+    Valida um parâmetro numérico do motor. Levanta ValueError para tipos não
+    numéricos, valores não finitos ou fora de [minimum, maximum].
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} deve ser numérico.")
+    if not np.isfinite(value):
+        raise ValueError(f"{name} deve ser finito.")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} deve ser maior ou igual a {minimum:g}.")
+    if maximum is not None and value > maximum:
+        raise ValueError(f"{name} deve ser menor ou igual a {maximum:g}.")
+    return value
+
+
+def audio_to_array(audio: AudioSegment) -> np.ndarray:
+    """Converte o áudio em um vetor mono float32 normalizado em [-1, 1]."""
+    if audio.sample_width == 3:
+        audio = audio.set_sample_width(4)
+    samples = audio.get_array_of_samples()
+    data = np.frombuffer(samples, dtype=samples.typecode).astype(np.float32)
+    data /= float(1 << (8 * audio.sample_width - 1))
+    if audio.channels > 1:
+        data = data.reshape(-1, audio.channels).mean(axis=1)
+    return data
+
+
+@dataclass
+class VADResult:
+    ranges: list[tuple[int, int]]
+    noise_floor_db: float
+    threshold_db: float
+
+
+class VADEngine:
+    """
+    Base dos motores de VAD. O sinal é dividido em quadros sem sobreposição e
+    cada motor classifica os quadros como ativos ou silenciosos.
+    """
+
+    name = None
+
+    def __init__(
+        self,
+        min_silence_len: int = 300,
+        min_speech_len: int = 100,
+        frame_ms: int = 20,
+        noise_percentile: float = 10.0,
+    ):
+        if _number("frame_ms", frame_ms) <= 0:
+            raise ValueError("frame_ms deve ser positivo.")
+        self.min_silence_len = _number("min_silence_len", min_silence_len, minimum=0)
+        self.min_speech_len = _number("min_speech_len", min_speech_len, minimum=0)
+        self.frame_ms = frame_ms
+        self.noise_percentile = _number(
+            "noise_percentile", noise_percentile, minimum=0, maximum=100
+        )
+
+    def threshold(self, frames_db: np.ndarray, noise_floor_db: float) -> float:
+        raise NotImplementedError
+
+    def classify(
+        self, frames: np.ndarray, frames_db: np.ndarray, threshold_db: float
+    ) -> np.ndarray:
+        return frames_db > threshold_db
+
+    def detect(self, samples: np.ndarray, sample_rate: int) -> VADResult:
+        """Retorna os trechos ativos do sinal em milissegundos."""
+        frame_len = max(1, int(sample_rate * self.frame_ms / 1000))
+        if samples.size == 0:
+            return VADResult([], 20 * np.log10(_EPS), 0.0)
+
+        frames = _frame_signal(samples, frame_len)
+        frames_db = 10 * np.log10(np.mean(np.square(frames), axis=1) + _EPS)
+        noise_floor_db = float(np.percentile(frames_db, self.noise_percentile))
+        threshold_db = float(self.threshold(frames_db, noise_floor_db))
+        mask = self.classify(frames, frames_db, threshold_db)
+
+        frame_ms = frame_len * 1000 / sample_rate
+        total_ms = int(samples.size * 1000 / sample_rate)
+        ranges = _mask_to_ranges(
+            mask,
+            frame_ms=frame_ms,
+            min_silence_frames=int(np.ceil(self.min_silence_len / frame_ms)),
+            min_speech_frames=int(np.ceil(self.min_speech_len / frame_ms)),
+            total_ms=total_ms,
+        )
+        return VADResult(ranges, noise_floor_db, threshold_db)
+
+
+@register_engine("fixed")
+class FixedThresholdEngine(VADEngine):
+    """Limiar fixo em dBFS, equivalente ao comportamento original do pydub."""
+
+    def __init__(self, silence_thresh: float = -40.0, **kwargs):
+        kwargs.setdefault("min_speech_len", 0)
+        super().__init__(**kwargs)
+        self.silence_thresh = _number("silence_thresh", silence_thresh)
+
+    def threshold(self, frames_db, noise_floor_db):
+        return self.silence_thresh
+
+
+@register_engine("adaptive")
+class AdaptiveEnergyEngine(VADEngine):
+    """
+    Limiar de energia calibrado pelo ruído de fundo de cada arquivo: o percentil
+    `noise_percentile` da energia dos quadros somado a `margin_db`, limitado a
+    [`min_thresh`, `max_thresh`].
+    """
+
+    def __init__(
+        self,
+        margin_db: float = 10.0,
+        min_thresh: float = -60.0,
+        max_thresh: float = -20.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.margin_db = _number("margin_db", margin_db)
+        self.min_thresh = _number("min_thresh", min_thresh)
+        self.max_thresh = _number("max_thresh", max_thresh)
+        if self.min_thresh > self.max_thresh:
+            raise ValueError("min_thresh deve ser menor ou igual a max_thresh.")
+
+    def threshold(self, frames_db, noise_floor_db):
+        return np.clip(noise_floor_db + self.margin_db, self.min_thresh, self.max_thresh)
+
+
+@register_engine("energy_zcr")
+class EnergyZCREngine(AdaptiveEnergyEngine):
+    """
+    Energia adaptativa combinada à taxa de cruzamentos por zero. Quadros acima do
+    limiar só são aceitos com ZCR até `max_zcr` (sons vozeados), exceto quando a
+    energia supera o limiar em `strong_margin_db`.
+    """
+
+    def __init__(self, max_zcr: float = 0.25, strong_margin_db: float = 6.0, **kwargs):
+        super().__init__(**kwargs)
+        self.max_zcr = _number("max_zcr", max_zcr, minimum=0, maximum=1)
+        self.strong_margin_db = _number("strong_margin_db", strong_margin_db, minimum=0)
+
+    def classify(self, frames, frames_db, threshold_db):
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frames.shape[1]
+        voiced = (frames_db > threshold_db) & (zcr <= self.max_zcr)
+        strong = frames_db > threshold_db + self.strong_margin_db
+        return voiced | strong
+
+
+def _frame_signal(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    remainder = samples.size % frame_len
+    if remainder:
+        samples = np.pad(samples, (0, frame_len - remainder))
+    return samples.reshape(-1, frame_len)
+
+
+def _mask_to_ranges(
+    mask: np.ndarray,
+    frame_ms: float,
+    min_silence_frames: int,
+    min_speech_frames: int,
+    total_ms: int,
+) -> list[tuple[int, int]]:
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    if starts.size == 0:
+        return []
+
+    # Silêncios mais curtos que min_silence_len não separam segmentos
+    keep = (starts[1:] - ends[:-1]) >= min_silence_frames
+    starts = np.concatenate((starts[:1], starts[1:][keep]))
+    ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+
+    long_enough = (ends - starts) >= min_speech_frames
+    starts_ms = np.round(starts[long_enough] * frame_ms).astype(int)
+    ends_ms = np.minimum(np.round(ends[long_enough] * frame_ms).astype(int), total_ms)
+    return list(zip(starts_ms.tolist(), ends_ms.tolist()))
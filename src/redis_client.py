@@ -0,0 +1,86 @@
+import os
+
+from redis import asyncio as aioredis
+from redis.asyncio.retry import Retry
+from redis.backoff import EqualJitterBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from src.utils.resilience import redis_breaker
+
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 2))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 2))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 2))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", 2))
+
+_client: aioredis.Redis | None = None
+
+
+def create_pool() -> aioredis.BlockingConnectionPool:
+    """
+    Pool limitado a REDIS_MAX_CONNECTIONS: com todas as conexões em uso, a
+    próxima espera até REDIS_POOL_TIMEOUT segundos em vez de abrir outra.
+    """
+    return aioredis.BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=0,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        # Falhas de conexão e timeouts são repetidos com espera curta e jitter
+        retry=Retry(EqualJitterBackoff(cap=0.5, base=0.05), REDIS_RETRIES),
+        retry_on_error=[RedisConnectionError, RedisTimeoutError],
+    )
+
+
+class ResilientRedis(aioredis.Redis):
+    """
+    Cliente que passa cada comando pelo disjuntor do Redis: com ele aberto, os
+    comandos falham na hora com ConnectionError, que os chamadores já tratam
+    (cache, limitador, idempotência seguem sem Redis), em vez de esperar o
+    timeout a cada requisição.
+    """
+
+    async def execute_command(self, *args, **options):
+        if not redis_breaker.allow():
+            raise RedisConnectionError("Redis indisponível: disjuntor aberto.")
+        try:
+            result = await super().execute_command(*args, **options)
+        except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+            # Pool esgotado é saturação deste processo, não falha do Redis
+            if str(e) != "No connection available.":
+                redis_breaker.record_failure(e)
+            raise
+        redis_breaker.record_success()
+        return result
+
+
+async def init_redis() -> aioredis.Redis:
+    """Cria o cliente compartilhado no início da aplicação (lifespan)."""
+    return get_redis()
+
+
+async def close_redis() -> None:
+    """Fecha o cliente e desconecta todas as conexões do pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose(close_connection_pool=True)
+        _client = None
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Retorna o cliente Redis assíncrono compartilhado pelo processo. Fora da API
+    (jobs de linha de comando), o cliente é criado no primeiro uso.
+    """
+    global _client
+    if _client is None:
+        _client = ResilientRedis(connection_pool=create_pool())
+    return _client
@@ -0,0 +1,72 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    tamanho: int
+    em_uso: int
+    disponiveis: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    checkouts: int
+    timeouts: int
+    espera_media_ms: float
+    espera_max_ms: float
+    histograma_espera: dict[str, int]
+
+
+class ReplicaStatus(BaseModel):
+    configurada: bool
+    saudavel: bool
+    atraso_segundos: Optional[float] = None
+    erro: Optional[str] = None
+    pool: Optional[PoolStatus] = None
+
+
+class RevocationStatus(BaseModel):
+    sincronizado: bool
+    itens: int
+    bits: int
+    consultas_redis: int
+    consultas_evitadas: int
+
+
+class ClaimsCacheStatus(BaseModel):
+    tamanho: int
+    capacidade: int
+    acertos: int
+    falhas: int
+    taxa_acerto: float
+
+
+class PasswordHasherStatus(BaseModel):
+    threads: int
+    em_execucao: int
+    na_fila: int
+    concluidos: int
+    espera_media_ms: float
+    espera_max_ms: float
+    execucao_media_ms: float
+
+
+class AdmissionStatus(BaseModel):
+    em_andamento: int
+    max_simultaneos: int
+    bytes_em_andamento: int
+    max_bytes: int
+    na_fila: int
+    max_fila: int
+    admitidos: int
+    rejeitados: int
+    espera_media_ms: float
+    espera_max_ms: float
+
+
+class CircuitBreakerStatus(BaseModel):
+    nome: str
+    estado: str
+    falhas_seguidas: int
+    rejeitadas: int
+    ultimo_erro: Optional[str] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 
 class AudioBase(BaseModel):
@@ -16,5 +17,12 @@ class AudioCreate(AudioBase):
 class AudioResponse(AudioBase):
     id: int
     id_usuario: int
+    versao_segmentacao: int = 1
+    duracao: Optional[float] = None
+    taxa_amostragem: Optional[int] = None
+    canais: Optional[int] = None
+    codec: Optional[str] = None
+    tamanho_bytes: Optional[int] = None
+    qtd_segmentos: Optional[int] = None
     created_at: datetime
     updated_at: datetime
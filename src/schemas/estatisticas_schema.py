@@ -0,0 +1,57 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class QuantidadeParticipante(BaseModel):
+    id_participante: int
+    quantidade: int
+    duracao_total: float
+
+
+class QuantidadeUsuario(BaseModel):
+    id_usuario: int
+    quantidade: int
+    duracao_total: float
+
+
+class QuantidadeVocalizacao(BaseModel):
+    id_vocalizacao: int
+    nome: str
+    quantidade: int
+    duracao_total: float
+
+
+class QuantidadeDia(BaseModel):
+    dia: date
+    quantidade: int
+    duracao_total: float
+
+
+class ClasseBalanceamento(BaseModel):
+    id_vocalizacao: int
+    nome: str
+    quantidade: int
+    proporcao: float
+
+
+class Balanceamento(BaseModel):
+    total: int
+    classes: list[ClasseBalanceamento]
+    razao_desbalanceamento: Optional[float] = None
+
+
+class Dashboard(BaseModel):
+    por_participante: list[QuantidadeParticipante]
+    por_usuario: list[QuantidadeUsuario]
+    por_vocalizacao: list[QuantidadeVocalizacao]
+    por_dia: list[QuantidadeDia]
+    balanceamento: Balanceamento
+
+
+class QuantidadeParticipanteVocalizacao(BaseModel):
+    id_participante: int
+    id_vocalizacao: int
+    quantidade: int
+    duracao_total: float
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.schemas.admin_schema import CircuitBreakerStatus, PoolStatus
+
+
+class Liveness(BaseModel):
+    status: str
+
+
+class DependencyCheck(BaseModel):
+    ok: bool
+    latencia_ms: float
+    erro: Optional[str] = None
+
+
+class DatabasePoolHealth(PoolStatus):
+    saturado: bool
+
+
+class QueueDepth(BaseModel):
+    uploads: int
+    uploads_em_andamento: int
+    hash_senhas: int
+    emails: Optional[int] = None
+
+
+class Readiness(BaseModel):
+    status: str
+    pronto: bool
+    ambiente: str
+    verificado_em: Optional[datetime] = None
+    dependencias: dict[str, DependencyCheck]
+    pool_banco: DatabasePoolHealth
+    filas: QueueDepth
+    disjuntores: list[CircuitBreakerStatus]
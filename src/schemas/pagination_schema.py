@@ -0,0 +1,16 @@
+from enum import Enum
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
+
+
+class ListFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
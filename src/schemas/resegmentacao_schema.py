@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ResegmentacaoRequest(BaseModel):
+    id_vocalizacao: Optional[int] = None
+    id_participante: Optional[int] = None
+    data_inicio: Optional[datetime] = None
+    data_fim: Optional[datetime] = None
+    vad_engine: Optional[str] = None
+    vad_params: Optional[dict] = None
+    workers: Optional[int] = None
+
+
+class ResegmentacaoFiltros(BaseModel):
+    id_vocalizacao: Optional[int] = None
+    id_participante: Optional[int] = None
+    data_inicio: Optional[datetime] = None
+    data_fim: Optional[datetime] = None
+
+
+class ResegmentacaoErro(BaseModel):
+    id_audio: int
+    erro: str
+
+
+class ResegmentacaoStatus(BaseModel):
+    job_id: str
+    status: str
+    filtros: ResegmentacaoFiltros
+    vad_engine: Optional[str] = None
+    vad_params: Optional[dict] = None
+    workers: int
+    total: Optional[int] = None
+    processados: int
+    falhas: int
+    segmentos_criados: int
+    remocoes_registradas: int
+    ultimo_id: int
+    erros: list[ResegmentacaoErro] = []
+    erro: Optional[str] = None
+    iniciado_em: datetime
+    atualizado_em: datetime
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SegmentoResponse(BaseModel):
+    id: int
+    id_audio: int
+    numero: int
+    versao: int
+    nome_arquivo: str
+    inicio: float
+    fim: float
+    duracao: float
+    pico_db: Optional[float] = None
+    rms_db: Optional[float] = None
+    snr_db: Optional[float] = None
+    taxa_clipping: Optional[float] = None
+    created_at: datetime
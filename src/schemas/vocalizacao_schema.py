@@ -6,6 +6,8 @@ from datetime import datetime
 class VocalizacaoBase(BaseModel):
     nome: str
     descricao: str
+    vad_engine: Optional[str] = None
+    vad_params: Optional[dict] = None
 
 
 class VocalizacaoCreate(VocalizacaoBase):
@@ -15,6 +17,8 @@ class VocalizacaoCreate(VocalizacaoBase):
 class VocalizacaoUpdate(BaseModel):
     nome: Optional[str]
     descricao: Optional[str]
+    vad_engine: Optional[str] = None
+    vad_params: Optional[dict] = None
 
 
 class VocalizacaoResponse(VocalizacaoBase):
@@ -1,19 +1,26 @@
 import os
+import uuid
 from datetime import UTC, datetime, timedelta
+from functools import cache
 from http import HTTPStatus
 from typing import Optional
 
-import redis
 from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from jose import ExpiredSignatureError, JWTError, jwt
 from passlib.context import CryptContext
+from redis.exceptions import RedisError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db
 from src.models.usuario_model import Usuario
+from src.utils.claims_cache import claims_cache
+from src.utils.password_hasher import PasswordHasherExecutor
+from src.utils.principal_cache import Principal, principal_cache
+from src.utils.resilience import redis_breaker
+from src.utils.token_revocation import is_revoked
 
 load_dotenv()
 
@@ -26,16 +33,23 @@ API_KEY_NAME = "X-API-Key"
 API_KEY = os.getenv("API_KEY", "default_api_key")
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
-bearer_scheme = HTTPBearer()
-
-redis_client = redis.StrictRedis(
-    host=os.getenv("REDIS_HOST", "localhost"), 
-    port=int(os.getenv("REDIS_PORT", "6379")), 
-    db=0
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 4))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+
+# Hashes com parâmetros diferentes dos atuais continuam válidos e são refeitos
+# no próximo login (verify_and_update_password)
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
 )
+password_hasher = PasswordHasherExecutor(PASSWORD_HASH_WORKERS)
 
+bearer_scheme = HTTPBearer()
 
 async def get_api_key(api_key_header: str = Depends(api_key_header)):
     if api_key_header == API_KEY:
@@ -45,19 +59,28 @@ async def get_api_key(api_key_header: str = Depends(api_key_header)):
     )
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verifica a senha e, se o hash usa parâmetros antigos, devolve um novo hash."""
+    return await password_hasher.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.run(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     now = datetime.now(UTC)
     expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire, "iat": now})
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -65,11 +88,15 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     to_encode = data.copy()
     now = datetime.now(UTC)
     expire = now + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
-    to_encode.update({"exp": expire, "iat": now})
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 
 def decode_access_token(token: str, verify_exp: bool = True) -> dict:
+    if verify_exp:
+        claims = claims_cache.get(token)
+        if claims is not None:
+            return claims
     try:
         payload = jwt.decode(
             token,
@@ -77,6 +104,8 @@ def decode_access_token(token: str, verify_exp: bool = True) -> dict:
             algorithms=[ALGORITHM],
             options={"verify_exp": verify_exp},
         )
+        if verify_exp:
+            claims_cache.put(token, payload)
         return payload
     except ExpiredSignatureError:
         if verify_exp:
@@ -116,7 +145,13 @@ def decode_refresh_token(token: str, verify_exp: bool = True) -> dict:
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
-) -> Usuario:
+) -> Principal:
+    """
+    Resolve o usuário do token. O FastAPI executa a dependência uma vez por
+    requisição, mesmo declarada em `dependencies` e como parâmetro, e o
+    resultado vem do cache de principals quando possível; a sessão do banco só
+    abre uma conexão quando o usuário precisa ser lido.
+    """
     if not token.credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -124,13 +159,6 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if redis_client.exists(f"blacklist:{token.credentials}"):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token foi invalidado. Faça login novamente.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
     try:
         payload = decode_access_token(token.credentials)
         if "sub" not in payload:
@@ -140,28 +168,46 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        usuario_id = payload["sub"]
+        if await is_revoked(payload.get("jti"), token.credentials):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token foi invalidado. Faça login novamente.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
 
-        result = await db.execute(select(Usuario).where(Usuario.id == int(usuario_id)))
-        usuario = result.scalars().first()
-        if not usuario:
+        usuario_id = int(payload["sub"])
+
+        principal = principal_cache.get(usuario_id)
+        if principal is not None:
+            return principal
+
+        version = principal_cache.version
+        result = await db.execute(
+            select(Usuario.id, Usuario.role, Usuario.verificado).where(
+                Usuario.id == usuario_id
+            )
+        )
+        row = result.first()
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuário não encontrado ou foi excluído.",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return usuario
+        principal = Principal(id=row.id, role=row.role, verificado=row.verificado)
+        principal_cache.put(principal, version)
+        return principal
 
     except HTTPException:
         raise
-    except Exception as e:
+    except RedisError:
+        # Falha de infraestrutura, não do token: o cliente não deve descartar a sessão
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Erro desconhecido: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Não foi possível verificar o token no momento. Tente novamente.",
+            headers={"Retry-After": str(int(redis_breaker.reset_timeout))},
         )
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -170,8 +216,11 @@ async def get_current_user(
         )
 
 
+@cache
 def verify_role(role: str):
-    def role_dependency(current_user: Usuario = Depends(get_current_user)):
+    # Memoizada: a mesma função para o mesmo papel, para que o FastAPI a resolva
+    # uma única vez por requisição
+    def role_dependency(current_user: Principal = Depends(get_current_user)):
         if current_user.role != role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,34 +1,118 @@
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from tempfile import NamedTemporaryFile
 
 import boto3
 from botocore.client import Config
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 from fastapi import HTTPException, status
-from sqlalchemy import delete, select
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, String, and_, any_, delete, func, insert, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Audio, Usuario, Vocalizacao
+from src.models import Audio, Segmento, StorageOutbox, Usuario, Vocalizacao
 from src.models.participante_model import Participante
+from src.models.storage_outbox_model import (
+    OUTBOX_DELETE,
+    OUTBOX_DELETE_PREFIX,
+    OUTBOX_MOVE,
+    OUTBOX_MOVE_PREFIX,
+)
+from src.preprocessing.metadata import WAV_HEADER_BYTES, parse_wav_header
 from src.preprocessing.preprocessing import segment_data
+from src.preprocessing.vad import VADEngine, get_engine
 from src.schemas.usuario_schema import UsuarioResponse
+from src.services.stats_service import invalidate_stats
+from src.utils.pagination import PageParams, date_range, paginate
+from src.utils.resilience import s3_breaker
 
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION")
 
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", 3))
+S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", 30))
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", 3))
+
+S3_COPY_CONCURRENCY = int(os.getenv("S3_COPY_CONCURRENCY", 16))
+
+S3_DELETE_BATCH_SIZE = 1000
+
+
+class S3CircuitOpenError(BotoCoreError):
+    fmt = "S3 indisponível: disjuntor aberto após falhas seguidas."
+
+
+def _check_s3_circuit(**kwargs):
+    if not s3_breaker.allow():
+        raise S3CircuitOpenError()
+
+
+def _record_s3_response(response_dict=None, exception=None, **kwargs):
+    # Emitido a cada tentativa; erros 4xx são respostas válidas do serviço
+    if exception is not None:
+        s3_breaker.record_failure(exception)
+    elif response_dict is not None and response_dict["status_code"] >= 500:
+        s3_breaker.record_failure(f"HTTP {response_dict['status_code']}")
+    else:
+        s3_breaker.record_success()
+
+
+def create_s3_client(
+    connect_timeout: float = S3_CONNECT_TIMEOUT,
+    read_timeout: float = S3_READ_TIMEOUT,
+    max_attempts: int = S3_MAX_ATTEMPTS,
+):
+    """
+    Cliente S3 com timeouts de conexão e leitura, novas tentativas limitadas com
+    espera exponencial e jitter (modo "standard" do botocore) e o disjuntor do
+    S3: com ele aberto, as chamadas falham na hora com S3CircuitOpenError.
+    """
+    client = boto3.client(
+        "s3",
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_DEFAULT_REGION,
+        config=Config(
+            signature_version="s3v4",
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retries={"max_attempts": max_attempts, "mode": "standard"},
+        ),
+    )
+    client.meta.events.register("before-call.s3", _check_s3_circuit)
+    client.meta.events.register("response-received.s3", _record_s3_response)
+    return client
+
+
+def segment_filename(base_filename: str, segment_number: int, versao: int = 1) -> str:
+    """Nome do segmento no S3. A primeira versão mantém o padrão original."""
+    if versao == 1:
+        return f"{base_filename}_segment_{segment_number}.wav"
+    return f"{base_filename}_v{versao}_segment_{segment_number}.wav"
+
+
+def segment_manifest_entry(numero: int, nome_arquivo: str, segment_info: dict) -> dict:
+    """Campos do registro de Segmento a partir do resultado de segment_data."""
+    return {
+        "numero": numero,
+        "nome_arquivo": nome_arquivo,
+        "inicio": segment_info["start_time"],
+        "fim": segment_info["end_time"],
+        "duracao": segment_info["duration"],
+        "pico_db": segment_info["peak_db"],
+        "rms_db": segment_info["rms_db"],
+        "snr_db": segment_info["snr_db"],
+        "taxa_clipping": segment_info["clipping_ratio"],
+    }
+
 
 class AudioService:
     def __init__(self):
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_DEFAULT_REGION,
-            config=Config(signature_version="s3v4"),
-        )
+        self.s3_client = create_s3_client()
 
     def _generate_filename(
         self,
@@ -47,7 +131,7 @@ class AudioService:
             timestamp = timestamp_str
 
         if is_segment and base_filename:
-            return f"{base_filename}_segment_{segment_number}.wav"
+            return segment_filename(base_filename, segment_number)
 
         return (
             f"{vocalizacao_nome.lower()}_{audio_id}_{participante_id}_{timestamp}.wav"
@@ -90,6 +174,27 @@ class AudioService:
             )
         return vocalizacao
 
+    def _resolve_vad(
+        self, vocalizacao: Vocalizacao, vad_engine: str = None, vad_params: dict = None
+    ) -> VADEngine:
+        """
+        Define o motor de VAD do upload: o informado na requisição tem prioridade,
+        seguido pelo configurado na vocalização e, por fim, o padrão do ambiente.
+        """
+        engine = vad_engine or vocalizacao.vad_engine
+        params = {}
+        if vocalizacao.vad_engine and engine == vocalizacao.vad_engine:
+            params.update(vocalizacao.vad_params or {})
+        params.update(vad_params or {})
+
+        try:
+            return get_engine(engine, params)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+
     async def upload_audio(
         self,
         id_vocalizacao: int,
@@ -98,6 +203,8 @@ class AudioService:
         db: AsyncSession,
         original_filename: str,
         id_participante: int = None,
+        vad_engine: str = None,
+        vad_params: dict = None,
     ) -> Audio:
         if id_participante:
             result = await db.execute(
@@ -124,27 +231,24 @@ class AudioService:
                 )
 
         vocalizacao = await self._get_vocalizacao(id_vocalizacao, db)
+        vad = self._resolve_vad(vocalizacao, vad_engine, vad_params)
 
-        # Criando o registro do áudio no banco para obter o ID
-        audio_data = Audio(
-            nome_arquivo="temp",
-            id_vocalizacao=id_vocalizacao,
-            id_usuario=current_user.id,
-            id_participante=participante.id,
+        # Reservando o ID na sequência, sem gravar a linha antes dos uploads
+        audio_id = await db.scalar(
+            select(func.nextval(func.pg_get_serial_sequence("audio", "id")))
         )
-        db.add(audio_data)
-        await db.commit()
-        await db.refresh(audio_data)
 
         # Gerando o nome do arquivo com o ID do áudio
         novo_nome_arquivo = self._generate_filename(
             vocalizacao_nome=vocalizacao.nome,
-            audio_id=audio_data.id,
+            audio_id=audio_id,
             participante_id=participante.id,
             original_filename=original_filename,
         )
 
-        try:
+        uploaded = []
+
+        def store_objects() -> list[Segmento]:
             # Upload do áudio original
             self.s3_client.put_object(
                 Bucket=S3_BUCKET_NAME,
@@ -152,75 +256,185 @@ class AudioService:
                 Body=file_data,
                 ContentType="audio/wav",
             )
+            uploaded.append(novo_nome_arquivo)
 
             # Processar o áudio para obter os segmentos
-            with NamedTemporaryFile(delete=False, suffix=".wav") as temp_wav_file:
-                temp_wav_file.write(file_data)
-                temp_wav_path = temp_wav_file.name
-
-            segments = segment_data(temp_wav_path)
+            segments = segment_data(io.BytesIO(file_data), engine=vad)
 
             # Upload dos segmentos
             base_filename = novo_nome_arquivo[:-4]  # Remover a extensão .wav
-            segment_filenames = []
+            segmentos = []
 
             for idx, segment_info in enumerate(segments):
-                segment_filename = self._generate_filename(
+                segment_key = self._generate_filename(
                     vocalizacao_nome=vocalizacao.nome,
-                    audio_id=audio_data.id,
+                    audio_id=audio_id,
                     participante_id=participante.id,
                     is_segment=True,
                     segment_number=idx + 1,
                     base_filename=base_filename,
                 )
-                segment_filenames.append(segment_filename)
                 segment_data_bytes = (
                     segment_info["segment_data"].export(format="wav").read()
                 )
                 self.s3_client.put_object(
                     Bucket=S3_BUCKET_NAME,
-                    Key=segment_filename,
+                    Key=segment_key,
                     Body=segment_data_bytes,
                     ContentType="audio/wav",
                 )
+                uploaded.append(segment_key)
+                segmentos.append(
+                    Segmento(
+                        id_audio=audio_id,
+                        versao=1,
+                        **segment_manifest_entry(idx + 1, segment_key, segment_info),
+                    )
+                )
+            return segmentos
 
-            audio_data.segments = segment_filenames
-
+        try:
+            # Segmentação e uploads rodam em uma thread, fora do event loop
+            segmentos = await run_in_threadpool(store_objects)
+        except S3CircuitOpenError as e:
+            await self._discard_uploads(db, uploaded)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(int(s3_breaker.reset_timeout))},
+            )
         except (NoCredentialsError, ClientError) as e:
-            await db.delete(audio_data)
-            await db.commit()
+            await self._discard_uploads(db, uploaded)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao salvar o arquivo no S3: {str(e)}",
             )
-        finally:
-            os.remove(temp_wav_path)
+        except Exception:
+            await self._discard_uploads(db, uploaded)
+            raise
 
-        # Atualizando o nome do arquivo no registro
-        audio_data.nome_arquivo = novo_nome_arquivo
-        await db.commit()
+        # O áudio e o manifesto dos segmentos são gravados em uma única transação
+        audio_data = Audio(
+            id=audio_id,
+            nome_arquivo=novo_nome_arquivo,
+            id_vocalizacao=id_vocalizacao,
+            id_usuario=current_user.id,
+            id_participante=participante.id,
+            qtd_segmentos=len(segmentos),
+        )
+        try:
+            for key, value in parse_wav_header(
+                file_data[:WAV_HEADER_BYTES], len(file_data)
+            ).items():
+                setattr(audio_data, key, value)
+        except ValueError as e:
+            print(f"Erro ao extrair metadados do áudio {audio_id}: {str(e)}")
+        db.add(audio_data)
+        db.add_all(segmentos)
+        try:
+            await db.commit()
+        except Exception:
+            await self._discard_uploads(db, uploaded)
+            raise
+        await invalidate_stats()
         await db.refresh(audio_data)
 
         return audio_data
 
-    async def list_audios(self, db: AsyncSession) -> list[Audio]:
-        result = await db.execute(select(Audio))
-        return result.scalars().all()
+    async def _discard_uploads(self, db: AsyncSession, keys: list[str]) -> None:
+        """
+        Desfaz a transação do upload e registra no outbox a remoção dos objetos
+        já enviados ao S3, que ficariam órfãos sem a linha em audio.
+        """
+        await db.rollback()
+        if not keys:
+            return
+        try:
+            await db.execute(
+                insert(StorageOutbox),
+                [{"operacao": OUTBOX_DELETE, "chave": key} for key in keys],
+            )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"Erro ao registrar remoção de objetos órfãos {keys}: {str(e)}")
+
+    def _audio_filters(
+        self,
+        id_vocalizacao: int = None,
+        id_participante: int = None,
+        id_usuario: int = None,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+    ) -> list:
+        conditions = date_range(Audio.created_at, data_inicio, data_fim)
+        if id_vocalizacao is not None:
+            conditions.append(Audio.id_vocalizacao == id_vocalizacao)
+        if id_participante is not None:
+            conditions.append(Audio.id_participante == id_participante)
+        if id_usuario is not None:
+            conditions.append(Audio.id_usuario == id_usuario)
+        return conditions
+
+    async def list_audios(
+        self,
+        db: AsyncSession,
+        page: PageParams,
+        id_vocalizacao: int = None,
+        id_participante: int = None,
+        id_usuario: int = None,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+    ) -> dict:
+        """Lista os áudios paginados por keyset, do mais recente ao mais antigo"""
+        query = select(Audio).where(
+            *self._audio_filters(
+                id_vocalizacao, id_participante, id_usuario, data_inicio, data_fim
+            )
+        )
+        return await paginate(db, query, Audio, page)
+
+    def export_audios_query(
+        self,
+        id_vocalizacao: int = None,
+        id_participante: int = None,
+        id_usuario: int = None,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+    ) -> Select:
+        """Consulta da exportação completa (NDJSON) dos áudios filtrados, em ordem de id"""
+        return (
+            select(Audio.__table__)
+            .where(
+                *self._audio_filters(
+                    id_vocalizacao, id_participante, id_usuario, data_inicio, data_fim
+                )
+            )
+            .order_by(Audio.id)
+        )
 
     async def list_audios_by_participante(
-        self, id_participante: int, db: AsyncSession
-    ) -> list[Audio]:
-        result = await db.execute(
-            select(Audio).where(Audio.id_participante == id_participante)
+        self,
+        id_participante: int,
+        db: AsyncSession,
+        page: PageParams,
+        id_vocalizacao: int = None,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+    ) -> dict:
+        return await self.list_audios(
+            db,
+            page,
+            id_vocalizacao=id_vocalizacao,
+            id_participante=id_participante,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
         )
-        return result.scalars().all()
 
     async def delete_all_audios_by_participante(
         self, participante_id: int, db: AsyncSession
     ) -> None:
-        audios = await self.list_audios_by_participante(participante_id, db)
-        for audio in audios:
-            await self.delete_audio(audio.id, db)
+        await self.delete_audios_where(db, Audio.id_participante == participante_id)
 
     def generate_presigned_url(
         self, bucket_name: str, object_name: str, expiration: int = 3600
@@ -243,12 +457,131 @@ class AudioService:
             )
 
     async def list_audios_by_user(
-        self, id_usuario: int, db: AsyncSession
-    ) -> list[Audio]:
-        """Lista todos os áudios associados a um usuário específico"""
-        result = await db.execute(select(Audio).where(Audio.id_usuario == id_usuario))
+        self,
+        id_usuario: int,
+        db: AsyncSession,
+        page: PageParams,
+        id_vocalizacao: int = None,
+        id_participante: int = None,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+    ) -> dict:
+        """Lista os áudios associados a um usuário específico"""
+        return await self.list_audios(
+            db,
+            page,
+            id_vocalizacao=id_vocalizacao,
+            id_participante=id_participante,
+            id_usuario=id_usuario,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+        )
+
+    async def _get_segmentos(self, id_audio: int, db: AsyncSession) -> list[Segmento]:
+        result = await db.execute(
+            select(Segmento)
+            .where(Segmento.id_audio == id_audio)
+            .order_by(Segmento.numero)
+        )
         return result.scalars().all()
 
+    async def list_segmentos(
+        self,
+        db: AsyncSession,
+        page: PageParams,
+        id_audio: int = None,
+        id_vocalizacao: int = None,
+        id_participante: int = None,
+        min_snr: float = None,
+        max_clipping: float = None,
+        min_duration: float = None,
+    ) -> dict:
+        """
+        Lista segmentos filtrando pelas métricas de qualidade calculadas na
+        ingestão, paginados por keyset do mais recente ao mais antigo
+        """
+        query = select(Segmento)
+        if id_vocalizacao is not None or id_participante is not None:
+            query = query.join(Audio, Segmento.id_audio == Audio.id)
+        if id_audio is not None:
+            query = query.where(Segmento.id_audio == id_audio)
+        if id_vocalizacao is not None:
+            query = query.where(Audio.id_vocalizacao == id_vocalizacao)
+        if id_participante is not None:
+            query = query.where(Audio.id_participante == id_participante)
+        if min_snr is not None:
+            query = query.where(Segmento.snr_db >= min_snr)
+        if max_clipping is not None:
+            query = query.where(Segmento.taxa_clipping <= max_clipping)
+        if min_duration is not None:
+            query = query.where(Segmento.duracao >= min_duration)
+
+        return await paginate(db, query, Segmento, page)
+
+    def read_object_header(self, key: str, nbytes: int) -> tuple[bytes, int]:
+        """Lê apenas os primeiros bytes do objeto (GET com Range) e o tamanho total"""
+        response = self.s3_client.get_object(
+            Bucket=S3_BUCKET_NAME, Key=key, Range=f"bytes=0-{nbytes - 1}"
+        )
+        header = response["Body"].read()
+        content_range = response.get("ContentRange")
+        if content_range:
+            total_size = int(content_range.rsplit("/", 1)[-1])
+        else:
+            total_size = response["ContentLength"]
+        return header, total_size
+
+    def list_s3_keys(self, prefix: str) -> list[str]:
+        """Lista todas as chaves com o prefixo, percorrendo todas as páginas"""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        keys = []
+        for page in paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+        return keys
+
+    def copy_s3_object(self, source: str, target: str) -> None:
+        try:
+            self.s3_client.copy_object(
+                Bucket=S3_BUCKET_NAME,
+                CopySource={"Bucket": S3_BUCKET_NAME, "Key": source},
+                Key=target,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404", "NotFound"):
+                raise
+            # Origem já removida: a cópia foi feita em uma tentativa anterior
+            self.s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=target)
+
+    def copy_s3_objects(
+        self, pairs: list[tuple[str, str]], concurrency: int = S3_COPY_CONCURRENCY
+    ) -> list[str | None]:
+        """Copia os pares (origem, destino) em paralelo e retorna o erro de cada um (ou None)"""
+
+        def try_copy(pair):
+            try:
+                self.copy_s3_object(*pair)
+            except (BotoCoreError, ClientError) as e:
+                return str(e)
+            return None
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(try_copy, pairs))
+
+    def delete_s3_objects(self, keys: list[str]) -> int:
+        """Remove objetos em lotes de até 1000 chaves por requisição"""
+        removed = 0
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            batch = keys[start : start + S3_DELETE_BATCH_SIZE]
+            response = self.s3_client.delete_objects(
+                Bucket=S3_BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            errors = response.get("Errors", [])
+            for error in errors:
+                print(f"Erro ao deletar objeto {error['Key']}: {error['Message']}")
+            removed += len(batch) - len(errors)
+        return removed
+
     async def _get_one(self, id: int, db: AsyncSession) -> Audio:
         result = await db.execute(select(Audio).where(Audio.id == id))
         audio = result.scalars().first()
@@ -258,66 +591,177 @@ class AudioService:
             )
         return audio
 
-    async def get_amount_audios_participante(self, id: int, db: AsyncSession) -> int:
-        result = await db.execute(select(Audio).where(Audio.id_participante == id))
-        amount = result.scalars().all()
-        return len(amount)
-
     async def update(self, id: int, audio_data: dict, db: AsyncSession) -> Audio:
         audio_db = await self._get_one(id, db)
         for key, value in audio_data.items():
             setattr(audio_db, key, value)
 
         await db.commit()
+        await invalidate_stats()
         await db.refresh(audio_db)
         return audio_db
 
-    async def delete_audio(self, audio_id: int, db: AsyncSession) -> None:
-        result = await db.execute(select(Audio).where(Audio.id == audio_id))
-        audio = result.scalars().first()
-        if not audio:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Áudio não encontrado."
+    async def enqueue_object_deletion(self, db: AsyncSession, *conditions) -> None:
+        """
+        Registra em storage_outbox, com um único INSERT ... SELECT, a remoção dos
+        objetos dos áudios que satisfazem as condições: o original, os segmentos
+        do manifesto e, para áudios anteriores ao manifesto, o prefixo dos
+        segmentos. Deve rodar na mesma transação que remove os áudios; a remoção
+        no S3 fica a cargo do worker (src/services/storage_outbox_service.py).
+        """
+        audios = select(
+            Audio.id, Audio.nome_arquivo, Audio.versao_segmentacao
+        ).where(Audio.nome_arquivo != "temp", *conditions).cte("audios_removidos")
+        sem_manifesto = ~select(Segmento.id).where(Segmento.id_audio == audios.c.id).exists()
+
+        chaves = union_all(
+            select(literal(OUTBOX_DELETE), audios.c.nome_arquivo),
+            select(literal(OUTBOX_DELETE), Segmento.nome_arquivo).join(
+                audios, Segmento.id_audio == audios.c.id
+            ),
+            select(
+                literal(OUTBOX_DELETE_PREFIX),
+                func.concat(
+                    func.left(audios.c.nome_arquivo, func.length(audios.c.nome_arquivo) - 4),
+                    "_segment_",
+                ),
+            ).where(audios.c.versao_segmentacao == 1, sem_manifesto),
+        )
+        await db.execute(
+            insert(StorageOutbox).from_select(
+                ["operacao", "chave"], chaves, include_defaults=False
             )
+        )
 
-        try:
-            self.s3_client.delete_object(Bucket=S3_BUCKET_NAME, Key=audio.nome_arquivo)
-
-            base_filename = audio.nome_arquivo[:-4]
-
-            if hasattr(audio, "segments") and audio.segments:
-                for segment_name in audio.segments:
-                    try:
-                        self.s3_client.delete_object(
-                            Bucket=S3_BUCKET_NAME, Key=segment_name
-                        )
-                    except Exception as e:
-                        print(f"Erro ao deletar segmento {segment_name}: {str(e)}")
-            else:
-                try:
-                    response = self.s3_client.list_objects_v2(
-                        Bucket=S3_BUCKET_NAME, Prefix=f"{base_filename}_segment_"
+    async def relocate_objects(
+        self, db: AsyncSession, moves: list[tuple[str, str, str]]
+    ) -> None:
+        """
+        Copia os objetos para as novas chaves antes do commit do chamador e
+        registra no outbox, sem commit, só a remoção das chaves antigas: quando o
+        novo nome é gravado o objeto já existe nele, e nenhuma operação pendente
+        pode recriar uma chave depois de removida. `moves` traz (operação,
+        origem, destino); prefixos são expandidos nas chaves existentes.
+
+        Remoções pendentes das chaves de destino (por exemplo, ao voltar ao nome
+        anterior) são canceladas antes da cópia; se um worker já as reservou, o
+        DELETE espera ele terminar. Se alguma cópia falhar, a transação é
+        desfeita, as cópias feitas vão para a fila de remoção e a resposta é 503.
+        """
+
+        def expand() -> list[tuple[str, str]]:
+            pairs = []
+            for operacao, chave, destino in moves:
+                if operacao == OUTBOX_MOVE_PREFIX:
+                    pairs.extend(
+                        (key, destino + key[len(chave) :]) for key in self.list_s3_keys(chave)
                     )
+                else:
+                    pairs.append((chave, destino))
+            return [(source, target) for source, target in pairs if source != target]
+
+        try:
+            pairs = await run_in_threadpool(expand)
+        except (BotoCoreError, ClientError) as e:
+            await self._abort_relocation(db, [], str(e))
+        if not pairs:
+            return
+
+        targets = [target for _, target in pairs]
+        prefixes = [destino for operacao, _, destino in moves if operacao == OUTBOX_MOVE_PREFIX]
+        await db.execute(
+            delete(StorageOutbox).where(
+                or_(
+                    and_(
+                        StorageOutbox.operacao == OUTBOX_DELETE,
+                        StorageOutbox.chave == any_(literal(targets, ARRAY(String))),
+                    ),
+                    and_(
+                        StorageOutbox.operacao == OUTBOX_DELETE_PREFIX,
+                        StorageOutbox.chave == any_(literal(prefixes, ARRAY(String))),
+                    ),
+                )
+            )
+        )
 
-                    if "Contents" in response:
-                        for obj in response["Contents"]:
-                            self.s3_client.delete_object(
-                                Bucket=S3_BUCKET_NAME, Key=obj["Key"]
-                            )
-                except Exception as e:
-                    print(f"Erro ao buscar ou deletar segmentos: {str(e)}")
+        errors = await run_in_threadpool(self.copy_s3_objects, pairs)
+        failed = [error for error in errors if error]
+        if failed:
+            copied = [target for (_, target), error in zip(pairs, errors) if error is None]
+            await self._abort_relocation(db, copied, failed[0])
 
-        except (NoCredentialsError, ClientError) as e:
+        await db.execute(
+            insert(StorageOutbox),
+            [{"operacao": OUTBOX_DELETE, "chave": source} for source, _ in pairs],
+        )
+
+    async def _abort_relocation(self, db: AsyncSession, copied: list[str], error: str):
+        await db.rollback()
+        print(f"Erro ao copiar objetos no S3: {error}")
+        if copied:
+            await db.execute(
+                insert(StorageOutbox),
+                [{"operacao": OUTBOX_DELETE, "chave": key} for key in copied],
+            )
+            await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Não foi possível mover os arquivos no armazenamento. Tente novamente.",
+            headers={"Retry-After": str(int(s3_breaker.reset_timeout))},
+        )
+
+    async def move_audio_objects(
+        self, audio: Audio, novo_nome_arquivo: str, db: AsyncSession
+    ) -> None:
+        """
+        Copia o original e os segmentos para o novo nome e renomeia o manifesto,
+        sem commit: o chamador grava o novo nome do áudio na mesma transação.
+        Áudios anteriores ao manifesto copiam o prefixo dos segmentos.
+        """
+        base_old_filename = audio.nome_arquivo[:-4]
+        base_new_filename = novo_nome_arquivo[:-4]
+        moves = [(OUTBOX_MOVE, audio.nome_arquivo, novo_nome_arquivo)]
+
+        segmentos = await self._get_segmentos(audio.id, db)
+        novos_nomes = {}
+        for segmento in segmentos:
+            novo_segment_name = segmento.nome_arquivo.replace(
+                base_old_filename, base_new_filename, 1
+            )
+            moves.append((OUTBOX_MOVE, segmento.nome_arquivo, novo_segment_name))
+            novos_nomes[segmento] = novo_segment_name
+        if not segmentos:
+            moves.append(
+                (
+                    OUTBOX_MOVE_PREFIX,
+                    f"{base_old_filename}_segment_",
+                    f"{base_new_filename}_segment_",
+                )
+            )
+
+        await self.relocate_objects(db, moves)
+        for segmento, novo_segment_name in novos_nomes.items():
+            segmento.nome_arquivo = novo_segment_name
+
+    async def delete_audio(self, audio_id: int, db: AsyncSession) -> None:
+        audio = await db.scalar(select(Audio.id).where(Audio.id == audio_id))
+        if not audio:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Erro ao deletar o arquivo no S3: {str(e)}",
+                status_code=status.HTTP_404_NOT_FOUND, detail="Áudio não encontrado."
             )
+        await self.delete_audios_where(db, Audio.id == audio_id)
 
-        await db.execute(delete(Audio).where(Audio.id == audio_id))
+    async def delete_audios_where(self, db: AsyncSession, *conditions) -> int:
+        """
+        Remove os áudios filtrados em uma transação; os objetos vão para a fila
+        de remoção. Retorna quantos áudios foram removidos.
+        """
+        await self.enqueue_object_deletion(db, *conditions)
+        result = await db.execute(delete(Audio).where(*conditions))
         await db.commit()
+        await invalidate_stats()
+        return result.rowcount
 
     async def delete_all_audios_by_user(self, user_id: int, db: AsyncSession) -> None:
         """Remove todos os áudios associados a um usuário específico"""
-        audios = await self.list_audios_by_user(user_id, db)
-        for audio in audios:
-            await self.delete_audio(audio.id, db)
+        await self.delete_audios_where(db, Audio.id_usuario == user_id)
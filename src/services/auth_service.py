@@ -1,10 +1,8 @@
-import os
 import random
 from datetime import UTC, datetime
 
-import redis
 from fastapi import HTTPException, status
-from jose import ExpiredSignatureError
+from jose import ExpiredSignatureError, JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,14 +14,14 @@ from src.security import (
     decode_access_token,
     decode_refresh_token,
     get_password_hash,
-    verify_password,
+    verify_and_update_password,
 )
+from src.redis_client import get_redis
+from src.utils.claims_cache import claims_cache
+from src.utils.principal_cache import invalidate_principal
+from src.utils.token_revocation import is_revoked, revoke_jti
 from src.utils.email_utils import send_confirmation_email, send_password_reset_email
 
-redis_client = redis.StrictRedis(
-    host=os.getenv("REDIS_HOST"), port=os.getenv("REDIS_PORT"), db=0
-)
-
 
 class AuthService:
     async def get_by_email(self, email: str, db: AsyncSession) -> Usuario:
@@ -38,7 +36,7 @@ class AuthService:
                 detail="Email já cadastrado.",
             )
 
-        hashed_password = get_password_hash(usuario.senha)
+        hashed_password = await get_password_hash(usuario.senha)
         db_usuario = Usuario(
             nome=usuario.nome,
             email=usuario.email,
@@ -52,7 +50,7 @@ class AuthService:
         await db.refresh(db_usuario)
 
         confirmation_code = random.randint(100000, 999999)
-        redis_client.set(
+        await get_redis().set(
             name=f"confirmation_code:{usuario.email}", ex=900, value=confirmation_code
         )
         await send_confirmation_email(usuario.email, confirmation_code)
@@ -69,7 +67,7 @@ class AuthService:
                 detail="Usuário não encontrado.",
             )
 
-        if not self.verify_confirmation_code(email, code):
+        if not await self.verify_confirmation_code(email, code):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Código de confirmação inválido.",
@@ -77,6 +75,7 @@ class AuthService:
 
         usuario.verificado = True
         await db.commit()
+        await invalidate_principal(usuario.id)
         return usuario
 
     async def authenticate(self, login: AuthLogin, db: AsyncSession) -> dict:
@@ -93,13 +92,19 @@ class AuthService:
                 detail="Usuário não verificado. Verifique seu e-mail para ativar sua conta.",
             )
 
-        if not verify_password(login.senha, usuario.senha):
+        valida, novo_hash = await verify_and_update_password(login.senha, usuario.senha)
+        if not valida:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email e/ou senha inválidos.",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        if novo_hash:
+            # Parâmetros do Argon2 mudaram: regrava o hash com os atuais
+            usuario.senha = novo_hash
+            await db.commit()
+
         return await self.generate_tokens(usuario)
 
     async def refresh_token(self, refresh_request: RefreshTokenRequest, db: AsyncSession) -> dict:
@@ -115,7 +120,7 @@ class AuthService:
                 )
 
             # Verificar se o refresh token está armazenado no Redis
-            stored_refresh_token = redis_client.get(f"refresh_token:{usuario_id}")
+            stored_refresh_token = await get_redis().get(f"refresh_token:{usuario_id}")
             if not stored_refresh_token or stored_refresh_token.decode("utf-8") != refresh_request.refresh_token:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -167,14 +172,26 @@ class AuthService:
                 detail="Usuário já verificado.",
             )
 
-        confirmation_code = random.randint(100000, 999999)
-        redis_client.set(
-            name=f"confirmation_code:{email}", ex=900, value=confirmation_code
-        )
+        confirmation_code = await self._current_code(f"confirmation_code:{email}")
         await send_confirmation_email(email, confirmation_code)
 
-    def verify_confirmation_code(self, email: str, code: int) -> bool:
-        stored_code = redis_client.get(f"confirmation_code:{email}")
+    async def _current_code(self, key: str) -> str:
+        """
+        Reaproveita o código ainda válido, renovando o prazo, ou gera um novo.
+        Pedidos repetidos geram o mesmo email, descartado pela deduplicação da
+        fila, e um email atrasado nunca carrega um código já substituído.
+        """
+        redis = get_redis()
+        stored_code = await redis.get(key)
+        if stored_code is not None:
+            await redis.expire(key, 900)
+            return stored_code.decode("utf-8")
+        code = str(random.randint(100000, 999999))
+        await redis.set(name=key, ex=900, value=code)
+        return code
+
+    async def verify_confirmation_code(self, email: str, code: int) -> bool:
+        stored_code = await get_redis().get(f"confirmation_code:{email}")
         if stored_code is None:
             return False
         return stored_code.decode("utf-8") == code
@@ -187,14 +204,13 @@ class AuthService:
                 detail="Usuário não encontrado.",
             )
 
-        reset_code = random.randint(100000, 999999)
-        redis_client.set(name=f"reset_code:{email}", ex=900, value=reset_code)
+        reset_code = await self._current_code(f"reset_code:{email}")
         await send_password_reset_email(email, reset_code)
 
     async def confirm_password_reset(
         self, email: str, code: int, nova_senha: str, db: AsyncSession
     ):
-        if not self.verify_reset_code(email, code):
+        if not await self.verify_reset_code(email, code):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Código de redefinição inválido.",
@@ -207,11 +223,11 @@ class AuthService:
                 detail="Usuário não encontrado.",
             )
 
-        usuario.senha = get_password_hash(nova_senha)
+        usuario.senha = await get_password_hash(nova_senha)
         await db.commit()
 
-    def verify_reset_code(self, email: str, code: int) -> bool:
-        stored_code = redis_client.get(f"reset_code:{email}")
+    async def verify_reset_code(self, email: str, code: int) -> bool:
+        stored_code = await get_redis().get(f"reset_code:{email}")
         if stored_code is None:
             return False
         return stored_code.decode("utf-8") == code
@@ -229,7 +245,7 @@ class AuthService:
 
         # Armazenar o refresh token no Redis com expiração de 7 dias
         refresh_token_expiry = 7 * 24 * 60 * 60  # 7 dias em segundos
-        redis_client.set(
+        await get_redis().set(
             f"refresh_token:{usuario.id}",
             refresh_token,
             ex=refresh_token_expiry
@@ -241,21 +257,32 @@ class AuthService:
         }
 
     async def blacklist_token(self, token: str) -> None:
-        """Adiciona um token à blacklist no Redis."""
-        try:
-            # Decodificar o token para obter o tempo de expiração
-            payload = decode_refresh_token(token, verify_exp=False)
-            exp = payload.get("exp")
-            
-            if exp:
-                now = datetime.now(UTC).timestamp()
-                ttl = int(exp - now)
-                
-                if ttl > 0:
-                    redis_client.set(f"blacklist:{token}", "1", ex=ttl)
-        except:
+        """
+        Revoga um access ou refresh token até a sua expiração. Tokens com jti
+        entram na blacklist pelo jti; os emitidos antes dele, pelo token completo.
+        """
+        payload = None
+        for decode in (decode_access_token, decode_refresh_token):
+            try:
+                payload = decode(token, verify_exp=False)
+                break
+            except HTTPException:
+                continue
+
+        claims_cache.invalidate(token)
+        if payload is None:
             # Se não conseguir decodificar, adiciona com TTL padrão
-            redis_client.set(f"blacklist:{token}", "1", ex=86400)  # 24 horas
+            await get_redis().set(f"blacklist:{token}", "1", ex=86400)  # 24 horas
+            return
+
+        exp = payload.get("exp")
+        ttl = int(exp - datetime.now(UTC).timestamp()) if exp else 86400
+        if ttl <= 0:
+            return
+        if payload.get("jti"):
+            await revoke_jti(payload["jti"], ttl)
+        else:
+            await get_redis().set(f"blacklist:{token}", "1", ex=ttl)
 
     async def logout(self, usuario_id: int, access_token: str = None, refresh_token: str = None) -> dict:
         """Realiza logout invalidando os tokens."""
@@ -269,7 +296,7 @@ class AuthService:
                 await self.blacklist_token(refresh_token)
             
             # Remover refresh token do Redis
-            redis_client.delete(f"refresh_token:{usuario_id}")
+            await get_redis().delete(f"refresh_token:{usuario_id}")
             
             return {"message": "Logout realizado com sucesso."}
             
@@ -279,6 +306,10 @@ class AuthService:
                 detail="Ocorreu um erro durante o logout. Sua sessão foi encerrada com segurança.",
             )
 
-    def is_token_blacklisted(self, token: str) -> bool:
+    async def is_token_blacklisted(self, token: str) -> bool:
         """Verifica se um token está na blacklist."""
-        return redis_client.exists(f"blacklist:{token}") > 0
+        try:
+            payload = jwt.get_unverified_claims(token)
+        except JWTError:
+            payload = {}
+        return await is_revoked(payload.get("jti"), token)
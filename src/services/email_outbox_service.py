@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from redis.exceptions import RedisError
+
+from src.redis_client import get_redis
+from src.utils.email_transport import EMAIL_SEND_CONCURRENCY, EmailSendError, create_transport
+from src.utils.resilience import CLOSED, email_breaker
+
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 8))
+EMAIL_RETRY_SECONDS = float(os.getenv("EMAIL_RETRY_SECONDS", 5))
+EMAIL_VISIBILITY_SECONDS = float(os.getenv("EMAIL_VISIBILITY_SECONDS", 60))
+EMAIL_DEDUPE_SECONDS = int(os.getenv("EMAIL_DEDUPE_SECONDS", 60))
+EMAIL_POLL_SECONDS = float(os.getenv("EMAIL_POLL_SECONDS", 1))
+EMAIL_DISPATCHER_ENABLED = os.getenv("EMAIL_DISPATCHER_ENABLED", "true").lower() == "true"
+MAX_RETRY_SECONDS = 3600
+DEAD_LETTER_LIMIT = 1000
+
+QUEUE_KEY = "email:fila"
+MESSAGES_KEY = "email:mensagens"
+DEAD_LETTER_KEY = "email:falhas"
+DEDUPE_PREFIX = "email:dedupe:"
+
+# Reserva atômica de um lote: as mensagens disponíveis (score <= agora) ficam
+# invisíveis por EMAIL_VISIBILITY_SECONDS em vez de sair da fila, então as de um
+# dispatcher que caiu no meio do envio voltam a ser entregues.
+CLAIM_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+local messages = {}
+for _, id in ipairs(ids) do
+    local body = redis.call('HGET', KEYS[2], id)
+    if body then
+        redis.call('ZADD', KEYS[1], ARGV[3], id)
+        table.insert(messages, body)
+    else
+        redis.call('ZREM', KEYS[1], id)
+    end
+end
+return messages
+"""
+
+_transport = None
+_send_executor = ThreadPoolExecutor(
+    max_workers=EMAIL_SEND_CONCURRENCY, thread_name_prefix="email"
+)
+# Acorda o dispatcher deste processo assim que um email é enfileirado
+_wakeup = asyncio.Event()
+
+
+def get_transport():
+    global _transport
+    if _transport is None:
+        _transport = create_transport()
+    return _transport
+
+
+async def _send(message: dict) -> None:
+    """Envia pelo transporte configurado, registrando o resultado no disjuntor do email."""
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(
+            _send_executor,
+            get_transport().send,
+            message["para"],
+            message["assunto"],
+            message["html"],
+        )
+    except EmailSendError as e:
+        # Erro permanente é problema da mensagem, não do serviço
+        if e.permanent:
+            email_breaker.record_success()
+        else:
+            email_breaker.record_failure(e)
+        raise
+    except Exception as e:
+        email_breaker.record_failure(e)
+        raise
+    email_breaker.record_success()
+
+
+async def enqueue_email(to_email: str, subject: str, html_content: str) -> bool:
+    """
+    Enfileira o email e retorna sem esperar o envio. Um email idêntico (mesmo
+    destinatário, assunto e conteúdo) enfileirado há menos de
+    EMAIL_DEDUPE_SECONDS é descartado, e a função retorna False. Sem Redis, o
+    email é enviado na própria requisição.
+    """
+    message = {
+        "id": uuid.uuid4().hex,
+        "para": to_email,
+        "assunto": subject,
+        "html": html_content,
+        "tentativas": 0,
+    }
+    digest = hashlib.sha256(f"{to_email}\n{subject}\n{html_content}".encode()).hexdigest()
+    redis = get_redis()
+    try:
+        if not await redis.set(f"{DEDUPE_PREFIX}{digest}", 1, nx=True, ex=EMAIL_DEDUPE_SECONDS):
+            return False
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(MESSAGES_KEY, message["id"], json.dumps(message))
+            pipe.zadd(QUEUE_KEY, {message["id"]: time.time()})
+            await pipe.execute()
+    except RedisError as e:
+        print(f"Erro ao enfileirar email, enviando diretamente: {str(e)}")
+        if not email_breaker.allow():
+            raise EmailSendError("Envio de emails indisponível no momento.")
+        await _send(message)
+        return True
+    _wakeup.set()
+    return True
+
+
+class EmailDispatcher:
+    """
+    Envia os emails da fila no Redis. Vários dispatchers (um por worker da API
+    e o job de linha de comando) podem rodar juntos: cada lote é reservado de
+    forma atômica. Falhas temporárias voltam à fila com espera exponencial e
+    jitter até EMAIL_MAX_ATTEMPTS; falhas permanentes e as que esgotam as
+    tentativas vão para a lista email:falhas.
+    """
+
+    def __init__(self):
+        self._claim = None
+
+    async def process_batch(self, batch_size: int = EMAIL_BATCH_SIZE) -> dict:
+        totals = {"enviados": 0, "reenfileirados": 0, "falhas": 0}
+        if email_breaker.state != CLOSED:
+            # Com o disjuntor aberto as mensagens ficam na fila sem gastar
+            # tentativas; quando ele libera o teste, só uma é enviada
+            if not email_breaker.allow():
+                return totals
+            batch_size = 1
+        redis = get_redis()
+        if self._claim is None:
+            self._claim = redis.register_script(CLAIM_SCRIPT)
+        now = time.time()
+        raw = await self._claim(
+            keys=[QUEUE_KEY, MESSAGES_KEY],
+            args=[now, batch_size, now + EMAIL_VISIBILITY_SECONDS],
+            client=redis,
+        )
+        messages = [json.loads(body) for body in raw]
+        results = await asyncio.gather(
+            *(_send(message) for message in messages), return_exceptions=True
+        )
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for message, result in zip(messages, results):
+                if not isinstance(result, Exception):
+                    totals["enviados"] += 1
+                    pipe.zrem(QUEUE_KEY, message["id"])
+                    pipe.hdel(MESSAGES_KEY, message["id"])
+                    continue
+
+                message["tentativas"] += 1
+                message["ultimo_erro"] = str(result)
+                permanent = isinstance(result, EmailSendError) and result.permanent
+                if permanent or message["tentativas"] >= EMAIL_MAX_ATTEMPTS:
+                    totals["falhas"] += 1
+                    print(f"Email para {message['para']} descartado: {str(result)}")
+                    pipe.zrem(QUEUE_KEY, message["id"])
+                    pipe.hdel(MESSAGES_KEY, message["id"])
+                    pipe.lpush(DEAD_LETTER_KEY, json.dumps(message))
+                    pipe.ltrim(DEAD_LETTER_KEY, 0, DEAD_LETTER_LIMIT - 1)
+                    continue
+
+                totals["reenfileirados"] += 1
+                delay = min(EMAIL_RETRY_SECONDS * 2 ** (message["tentativas"] - 1), MAX_RETRY_SECONDS)
+                delay *= random.uniform(0.5, 1.0)
+                pipe.hset(MESSAGES_KEY, message["id"], json.dumps(message))
+                pipe.zadd(QUEUE_KEY, {message["id"]: time.time() + delay})
+            await pipe.execute()
+        return totals
+
+    async def run(self, batch_size: int = EMAIL_BATCH_SIZE) -> dict:
+        """Processa lotes até não haver emails disponíveis."""
+        totals = {"enviados": 0, "reenfileirados": 0, "falhas": 0}
+        while True:
+            batch = await self.process_batch(batch_size)
+            for key, value in batch.items():
+                totals[key] += value
+            if sum(batch.values()) < batch_size or email_breaker.state != CLOSED:
+                return totals
+
+    async def pending(self) -> dict:
+        redis = get_redis()
+        return {
+            "na_fila": await redis.zcard(QUEUE_KEY),
+            "disponiveis": await redis.zcount(QUEUE_KEY, "-inf", time.time()),
+            "falhas": await redis.llen(DEAD_LETTER_KEY),
+        }
+
+    async def requeue_failed(self) -> int:
+        """Devolve à fila as mensagens de email:falhas, com as tentativas zeradas."""
+        redis = get_redis()
+        count = 0
+        while body := await redis.rpop(DEAD_LETTER_KEY):
+            message = json.loads(body)
+            message["tentativas"] = 0
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.hset(MESSAGES_KEY, message["id"], json.dumps(message))
+                pipe.zadd(QUEUE_KEY, {message["id"]: time.time()})
+                await pipe.execute()
+            count += 1
+        return count
+
+
+async def dispatch_emails() -> None:
+    """
+    Tarefa de fundo da aplicação: envia os emails enfileirados assim que
+    chegam neste processo, e verifica a fila a cada EMAIL_POLL_SECONDS para os
+    enfileirados por outros workers e as novas tentativas.
+    """
+    dispatcher = EmailDispatcher()
+    while True:
+        _wakeup.clear()
+        try:
+            await dispatcher.run()
+        except Exception as e:
+            # Qualquer falha de um ciclo é registrada; a tarefa só termina se cancelada
+            print(f"Erro no envio de emails da fila: {e.__class__.__name__}: {str(e)}")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=EMAIL_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+from datetime import UTC, datetime
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from src.database import ENV_TYPE, engine
+from src.redis_client import get_redis
+from src.security import password_hasher
+from src.services.audio_service import S3_BUCKET_NAME, create_s3_client
+from src.services.email_outbox_service import QUEUE_KEY
+from src.utils.admission import upload_admission
+from src.utils.pool_metrics import pool_status
+from src.utils.resilience import breakers_status
+
+HEALTH_CACHE_SECONDS = float(os.getenv("HEALTH_CACHE_SECONDS", 1.5))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", 2))
+# Dependências cuja falha tira o worker do balanceamento; as demais só são reportadas
+HEALTH_READY_DEPENDENCIES = [
+    name.strip()
+    for name in os.getenv("HEALTH_READY_DEPENDENCIES", "postgres,redis,s3").split(",")
+    if name.strip()
+]
+
+
+class HealthService:
+    """
+    Prontidão do worker para o orquestrador. Postgres, Redis e S3 são testados
+    em paralelo, cada um limitado a HEALTH_PROBE_TIMEOUT segundos, e o
+    resultado fica em cache por HEALTH_CACHE_SECONDS: probes frequentes de
+    várias réplicas do balanceador não viram uma consulta por probe. O estado
+    dos pools, filas e disjuntores é local ao processo e lido a cada chamada.
+
+    O teste do S3 roda em uma thread com cliente próprio, sem novas tentativas
+    e com timeout de leitura de HEALTH_PROBE_TIMEOUT, e nunca há dois ao mesmo
+    tempo: com o S3 travado, os probes seguintes aguardam o mesmo teste em vez
+    de ocupar mais threads do pool usado pelos uploads.
+    """
+
+    def __init__(self):
+        self._s3_client = None
+        self._s3_probe: asyncio.Future | None = None
+        self._lock = asyncio.Lock()
+        self._checks: dict[str, dict] = {}
+        self._email_queue: int | None = None
+        self.checked_at = 0.0
+        self.checked_at_utc: datetime | None = None
+
+    async def _postgres(self) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _redis(self) -> None:
+        redis = get_redis()
+        await redis.ping()
+        self._email_queue = await redis.zcard(QUEUE_KEY)
+
+    async def _s3(self) -> None:
+        if self._s3_client is None:
+            self._s3_client = create_s3_client(
+                connect_timeout=HEALTH_PROBE_TIMEOUT,
+                read_timeout=HEALTH_PROBE_TIMEOUT,
+                max_attempts=1,
+            )
+        if self._s3_probe is None or self._s3_probe.done():
+            self._s3_probe = asyncio.ensure_future(
+                run_in_threadpool(self._s3_client.head_bucket, Bucket=S3_BUCKET_NAME)
+            )
+            # Um teste abandonado pelo timeout termina sozinho; o erro já foi reportado
+            self._s3_probe.add_done_callback(
+                lambda probe: probe.cancelled() or probe.exception()
+            )
+        # O timeout do probe cancela só a espera, não o teste em andamento
+        await asyncio.shield(self._s3_probe)
+
+    async def _probe(self, probe) -> dict:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=HEALTH_PROBE_TIMEOUT)
+            error = None
+        except asyncio.TimeoutError:
+            error = f"Sem resposta em {HEALTH_PROBE_TIMEOUT:g}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        return {
+            "ok": error is None,
+            "latencia_ms": (time.perf_counter() - start) * 1000,
+            "erro": error,
+        }
+
+    async def _refresh(self) -> None:
+        probes = {"postgres": self._postgres, "redis": self._redis, "s3": self._s3}
+        results = await asyncio.gather(*(self._probe(probe) for probe in probes.values()))
+        self._checks = dict(zip(probes, results))
+        if not self._checks["redis"]["ok"]:
+            self._email_queue = None
+        self.checked_at = time.monotonic()
+        self.checked_at_utc = datetime.now(UTC)
+
+    async def readiness(self) -> dict:
+        if time.monotonic() - self.checked_at >= HEALTH_CACHE_SECONDS:
+            async with self._lock:
+                if time.monotonic() - self.checked_at >= HEALTH_CACHE_SECONDS:
+                    await self._refresh()
+
+        ready = all(
+            check["ok"]
+            for name, check in self._checks.items()
+            if name in HEALTH_READY_DEPENDENCIES
+        )
+        pool = pool_status(engine.pool)
+        return {
+            "status": "pronto" if ready else "indisponivel",
+            "pronto": ready,
+            "ambiente": ENV_TYPE,
+            "verificado_em": self.checked_at_utc,
+            "dependencias": self._checks,
+            "pool_banco": {
+                **pool,
+                "saturado": pool["em_uso"] >= pool["tamanho"] + pool["max_overflow"],
+            },
+            "filas": {
+                "uploads": upload_admission.waiting,
+                "uploads_em_andamento": upload_admission.active,
+                "hash_senhas": password_hasher.status()["na_fila"],
+                "emails": self._email_queue,
+            },
+            "disjuntores": breakers_status(),
+        }
@@ -1,19 +1,47 @@
 import os
+from datetime import datetime
 from tempfile import NamedTemporaryFile
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Select, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import Audio, Participante
 from src.schemas.participante_schema import ParticipanteCreate, ParticipanteUpdate
 from src.services.audio_service import AudioService
+from src.services.stats_service import invalidate_stats
+from src.utils.pagination import PageParams, date_range, paginate
 
 
 class ParticipanteService:
-    async def get_all(self, db: AsyncSession) -> list[Participante]:
-        result = await db.execute(select(Participante))
-        return result.scalars().all()
+    def _filters(
+        self, id_usuario: int = None, data_inicio: datetime = None, data_fim: datetime = None
+    ) -> list:
+        conditions = date_range(Participante.created_at, data_inicio, data_fim)
+        if id_usuario is not None:
+            conditions.append(Participante.id_usuario == id_usuario)
+        return conditions
+
+    async def get_all(
+        self,
+        db: AsyncSession,
+        page: PageParams,
+        id_usuario: int = None,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+    ) -> dict:
+        query = select(Participante).where(*self._filters(id_usuario, data_inicio, data_fim))
+        return await paginate(db, query, Participante, page)
+
+    def export_query(
+        self, id_usuario: int = None, data_inicio: datetime = None, data_fim: datetime = None
+    ) -> Select:
+        """Consulta da exportação completa (NDJSON) dos participantes filtrados"""
+        return (
+            select(Participante.__table__)
+            .where(*self._filters(id_usuario, data_inicio, data_fim))
+            .order_by(Participante.id)
+        )
 
     async def get_one(self, id: int, db: AsyncSession) -> Participante:
         result = await db.execute(select(Participante).where(Participante.id == id))
@@ -75,15 +103,10 @@ class ParticipanteService:
         return participante_db
 
     async def delete(self, id: int, db: AsyncSession) -> None:
-        participante = await self.get_one(id, db)
-
-        result = await db.execute(select(Audio).where(Audio.id_participante == id))
-        audios = result.scalars().all()
-
-        if audios:
-            audio_service = AudioService()
-            for audio in audios:
-                await audio_service.delete_audio(audio.id, db)
+        """Remove o participante e seus áudios (cascata no banco) em uma transação"""
+        await self.get_one(id, db)
 
-        await db.delete(participante)
+        await AudioService().enqueue_object_deletion(db, Audio.id_participante == id)
+        await db.execute(delete(Participante).where(Participante.id == id))
         await db.commit()
+        await invalidate_stats()
@@ -0,0 +1,394 @@
+import asyncio
+import fcntl
+import io
+import json
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_session
+from src.models import Audio, Segmento, StorageOutbox, Vocalizacao
+from src.models.storage_outbox_model import OUTBOX_DELETE, OUTBOX_DELETE_PREFIX
+from src.preprocessing.preprocessing import segment_data
+from src.preprocessing.vad import get_engine
+from src.services.audio_service import (
+    S3_BUCKET_NAME,
+    AudioService,
+    create_s3_client,
+    segment_filename,
+    segment_manifest_entry,
+)
+from src.services.storage_outbox_service import drain_storage_outbox
+
+RESEGMENT_CHECKPOINT_DIR = os.getenv(
+    "RESEGMENT_CHECKPOINT_DIR", "/tmp/vocalizeai-resegment"
+)
+RESEGMENT_BATCH_SIZE = int(os.getenv("RESEGMENT_BATCH_SIZE", 50))
+RESEGMENT_WORKERS = int(os.getenv("RESEGMENT_WORKERS", os.cpu_count() or 2))
+MAX_ERRORS_KEPT = 50
+
+STATUS_PENDING = "pendente"
+STATUS_RUNNING = "executando"
+STATUS_DONE = "concluido"
+STATUS_FAILED = "falhou"
+
+_worker_s3_client = None
+
+
+def _get_worker_s3_client():
+    """Cliente S3 do processo do pool (clientes boto3 não podem ser compartilhados entre processos)."""
+    global _worker_s3_client
+    if _worker_s3_client is None:
+        _worker_s3_client = create_s3_client()
+    return _worker_s3_client
+
+
+def _resegment_audio(
+    nome_arquivo: str, versao: int, engine: Optional[str], params: Optional[dict]
+) -> list[dict]:
+    """
+    Executado no pool de processos: baixa o áudio original, segmenta e envia os
+    segmentos da nova versão. Não toca no banco; devolve o manifesto gerado.
+    """
+    client = _get_worker_s3_client()
+    body = client.get_object(Bucket=S3_BUCKET_NAME, Key=nome_arquivo)["Body"].read()
+    segments = segment_data(io.BytesIO(body), engine=engine, engine_params=params)
+
+    base_filename = nome_arquivo[:-4]
+    manifest = []
+    try:
+        for idx, segment_info in enumerate(segments, start=1):
+            key = segment_filename(base_filename, idx, versao)
+            client.put_object(
+                Bucket=S3_BUCKET_NAME,
+                Key=key,
+                Body=segment_info["segment_data"].export(format="wav").read(),
+                ContentType="audio/wav",
+            )
+            manifest.append(segment_manifest_entry(idx, key, segment_info))
+    except Exception:
+        _discard_objects(client, [item["nome_arquivo"] for item in manifest])
+        raise
+    return manifest
+
+
+def _discard_objects(client, keys: list[str]) -> None:
+    for key in keys:
+        try:
+            client.delete_object(Bucket=S3_BUCKET_NAME, Key=key)
+        except Exception as e:
+            print(f"Erro ao descartar objeto {key}: {str(e)}")
+
+
+def checkpoint_path_for(job_id: str) -> str:
+    return os.path.join(RESEGMENT_CHECKPOINT_DIR, f"{job_id}.json")
+
+
+def pending_checkpoints() -> list[str]:
+    """Checkpoints de RESEGMENT_CHECKPOINT_DIR aguardando execução, do mais antigo ao mais novo."""
+    if not os.path.isdir(RESEGMENT_CHECKPOINT_DIR):
+        return []
+    paths = []
+    for name in os.listdir(RESEGMENT_CHECKPOINT_DIR):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(RESEGMENT_CHECKPOINT_DIR, name)
+        try:
+            with open(path) as f:
+                if json.load(f)["status"] == STATUS_PENDING:
+                    paths.append(path)
+        except (OSError, ValueError, KeyError):
+            continue
+    return sorted(paths, key=os.path.getmtime)
+
+
+class JobLockedError(RuntimeError):
+    """O job já está sendo executado por outro processo."""
+
+
+class ResegmentationJob:
+    """
+    Reprocessa a segmentação de um conjunto filtrado de áudios.
+
+    Os áudios são percorridos em ordem de id, em lotes distribuídos em um pool de
+    processos. Cada áudio ganha uma nova versão de segmentos: os objetos novos são
+    enviados antes da troca do manifesto, que ocorre em uma única transação
+    condicionada à versão lida e registra a remoção dos objetos antigos no
+    outbox de armazenamento, aplicada pelo worker após cada lote.
+    O progresso é gravado em um checkpoint após cada lote, permitindo retomar.
+
+    O job roda apenas pela linha de comando (src/jobs/resegment.py); a API só
+    cria jobs pendentes e consulta o checkpoint. Enquanto executa, o processo
+    mantém um flock exclusivo no arquivo `.lock` ao lado do checkpoint, então
+    dois executores nunca processam o mesmo job.
+    """
+
+    def __init__(self, state: dict, checkpoint_path: str):
+        self.state = state
+        self.checkpoint_path = checkpoint_path
+        self.audio_service = AudioService()
+
+    @classmethod
+    def create(
+        cls,
+        id_vocalizacao: int = None,
+        id_participante: int = None,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+        vad_engine: str = None,
+        vad_params: dict = None,
+        workers: int = None,
+        checkpoint_path: str = None,
+    ) -> "ResegmentationJob":
+        if vad_engine or vad_params:
+            # Levanta ValueError antes de iniciar o job
+            get_engine(vad_engine, vad_params)
+
+        job_id = uuid.uuid4().hex
+        now = datetime.now(UTC).isoformat()
+        state = {
+            "job_id": job_id,
+            "status": STATUS_PENDING,
+            "filtros": {
+                "id_vocalizacao": id_vocalizacao,
+                "id_participante": id_participante,
+                "data_inicio": data_inicio.isoformat() if data_inicio else None,
+                "data_fim": data_fim.isoformat() if data_fim else None,
+            },
+            "vad_engine": vad_engine,
+            "vad_params": vad_params,
+            "workers": workers or RESEGMENT_WORKERS,
+            "total": None,
+            "processados": 0,
+            "falhas": 0,
+            "segmentos_criados": 0,
+            "remocoes_registradas": 0,
+            "ultimo_id": 0,
+            "erros": [],
+            "erro": None,
+            "iniciado_em": now,
+            "atualizado_em": now,
+        }
+        job = cls(state, checkpoint_path or checkpoint_path_for(job_id))
+        job.save()
+        return job
+
+    @classmethod
+    def load(cls, checkpoint_path: str) -> "ResegmentationJob":
+        with open(checkpoint_path) as f:
+            state = json.load(f)
+        # Checkpoints anteriores ao outbox contavam os objetos removidos diretamente
+        state.setdefault("remocoes_registradas", state.pop("objetos_removidos", 0))
+        return cls(state, checkpoint_path)
+
+    @contextmanager
+    def lock(self):
+        """
+        Trava exclusiva do job, liberada pelo sistema se o processo morrer.
+        Levanta JobLockedError se outro processo já a detém.
+        """
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        fd = os.open(f"{self.checkpoint_path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise JobLockedError(f"Job {self.state['job_id']} em execução.")
+            yield
+        finally:
+            os.close(fd)
+
+    def reload(self) -> None:
+        self.state = self.load(self.checkpoint_path).state
+
+    def save(self) -> None:
+        """Grava o checkpoint de forma atômica (arquivo temporário + rename)."""
+        self.state["atualizado_em"] = datetime.now(UTC).isoformat()
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _filters(self) -> list:
+        filtros = self.state["filtros"]
+        conditions = []
+        if filtros["id_vocalizacao"]:
+            conditions.append(Audio.id_vocalizacao == filtros["id_vocalizacao"])
+        if filtros["id_participante"]:
+            conditions.append(Audio.id_participante == filtros["id_participante"])
+        if filtros["data_inicio"]:
+            conditions.append(
+                Audio.created_at >= datetime.fromisoformat(filtros["data_inicio"])
+            )
+        if filtros["data_fim"]:
+            conditions.append(
+                Audio.created_at < datetime.fromisoformat(filtros["data_fim"])
+            )
+        return conditions
+
+    def _engine_for(self, row) -> tuple[Optional[str], Optional[dict]]:
+        if self.state["vad_engine"] or self.state["vad_params"]:
+            return self.state["vad_engine"], self.state["vad_params"]
+        return row.vad_engine, row.vad_params
+
+    async def _next_batch(self, db: AsyncSession):
+        result = await db.execute(
+            select(
+                Audio.id,
+                Audio.nome_arquivo,
+                Audio.versao_segmentacao,
+                Vocalizacao.vad_engine,
+                Vocalizacao.vad_params,
+            )
+            .join(Vocalizacao, Audio.id_vocalizacao == Vocalizacao.id)
+            .where(Audio.id > self.state["ultimo_id"], *self._filters())
+            .order_by(Audio.id)
+            .limit(RESEGMENT_BATCH_SIZE)
+        )
+        return result.all()
+
+    async def _swap_manifest(self, db: AsyncSession, row, manifest: list[dict]) -> int:
+        """
+        Troca o manifesto do áudio pela nova versão e registra em storage_outbox,
+        na mesma transação, a remoção dos segmentos antigos. Retorna o número de
+        remoções registradas, ou levanta RuntimeError se o áudio mudou durante o
+        processamento.
+        """
+        nova_versao = row.versao_segmentacao + 1
+        result = await db.execute(
+            update(Audio)
+            .where(
+                Audio.id == row.id,
+                Audio.versao_segmentacao == row.versao_segmentacao,
+                Audio.nome_arquivo == row.nome_arquivo,
+            )
+            .values(versao_segmentacao=nova_versao, qtd_segmentos=len(manifest))
+        )
+        if result.rowcount != 1:
+            raise RuntimeError("áudio alterado ou removido durante o reprocessamento")
+
+        old_keys = (
+            await db.execute(
+                delete(Segmento)
+                .where(Segmento.id_audio == row.id)
+                .returning(Segmento.nome_arquivo)
+            )
+        ).scalars().all()
+        remocoes = [{"operacao": OUTBOX_DELETE, "chave": key} for key in old_keys]
+        if not old_keys and row.versao_segmentacao == 1:
+            # Áudios anteriores ao manifesto: segmentos apenas no S3. O prefixo
+            # da versão 1 não cobre os nomes das versões seguintes (_v2_segment_)
+            remocoes.append(
+                {
+                    "operacao": OUTBOX_DELETE_PREFIX,
+                    "chave": f"{row.nome_arquivo[:-4]}_segment_",
+                }
+            )
+        if remocoes:
+            await db.execute(insert(StorageOutbox), remocoes)
+        db.add_all(
+            Segmento(id_audio=row.id, versao=nova_versao, **item) for item in manifest
+        )
+        await db.commit()
+        return len(remocoes)
+
+    def _record_error(self, audio_id: int, error: BaseException) -> None:
+        self.state["falhas"] += 1
+        self.state["erros"].append({"id_audio": audio_id, "erro": str(error)})
+        del self.state["erros"][:-MAX_ERRORS_KEPT]
+
+    async def run(self, on_progress=None) -> dict:
+        """
+        Executa o job com a trava adquirida. O estado é relido do checkpoint já
+        com a trava, e jobs concluídos por outro executor não são reprocessados.
+        """
+        with self.lock():
+            if os.path.exists(self.checkpoint_path):
+                self.reload()
+            if self.state["status"] == STATUS_DONE:
+                return self.state
+            return await self._run(on_progress)
+
+    async def _run(self, on_progress=None) -> dict:
+        loop = asyncio.get_running_loop()
+        self.state["status"] = STATUS_RUNNING
+
+        try:
+            if self.state["total"] is None:
+                async with async_session() as db:
+                    self.state["total"] = await db.scalar(
+                        select(func.count(Audio.id)).where(*self._filters())
+                    )
+            self.save()
+
+            # spawn: os processos do pool não herdam o loop nem as conexões abertas
+            with ProcessPoolExecutor(
+                max_workers=self.state["workers"],
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                while True:
+                    async with async_session() as db:
+                        rows = await self._next_batch(db)
+                    if not rows:
+                        break
+
+                    results = await asyncio.gather(
+                        *(
+                            loop.run_in_executor(
+                                pool,
+                                _resegment_audio,
+                                row.nome_arquivo,
+                                row.versao_segmentacao + 1,
+                                *self._engine_for(row),
+                            )
+                            for row in rows
+                        ),
+                        return_exceptions=True,
+                    )
+
+                    remocoes = 0
+                    async with async_session() as db:
+                        for row, manifest in zip(rows, results):
+                            if isinstance(manifest, BaseException):
+                                self._record_error(row.id, manifest)
+                                continue
+                            try:
+                                remocoes += await self._swap_manifest(db, row, manifest)
+                            except Exception as e:
+                                await db.rollback()
+                                await asyncio.to_thread(
+                                    _discard_objects,
+                                    self.audio_service.s3_client,
+                                    [item["nome_arquivo"] for item in manifest],
+                                )
+                                self._record_error(row.id, e)
+                                continue
+                            self.state["segmentos_criados"] += len(manifest)
+
+                    if remocoes:
+                        self.state["remocoes_registradas"] += remocoes
+                        await drain_storage_outbox()
+
+                    self.state["processados"] += len(rows)
+                    self.state["ultimo_id"] = rows[-1].id
+                    self.save()
+                    if on_progress:
+                        on_progress(self.state)
+
+            self.state["status"] = STATUS_DONE
+        except BaseException as e:
+            self.state["status"] = STATUS_FAILED
+            self.state["erro"] = str(e) or e.__class__.__name__
+            raise
+        finally:
+            self.save()
+
+        return self.state
@@ -0,0 +1,265 @@
+import json
+import os
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+from sqlalchemy import Date, and_, cast, delete, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Audio, ContagemAudio, Vocalizacao
+from src.redis_client import get_redis
+from src.utils.pagination import date_range
+
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", 60))
+STATS_DAILY_DAYS = int(os.getenv("STATS_DAILY_DAYS", 30))
+
+_VERSION_KEY = "stats:versao"
+
+
+async def invalidate_stats() -> None:
+    """
+    Invalida todas as estatísticas em cache incrementando a versão que compõe
+    as chaves. As entradas antigas deixam de ser lidas e expiram pelo TTL.
+    """
+    try:
+        await get_redis().incr(_VERSION_KEY)
+    except RedisError as e:
+        print(f"Erro ao invalidar cache de estatísticas: {str(e)}")
+
+
+class StatsService:
+    """
+    Estatísticas dos áudios calculadas no banco, guardadas no Redis por
+    STATS_CACHE_TTL segundos. Sem Redis, as consultas são feitas direto.
+    Contagens por participante e vocalização vêm da tabela contagem_audio,
+    mantida por triggers; por usuário e por dia usam COUNT/GROUP BY em audio.
+    """
+
+    async def _cached(self, name: str, compute: Callable[[], Awaitable], *params):
+        redis = get_redis()
+        try:
+            versao = int(await redis.get(_VERSION_KEY) or 0)
+            key = ":".join(["stats", str(versao), name, *map(str, params)])
+            cached = await redis.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except RedisError as e:
+            print(f"Erro ao ler cache de estatísticas: {str(e)}")
+            return jsonable_encoder(await compute())
+
+        value = jsonable_encoder(await compute())
+        try:
+            await redis.set(key, json.dumps(value), ex=STATS_CACHE_TTL)
+        except RedisError as e:
+            print(f"Erro ao gravar cache de estatísticas: {str(e)}")
+        return value
+
+    async def count_participante(self, id_participante: int, db: AsyncSession) -> int:
+        """Soma as linhas do participante em contagem_audio (uma por vocalização)."""
+
+        async def compute():
+            return await db.scalar(
+                select(func.coalesce(func.sum(ContagemAudio.quantidade), 0)).where(
+                    ContagemAudio.id_participante == id_participante
+                )
+            )
+
+        return await self._cached("participante", compute, id_participante)
+
+    async def count(self, id_participante: int, id_vocalizacao: int, db: AsyncSession) -> dict:
+        """Quantidade e duração total de um par participante/vocalização (uma linha)."""
+        contagem = await db.get(ContagemAudio, (id_participante, id_vocalizacao))
+        return {
+            "id_participante": id_participante,
+            "id_vocalizacao": id_vocalizacao,
+            "quantidade": contagem.quantidade if contagem else 0,
+            "duracao_total": contagem.duracao_total if contagem else 0.0,
+        }
+
+    async def by_participante(self, db: AsyncSession) -> list[dict]:
+        async def compute():
+            result = await db.execute(
+                select(
+                    ContagemAudio.id_participante,
+                    func.sum(ContagemAudio.quantidade).label("quantidade"),
+                    func.sum(ContagemAudio.duracao_total).label("duracao_total"),
+                )
+                .group_by(ContagemAudio.id_participante)
+                .having(func.sum(ContagemAudio.quantidade) > 0)
+                .order_by(ContagemAudio.id_participante)
+            )
+            return [dict(row) for row in result.mappings()]
+
+        return await self._cached("por_participante", compute)
+
+    async def by_usuario(self, db: AsyncSession) -> list[dict]:
+        async def compute():
+            result = await db.execute(
+                select(
+                    Audio.id_usuario,
+                    func.count(Audio.id).label("quantidade"),
+                    func.coalesce(func.sum(Audio.duracao), 0).label("duracao_total"),
+                )
+                .group_by(Audio.id_usuario)
+                .order_by(Audio.id_usuario)
+            )
+            return [dict(row) for row in result.mappings()]
+
+        return await self._cached("por_usuario", compute)
+
+    async def by_vocalizacao(self, db: AsyncSession) -> list[dict]:
+        """Quantidade por vocalização, incluindo as que ainda não têm áudios."""
+
+        async def compute():
+            result = await db.execute(
+                select(
+                    Vocalizacao.id.label("id_vocalizacao"),
+                    Vocalizacao.nome,
+                    func.coalesce(func.sum(ContagemAudio.quantidade), 0).label("quantidade"),
+                    func.coalesce(func.sum(ContagemAudio.duracao_total), 0).label(
+                        "duracao_total"
+                    ),
+                )
+                .outerjoin(ContagemAudio, ContagemAudio.id_vocalizacao == Vocalizacao.id)
+                .group_by(Vocalizacao.id, Vocalizacao.nome)
+                .order_by(Vocalizacao.id)
+            )
+            return [dict(row) for row in result.mappings()]
+
+        return await self._cached("por_vocalizacao", compute)
+
+    async def by_day(
+        self, db: AsyncSession, data_inicio: datetime = None, data_fim: datetime = None
+    ) -> list[dict]:
+        async def compute():
+            dia = cast(func.date_trunc("day", Audio.created_at), Date).label("dia")
+            result = await db.execute(
+                select(
+                    dia,
+                    func.count(Audio.id).label("quantidade"),
+                    func.coalesce(func.sum(Audio.duracao), 0).label("duracao_total"),
+                )
+                .where(*date_range(Audio.created_at, data_inicio, data_fim))
+                .group_by(dia)
+                .order_by(dia)
+            )
+            return [dict(row) for row in result.mappings()]
+
+        return await self._cached(
+            "por_dia",
+            compute,
+            data_inicio.isoformat() if data_inicio else "",
+            data_fim.isoformat() if data_fim else "",
+        )
+
+    async def class_balance(self, db: AsyncSession) -> dict:
+        """
+        Distribuição dos áudios entre as vocalizações (classes). A razão de
+        desbalanceamento é a maior classe dividida pela menor classe não vazia.
+        """
+        classes = await self.by_vocalizacao(db)
+        total = sum(item["quantidade"] for item in classes)
+        nao_vazias = [item["quantidade"] for item in classes if item["quantidade"]]
+        return {
+            "total": total,
+            "classes": [
+                {
+                    "id_vocalizacao": item["id_vocalizacao"],
+                    "nome": item["nome"],
+                    "quantidade": item["quantidade"],
+                    "proporcao": item["quantidade"] / total if total else 0.0,
+                }
+                for item in classes
+            ],
+            "razao_desbalanceamento": (
+                max(nao_vazias) / min(nao_vazias) if nao_vazias else None
+            ),
+        }
+
+    async def dashboard(self, db: AsyncSession) -> dict:
+        """Todas as estatísticas em uma chamada; o diário cobre STATS_DAILY_DAYS dias."""
+        inicio = (datetime.now(UTC) - timedelta(days=STATS_DAILY_DAYS - 1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return {
+            "por_participante": await self.by_participante(db),
+            "por_usuario": await self.by_usuario(db),
+            "por_vocalizacao": await self.by_vocalizacao(db),
+            "por_dia": await self.by_day(db, data_inicio=inicio),
+            "balanceamento": await self.class_balance(db),
+        }
+
+    async def reconcile_counters(self, db: AsyncSession, apply: bool = True) -> list[dict]:
+        """
+        Recalcula contagem_audio a partir de audio e retorna as divergências
+        encontradas (esperado x armazenado). Com `apply`, reconstrói a tabela na
+        mesma transação, com escritas em audio bloqueadas durante a operação.
+        """
+        await db.execute(text("LOCK TABLE audio IN SHARE MODE"))
+
+        esperado = (
+            select(
+                Audio.id_participante,
+                Audio.id_vocalizacao,
+                func.count(Audio.id).label("quantidade"),
+                func.coalesce(func.sum(Audio.duracao), 0).label("duracao_total"),
+            )
+            .group_by(Audio.id_participante, Audio.id_vocalizacao)
+            .subquery()
+        )
+        quantidade_esperada = func.coalesce(esperado.c.quantidade, 0)
+        quantidade = func.coalesce(ContagemAudio.quantidade, 0)
+        duracao_esperada = func.coalesce(esperado.c.duracao_total, 0)
+        duracao = func.coalesce(ContagemAudio.duracao_total, 0)
+        result = await db.execute(
+            select(
+                func.coalesce(esperado.c.id_participante, ContagemAudio.id_participante).label(
+                    "id_participante"
+                ),
+                func.coalesce(esperado.c.id_vocalizacao, ContagemAudio.id_vocalizacao).label(
+                    "id_vocalizacao"
+                ),
+                quantidade_esperada.label("quantidade_esperada"),
+                quantidade.label("quantidade"),
+                duracao_esperada.label("duracao_esperada"),
+                duracao.label("duracao_total"),
+            )
+            .select_from(
+                esperado.outerjoin(
+                    ContagemAudio,
+                    and_(
+                        ContagemAudio.id_participante == esperado.c.id_participante,
+                        ContagemAudio.id_vocalizacao == esperado.c.id_vocalizacao,
+                    ),
+                    full=True,
+                )
+            )
+            .where(
+                or_(
+                    quantidade_esperada != quantidade,
+                    func.abs(duracao_esperada - duracao) > 0.001,
+                )
+            )
+        )
+        drift = [dict(row) for row in result.mappings()]
+
+        if apply:
+            await db.execute(delete(ContagemAudio))
+            await db.execute(
+                insert(ContagemAudio).from_select(
+                    ["id_participante", "id_vocalizacao", "quantidade", "duracao_total"],
+                    select(
+                        Audio.id_participante,
+                        Audio.id_vocalizacao,
+                        func.count(Audio.id),
+                        func.coalesce(func.sum(Audio.duracao), 0),
+                    ).group_by(Audio.id_participante, Audio.id_vocalizacao),
+                )
+            )
+            await db.commit()
+            await invalidate_stats()
+        else:
+            await db.rollback()
+        return drift
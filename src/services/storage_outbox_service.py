@@ -0,0 +1,174 @@
+import asyncio
+import os
+from datetime import timedelta
+
+from botocore.exceptions import BotoCoreError, ClientError
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_session
+from src.models import StorageOutbox
+from src.models.storage_outbox_model import (
+    OUTBOX_DELETE,
+    OUTBOX_DELETE_PREFIX,
+    OUTBOX_MOVE,
+    OUTBOX_MOVE_PREFIX,
+)
+from src.services.audio_service import S3_BUCKET_NAME, S3_DELETE_BATCH_SIZE, AudioService
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 500))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 10))
+OUTBOX_RETRY_SECONDS = int(os.getenv("OUTBOX_RETRY_SECONDS", 30))
+OUTBOX_DRAIN_BATCHES = int(os.getenv("OUTBOX_DRAIN_BATCHES", 20))
+OUTBOX_COPY_CONCURRENCY = int(os.getenv("OUTBOX_COPY_CONCURRENCY", 16))
+MAX_RETRY_SECONDS = 6 * 3600
+
+
+class StorageOutboxWorker:
+    """
+    Aplica no S3 as operações registradas em storage_outbox. Cada lote é
+    reservado com FOR UPDATE SKIP LOCKED, então vários workers (CLI e tarefas em
+    segundo plano da API) podem rodar ao mesmo tempo sem disputar as mesmas
+    linhas. Operações de várias requisições são agrupadas: remoções em chamadas
+    DeleteObjects de até 1000 chaves. Todas são idempotentes (remover chave
+    inexistente é sucesso), e as falhas voltam para a fila com espera exponencial
+    até OUTBOX_MAX_ATTEMPTS. As cópias são feitas na própria requisição, antes do
+    commit (AudioService.relocate_objects); movimentações só aparecem em linhas
+    gravadas antes disso e continuam sendo aplicadas.
+    """
+
+    def __init__(self):
+        self.audio_service = AudioService()
+
+    @property
+    def s3_client(self):
+        return self.audio_service.s3_client
+
+    def _delete_keys(self, keys: list[str]) -> dict[str, str]:
+        """Remove as chaves em lotes e retorna as que falharam com a mensagem de erro."""
+        errors = {}
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            batch = keys[start : start + S3_DELETE_BATCH_SIZE]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=S3_BUCKET_NAME,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except (BotoCoreError, ClientError) as e:
+                errors.update((key, str(e)) for key in batch)
+                continue
+            for error in response.get("Errors", []):
+                errors[error["Key"]] = error.get("Message", error.get("Code", ""))
+        return errors
+
+    def _apply(self, items: list[tuple[int, str, str, str]]) -> tuple[dict[int, str], int]:
+        """
+        Executado em thread: expande os prefixos, copia as movimentações, remove
+        em lote as chaves apagadas e as origens copiadas, e retorna os erros por
+        id da linha e o total de objetos processados.
+        """
+        row_errors = {}
+        deletes = {}
+        moves = {}
+        for row_id, operacao, chave, destino in items:
+            try:
+                if operacao == OUTBOX_DELETE:
+                    deletes[row_id] = [chave]
+                elif operacao == OUTBOX_DELETE_PREFIX:
+                    deletes[row_id] = self.audio_service.list_s3_keys(chave)
+                elif operacao == OUTBOX_MOVE:
+                    moves[row_id] = [(chave, destino)]
+                elif operacao == OUTBOX_MOVE_PREFIX:
+                    moves[row_id] = [
+                        (key, destino + key[len(chave) :])
+                        for key in self.audio_service.list_s3_keys(chave)
+                    ]
+                else:
+                    row_errors[row_id] = f"Operação desconhecida: {operacao}"
+            except (BotoCoreError, ClientError) as e:
+                row_errors[row_id] = str(e)
+
+        pairs = [(row_id, pair) for row_id, row_moves in moves.items() for pair in row_moves]
+        copies = self.audio_service.copy_s3_objects(
+            [pair for _, pair in pairs], concurrency=OUTBOX_COPY_CONCURRENCY
+        )
+        for (row_id, (source, _)), error in zip(pairs, copies):
+            if error:
+                row_errors.setdefault(row_id, error)
+            else:
+                deletes.setdefault(row_id, []).append(source)
+
+        keys = [
+            key
+            for row_id, row_keys in deletes.items()
+            if row_id not in row_errors
+            for key in row_keys
+        ]
+        key_errors = self._delete_keys(keys)
+        for row_id, row_keys in deletes.items():
+            failed = [key_errors[key] for key in row_keys if key in key_errors]
+            if failed:
+                row_errors.setdefault(row_id, failed[0])
+        return row_errors, len(keys) - len(key_errors)
+
+    async def process_batch(self, db: AsyncSession, batch_size: int = None) -> dict:
+        rows = (
+            await db.execute(
+                select(StorageOutbox)
+                .where(
+                    StorageOutbox.disponivel_em <= func.now(),
+                    StorageOutbox.tentativas < OUTBOX_MAX_ATTEMPTS,
+                )
+                .order_by(StorageOutbox.id)
+                .limit(batch_size or OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+        ).scalars().all()
+        if not rows:
+            await db.rollback()
+            return {"linhas": 0, "objetos": 0, "falhas": 0}
+
+        row_errors, objects = await asyncio.to_thread(
+            self._apply,
+            [(row.id, row.operacao, row.chave, row.destino) for row in rows],
+        )
+
+        done = [row.id for row in rows if row.id not in row_errors]
+        if done:
+            await db.execute(delete(StorageOutbox).where(StorageOutbox.id.in_(done)))
+        for row in rows:
+            if row.id in row_errors:
+                espera = min(OUTBOX_RETRY_SECONDS * 2**row.tentativas, MAX_RETRY_SECONDS)
+                row.tentativas += 1
+                row.ultimo_erro = row_errors[row.id][:1000]
+                row.disponivel_em = func.now() + timedelta(seconds=espera)
+        await db.commit()
+
+        return {"linhas": len(rows), "objetos": objects, "falhas": len(row_errors)}
+
+    async def run(self, max_batches: int = None, batch_size: int = None) -> dict:
+        """Processa lotes até esvaziar a fila (ou até `max_batches` lotes)."""
+        totals = {"linhas": 0, "objetos": 0, "falhas": 0}
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            async with async_session() as db:
+                result = await self.process_batch(db, batch_size)
+            batches += 1
+            for key, value in result.items():
+                totals[key] += value
+            if result["linhas"] == 0 or result["falhas"] == result["linhas"]:
+                break
+        return totals
+
+    async def pending(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count(StorageOutbox.id)))
+
+
+async def drain_storage_outbox() -> None:
+    """Tarefa em segundo plano agendada pelos endpoints que alteram objetos."""
+    try:
+        totals = await StorageOutboxWorker().run(max_batches=OUTBOX_DRAIN_BATCHES)
+        if totals["falhas"]:
+            print(f"Outbox de armazenamento com falhas: {totals}")
+    except Exception as e:
+        print(f"Erro ao processar outbox de armazenamento: {str(e)}")
@@ -0,0 +1,364 @@
+import asyncio
+import os
+from datetime import UTC, datetime, timedelta
+from typing import AsyncIterator, Callable
+
+from botocore.exceptions import ClientError
+from sqlalchemy import delete, func, insert, literal, or_, select, tuple_, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_session
+from src.models import Audio, Segmento, StorageOutbox
+from src.models.storage_outbox_model import (
+    OUTBOX_DELETE,
+    OUTBOX_DELETE_PREFIX,
+    OUTBOX_MOVE,
+    OUTBOX_MOVE_PREFIX,
+)
+from src.services.audio_service import S3_BUCKET_NAME, AudioService
+
+RECONCILE_SHARDS = int(os.getenv("RECONCILE_SHARDS", 16))
+RECONCILE_WORKERS = int(os.getenv("RECONCILE_WORKERS", 4))
+RECONCILE_MIN_AGE_SECONDS = int(os.getenv("RECONCILE_MIN_AGE_SECONDS", 3600))
+RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", 1000))
+
+# Tipos das chaves esperadas pelo banco
+TIPO_AUDIO = "audio"
+TIPO_SEGMENTO = "segmento"
+TIPO_PREFIXO = "prefixo"
+TIPO_OUTBOX = "outbox"
+TIPO_OUTBOX_PREFIXO = "outbox_prefixo"
+
+PREFIXOS = (TIPO_PREFIXO, TIPO_OUTBOX_PREFIXO)
+EM_ANDAMENTO = (TIPO_OUTBOX, TIPO_OUTBOX_PREFIXO)
+
+
+def _base(coluna):
+    return func.left(coluna, func.length(coluna) - 4)
+
+
+def expected_keys():
+    """
+    Todas as chaves que o banco espera (ou está movendo/removendo) no bucket:
+    originais, segmentos do manifesto, prefixos de segmentos de áudios sem
+    manifesto e as chaves e prefixos com operação pendente no outbox.
+    """
+    sem_manifesto = ~select(Segmento.id).where(Segmento.id_audio == Audio.id).exists()
+    chaves_outbox = StorageOutbox.operacao.in_([OUTBOX_DELETE, OUTBOX_MOVE])
+    prefixos_outbox = StorageOutbox.operacao.in_([OUTBOX_DELETE_PREFIX, OUTBOX_MOVE_PREFIX])
+    return union_all(
+        select(
+            Audio.nome_arquivo.label("chave"), literal(TIPO_AUDIO).label("tipo"), Audio.id
+        ).where(Audio.nome_arquivo != "temp"),
+        select(Segmento.nome_arquivo, literal(TIPO_SEGMENTO), Segmento.id),
+        select(
+            func.concat(_base(Audio.nome_arquivo), "_segment_"), literal(TIPO_PREFIXO), Audio.id
+        ).where(Audio.nome_arquivo != "temp", Audio.versao_segmentacao == 1, sem_manifesto),
+        select(StorageOutbox.chave, literal(TIPO_OUTBOX), StorageOutbox.id).where(
+            chaves_outbox
+        ),
+        select(StorageOutbox.destino, literal(TIPO_OUTBOX), StorageOutbox.id).where(
+            StorageOutbox.operacao == OUTBOX_MOVE
+        ),
+        select(StorageOutbox.chave, literal(TIPO_OUTBOX_PREFIXO), StorageOutbox.id).where(
+            prefixos_outbox
+        ),
+        select(StorageOutbox.destino, literal(TIPO_OUTBOX_PREFIXO), StorageOutbox.id).where(
+            StorageOutbox.operacao == OUTBOX_MOVE_PREFIX
+        ),
+    ).subquery("esperadas")
+
+
+class StorageReconciler:
+    """
+    Compara o bucket com o banco e encontra objetos órfãos (sem linha que os
+    referencie) e linhas pendentes (áudios ou segmentos sem objeto).
+
+    O espaço de chaves é dividido em faixas pelos quantis de audio.nome_arquivo
+    e cada faixa é varrida em paralelo: o S3 é listado com paginação completa a
+    partir de StartAfter e as chaves esperadas vêm de um cursor no servidor,
+    ordenadas por COLLATE "C" (mesma ordem binária UTF-8 da listagem do S3).
+    As duas sequências ordenadas são intercaladas como um merge join, então a
+    memória usada é de uma página do S3 e um bloco do cursor por faixa.
+    """
+
+    def __init__(self, min_age_seconds: int = None):
+        self.audio_service = AudioService()
+        self.min_age = timedelta(
+            seconds=RECONCILE_MIN_AGE_SECONDS if min_age_seconds is None else min_age_seconds
+        )
+
+    @property
+    def s3_client(self):
+        return self.audio_service.s3_client
+
+    async def shard_bounds(self, db: AsyncSession, shards: int) -> list[tuple]:
+        """Faixas (início exclusivo, fim inclusivo) com volumes parecidos de áudios."""
+        if shards <= 1:
+            return [(None, None)]
+        fracoes = [i / shards for i in range(1, shards)]
+        limites = await db.scalar(
+            select(
+                func.percentile_disc(fracoes).within_group(Audio.nome_arquivo.collate("C"))
+            )
+        )
+        limites = sorted(set(limites or []))
+        inicios = [None, *limites]
+        fins = [*limites, None]
+        return list(zip(inicios, fins))
+
+    async def _objects(self, start: str, end: str) -> AsyncIterator[list[dict]]:
+        """Páginas de objetos do S3 com chave em (start, end], em ordem."""
+        params = {"Bucket": S3_BUCKET_NAME}
+        if start is not None:
+            params["StartAfter"] = start
+        pages = iter(self.s3_client.get_paginator("list_objects_v2").paginate(**params))
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                return
+            contents = page.get("Contents", [])
+            if end is not None and contents and contents[-1]["Key"] > end:
+                yield [obj for obj in contents if obj["Key"] <= end]
+                return
+            if contents:
+                yield contents
+
+    async def _expected(self, start: str, end: str) -> AsyncIterator[tuple[str, list]]:
+        """Chaves esperadas em (start, end], agrupadas: (chave, [(tipo, id), ...])."""
+        esperadas = expected_keys()
+        chave = esperadas.c.chave.collate("C")
+        query = select(esperadas.c.chave, esperadas.c.tipo, esperadas.c.id).order_by(
+            chave, esperadas.c.tipo, esperadas.c.id
+        )
+        if start is not None:
+            query = query.where(chave > start)
+        if end is not None:
+            query = query.where(chave <= end)
+
+        atual, itens = None, []
+        async with async_session() as db:
+            result = await db.stream(query.execution_options(yield_per=RECONCILE_BATCH_SIZE))
+            async for rows in result.partitions():
+                for row in rows:
+                    if row.chave != atual and itens:
+                        yield atual, itens
+                        itens = []
+                    atual = row.chave
+                    itens.append((row.tipo, row.id))
+        if itens:
+            yield atual, itens
+
+    async def _merge(self, start: str, end: str, cutoff: datetime) -> AsyncIterator[dict]:
+        expected = self._expected(start, end)
+        grupo = await anext(expected, None)
+        prefixos = []
+
+        def pendentes(chave, itens):
+            if any(tipo in EM_ANDAMENTO for tipo, _ in itens):
+                return []
+            return [
+                {"tipo": "pendente", "entidade": tipo, "id": id, "chave": chave}
+                for tipo, id in itens
+                if tipo not in PREFIXOS
+            ]
+
+        async for page in self._objects(start, end):
+            for obj in page:
+                key = obj["Key"]
+                while grupo is not None and grupo[0] < key:
+                    chave, itens = grupo
+                    if any(tipo in PREFIXOS for tipo, _ in itens):
+                        prefixos.append(chave)
+                    for item in pendentes(chave, itens):
+                        yield item
+                    grupo = await anext(expected, None)
+
+                referenciado = False
+                if grupo is not None and grupo[0] == key:
+                    chave, itens = grupo
+                    if any(tipo in PREFIXOS for tipo, _ in itens):
+                        prefixos.append(chave)
+                    referenciado = any(tipo not in PREFIXOS for tipo, _ in itens)
+                    grupo = await anext(expected, None)
+
+                # Chaves de um prefixo são contíguas: prefixos que não cobrem a
+                # chave atual não cobrem nenhuma das seguintes
+                prefixos = [prefixo for prefixo in prefixos if key.startswith(prefixo)]
+                if referenciado or prefixos:
+                    continue
+                if obj["LastModified"] <= cutoff:
+                    yield {"tipo": "orfao", "chave": key, "tamanho": obj.get("Size")}
+
+        while grupo is not None:
+            for item in pendentes(*grupo):
+                yield item
+            grupo = await anext(expected, None)
+
+    async def _unreferenced(self, db: AsyncSession, keys: list[str]) -> list[str]:
+        """Confirma, na hora de remover, que nenhuma linha passou a referenciar as chaves."""
+        referenciadas = union_all(
+            select(Audio.nome_arquivo).where(Audio.nome_arquivo.in_(keys)),
+            select(Segmento.nome_arquivo).where(Segmento.nome_arquivo.in_(keys)),
+            select(StorageOutbox.chave).where(StorageOutbox.chave.in_(keys)),
+            select(StorageOutbox.destino).where(StorageOutbox.destino.in_(keys)),
+        )
+        existentes = set((await db.execute(referenciadas)).scalars())
+        return [key for key in keys if key not in existentes]
+
+    def _still_pending(self, model, items: list[dict]):
+        """
+        Condição para remover as linhas pendentes na própria instrução DELETE: a
+        linha ainda aponta para a chave verificada (uma troca de rótulo depois da
+        varredura muda o nome e a linha fica) e nenhuma operação do outbox
+        envolve essa chave.
+        """
+        no_outbox = ~select(StorageOutbox.id).where(
+            or_(
+                StorageOutbox.chave == model.nome_arquivo,
+                StorageOutbox.destino == model.nome_arquivo,
+            )
+        ).exists()
+        return (
+            tuple_(model.id, model.nome_arquivo).in_(
+                [(item["id"], item["chave"]) for item in items]
+            ),
+            no_outbox,
+        )
+
+    def _missing(self, keys: list[str]) -> set[str]:
+        missing = set()
+        for key in keys:
+            try:
+                self.s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=key)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+                missing.add(key)
+        return missing
+
+    async def _apply(self, orfaos: list[str], pendentes: list[dict]) -> dict:
+        """
+        Registra a remoção dos órfãos no outbox e remove as linhas pendentes,
+        depois de confirmar cada achado de novo (a varredura não é um snapshot
+        único do bucket e do banco): a chave continua ausente no S3 e, na
+        instrução que remove a linha, ela ainda aponta para essa chave.
+        """
+        removidos = {"orfaos": 0, "audios": 0, "segmentos": 0}
+        async with async_session() as db:
+            if orfaos:
+                orfaos = await self._unreferenced(db, orfaos)
+                if orfaos:
+                    await db.execute(
+                        insert(StorageOutbox),
+                        [{"operacao": OUTBOX_DELETE, "chave": key} for key in orfaos],
+                    )
+                    await db.commit()
+                    removidos["orfaos"] = len(orfaos)
+
+            if pendentes:
+                missing = await asyncio.to_thread(
+                    self._missing, [item["chave"] for item in pendentes]
+                )
+                audios = [
+                    item
+                    for item in pendentes
+                    if item["entidade"] == TIPO_AUDIO and item["chave"] in missing
+                ]
+                segmentos = [
+                    item
+                    for item in pendentes
+                    if item["entidade"] == TIPO_SEGMENTO and item["chave"] in missing
+                ]
+                if segmentos:
+                    ids_audio = (
+                        await db.execute(
+                            delete(Segmento)
+                            .where(*self._still_pending(Segmento, segmentos))
+                            .returning(Segmento.id_audio)
+                        )
+                    ).scalars().all()
+                    await db.execute(
+                        update(Audio)
+                        .where(Audio.id.in_(ids_audio))
+                        .values(
+                            qtd_segmentos=select(func.count(Segmento.id))
+                            .where(Segmento.id_audio == Audio.id)
+                            .scalar_subquery()
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+                    removidos["segmentos"] = len(ids_audio)
+                if audios:
+                    # O conjunto é fixado antes: enqueue_object_deletion grava no
+                    # outbox exatamente essas chaves, e a condição sem outbox
+                    # deixaria de valer dentro de delete_audios_where
+                    ids = (
+                        await db.execute(
+                            select(Audio.id)
+                            .where(*self._still_pending(Audio, audios))
+                            .with_for_update()
+                        )
+                    ).scalars().all()
+                    if ids:
+                        removidos["audios"] = await self.audio_service.delete_audios_where(
+                            db, Audio.id.in_(ids)
+                        )
+                    else:
+                        await db.rollback()
+        return removidos
+
+    async def _scan(
+        self,
+        start: str,
+        end: str,
+        cutoff: datetime,
+        apply: bool,
+        on_finding: Callable[[dict], None],
+    ) -> dict:
+        totals = {"orfaos": 0, "pendentes": 0, "removidos": 0}
+        orfaos, pendentes = [], []
+        async for item in self._merge(start, end, cutoff):
+            on_finding(item)
+            if item["tipo"] == "orfao":
+                totals["orfaos"] += 1
+                orfaos.append(item["chave"])
+            else:
+                totals["pendentes"] += 1
+                pendentes.append(item)
+            if apply and len(orfaos) + len(pendentes) >= RECONCILE_BATCH_SIZE:
+                totals["removidos"] += sum((await self._apply(orfaos, pendentes)).values())
+                orfaos, pendentes = [], []
+        if apply and (orfaos or pendentes):
+            totals["removidos"] += sum((await self._apply(orfaos, pendentes)).values())
+        return totals
+
+    async def run(
+        self,
+        shards: int = None,
+        workers: int = None,
+        apply: bool = False,
+        on_finding: Callable[[dict], None] = print,
+    ) -> dict:
+        """
+        Varre as faixas, até `workers` ao mesmo tempo (cada uma usa até duas
+        conexões do pool), e chama `on_finding` para cada achado. Objetos mais
+        recentes que o tempo mínimo são ignorados, para não tratar como órfão
+        um upload cuja transação ainda não terminou.
+        """
+        async with async_session() as db:
+            bounds = await self.shard_bounds(db, shards or RECONCILE_SHARDS)
+        cutoff = datetime.now(UTC) - self.min_age
+        semaphore = asyncio.Semaphore(workers or RECONCILE_WORKERS)
+
+        async def scan(start, end):
+            async with semaphore:
+                return await self._scan(start, end, cutoff, apply, on_finding)
+
+        results = await asyncio.gather(*(scan(start, end) for start, end in bounds))
+        totals = {"faixas": len(bounds), "orfaos": 0, "pendentes": 0, "removidos": 0}
+        for result in results:
+            for key, value in result.items():
+                totals[key] += value
+        return totals
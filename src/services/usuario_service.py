@@ -1,20 +1,38 @@
 import re
+from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Select, delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from src.models import Usuario, Audio, Participante
+from src.models import Audio, Classificacao, Participante, Usuario, Vocalizacao
 from src.schemas.usuario_schema import UsuarioUpdate
 from src.services.auth_service import AuthService
 from src.services.audio_service import AudioService
+from src.services.stats_service import invalidate_stats
+from src.utils.pagination import PageParams, date_range, paginate
+from src.utils.principal_cache import invalidate_principal
 
 
 class UsuarioService:
-    async def get_all(self, db: AsyncSession) -> list[Usuario]:
-        result = await db.execute(select(Usuario))
-        return result.scalars().all()
+    async def get_all(
+        self,
+        db: AsyncSession,
+        page: PageParams,
+        data_inicio: datetime = None,
+        data_fim: datetime = None,
+    ) -> dict:
+        query = select(Usuario).where(*date_range(Usuario.created_at, data_inicio, data_fim))
+        return await paginate(db, query, Usuario, page)
+
+    def export_query(self, data_inicio: datetime = None, data_fim: datetime = None) -> Select:
+        """Consulta da exportação completa (NDJSON) dos usuários filtrados"""
+        return (
+            select(Usuario.__table__)
+            .where(*date_range(Usuario.created_at, data_inicio, data_fim))
+            .order_by(Usuario.id)
+        )
 
     async def get_one(self, id: int, db: AsyncSession) -> Usuario:
         return await self.__get_by_id(id, db)
@@ -72,6 +90,7 @@ class UsuarioService:
             usuario_db.verificado = False
 
         await db.commit()
+        await invalidate_principal(id)
         await db.refresh(usuario_db)
 
         return {
@@ -86,31 +105,33 @@ class UsuarioService:
         }
 
     async def delete(self, id: int, db: AsyncSession) -> None:
-        usuario = await self.__get_by_id(id, db)
-
-        result = await db.execute(
-            select(Participante).where(Participante.id_usuario == id)
+        """
+        Remove o usuário com um DELETE em cascata no banco: participantes,
+        vocalizações criadas por ele e todos os áudios ligados a eles. Os objetos
+        desses áudios vão para a fila de remoção do S3 na mesma transação.
+        """
+        await self.__get_by_id(id, db)
+
+        vocalizacoes = select(Vocalizacao.id).where(Vocalizacao.id_usuario == id)
+        participantes = select(Participante.id).where(Participante.id_usuario == id)
+        await AudioService().enqueue_object_deletion(
+            db,
+            or_(
+                Audio.id_usuario == id,
+                Audio.id_participante.in_(participantes),
+                Audio.id_vocalizacao.in_(vocalizacoes),
+            ),
         )
-        participante = result.scalars().first()
-
-        if participante:
-            result = await db.execute(
-                select(Audio).where(Audio.id_participante == participante.id)
+        # Classificações não têm ON DELETE CASCADE
+        await db.execute(
+            delete(Classificacao).where(
+                or_(
+                    Classificacao.id_usuario == id,
+                    Classificacao.id_vocalizacao.in_(vocalizacoes),
+                )
             )
-            audios = result.scalars().all()
-
-            if audios:
-                audio_service = AudioService()
-                for audio in audios:
-                    await audio_service.delete_audio(audio.id, db)
-
-        result = await db.execute(select(Audio).where(Audio.id_usuario == id))
-        audios = result.scalars().all()
-
-        if audios:
-            audio_service = AudioService()
-            for audio in audios:
-                await audio_service.delete_audio(audio.id, db)
-
-        await db.delete(usuario)
+        )
+        await db.execute(delete(Usuario).where(Usuario.id == id))
         await db.commit()
+        await invalidate_principal(id)
+        await invalidate_stats()
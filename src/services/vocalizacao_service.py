@@ -1,45 +1,27 @@
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from src.models import Vocalizacao, Audio
-import os
-import boto3
-from botocore.client import Config
-from botocore.exceptions import ClientError, NoCredentialsError
+from sqlalchemy import and_, delete, func, literal, select, union_all, update
+from src.models import Vocalizacao, Audio, Classificacao, Segmento
+from src.models.storage_outbox_model import OUTBOX_MOVE, OUTBOX_MOVE_PREFIX
+from src.preprocessing.vad import get_engine
 from src.schemas.vocalizacao_schema import VocalizacaoCreate, VocalizacaoUpdate
+from src.services.audio_service import AudioService
+from src.services.stats_service import invalidate_stats
 
 
 class VocalizacaoService:
-    def __init__(self):
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("AWS_DEFAULT_REGION"),
-            config=Config(signature_version="s3v4"),
-        )
-        self.bucket_name = os.getenv("S3_BUCKET_NAME")
-
-    def _list_s3_objects(self, prefix):
-        """Lista objetos no S3 com o prefixo especificado"""
+    def _validate_vad(self, vad_engine: str, vad_params: dict) -> None:
+        """Garante que o motor de VAD e seus parâmetros são válidos"""
+        if vad_engine is None and not vad_params:
+            return
         try:
-            print(f"Buscando objetos com prefixo: {prefix}")
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name, Prefix=prefix
+            get_engine(vad_engine, vad_params)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
             )
 
-            objects = []
-            if "Contents" in response:
-                objects = [obj["Key"] for obj in response["Contents"]]
-                print(f"Encontrados {len(objects)} objetos: {objects}")
-            else:
-                print(f"Nenhum objeto encontrado com prefixo '{prefix}'")
-
-            return objects
-        except Exception as e:
-            print(f"Erro ao listar objetos no S3: {str(e)}")
-            return []
-
     async def get_all(self, db: AsyncSession) -> list[Vocalizacao]:
         result = await db.execute(select(Vocalizacao).order_by(Vocalizacao.nome))
         return result.scalars().all()
@@ -59,11 +41,13 @@ class VocalizacaoService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Vocalização já cadastrada.",
             )
+        self._validate_vad(vocalizacao.vad_engine, vocalizacao.vad_params)
         db_vocalizacao = vocalizacao.model_dump()
         db_vocalizacao["id_usuario"] = usuario_id
         db_vocalizacao = Vocalizacao(**db_vocalizacao)
         db.add(db_vocalizacao)
         await db.commit()
+        await invalidate_stats()
         await db.refresh(db_vocalizacao)
         return db_vocalizacao
 
@@ -77,31 +61,76 @@ class VocalizacaoService:
             )
         return vocalizacao
 
-    async def _get_audio_by_vocalizacao(
-        self, id_vocalizacao: int, db: AsyncSession
-    ) -> list[Audio]:
-        result = await db.execute(
-            select(Audio).where(Audio.id_vocalizacao == id_vocalizacao)
+    async def _rename_audios(
+        self, id: int, nome_antigo: str, nome_novo: str, db: AsyncSession
+    ) -> None:
+        """
+        Renomeia, sem commit, os arquivos dos áudios da vocalização cujo nome
+        começa pelo nome antigo, com instruções em lote. Os objetos no S3 (o
+        original, os segmentos do manifesto e, para áudios anteriores ao
+        manifesto, o prefixo dos segmentos) são copiados para os novos nomes
+        antes, e só a remoção dos antigos fica no outbox.
+        """
+        tamanho = len(nome_antigo)
+        prefixo_antigo = nome_antigo.lower()
+        nome_novo = nome_novo.lower()
+
+        def renomear(coluna):
+            return func.concat(nome_novo, func.substr(coluna, tamanho + 1))
+
+        def base(coluna):
+            return func.left(coluna, func.length(coluna) - 4)
+
+        audios = (
+            select(Audio.id, Audio.nome_arquivo, Audio.versao_segmentacao)
+            .where(
+                Audio.id_vocalizacao == id,
+                func.lower(func.left(Audio.nome_arquivo, tamanho)) == prefixo_antigo,
+            )
+            .cte("audios_renomeados")
+        )
+        sem_manifesto = ~select(Segmento.id).where(Segmento.id_audio == audios.c.id).exists()
+        segmento_renomeado = and_(
+            Segmento.id_audio == audios.c.id,
+            func.lower(func.left(Segmento.nome_arquivo, tamanho)) == prefixo_antigo,
         )
-        return result.scalars().all()
-
-    def _rename_s3_object(self, old_key, new_key):
-        try:
-            print(f"Renomeando objeto de '{old_key}' para '{new_key}'")
 
-            self.s3_client.copy_object(
-                Bucket=self.bucket_name,
-                CopySource=f"{self.bucket_name}/{old_key}",
-                Key=new_key,
+        movimentacoes = union_all(
+            select(
+                literal(OUTBOX_MOVE),
+                audios.c.nome_arquivo,
+                renomear(audios.c.nome_arquivo),
+            ),
+            select(
+                literal(OUTBOX_MOVE),
+                Segmento.nome_arquivo,
+                renomear(Segmento.nome_arquivo),
+            ).join(audios, segmento_renomeado),
+            select(
+                literal(OUTBOX_MOVE_PREFIX),
+                func.concat(base(audios.c.nome_arquivo), "_segment_"),
+                func.concat(renomear(base(audios.c.nome_arquivo)), "_segment_"),
+            ).where(audios.c.versao_segmentacao == 1, sem_manifesto),
+        )
+        moves = (await db.execute(movimentacoes)).all()
+        await AudioService().relocate_objects(db, [tuple(move) for move in moves])
+
+        # Segmentos antes dos áudios: o CTE é reavaliado e ainda vê os nomes antigos
+        await db.execute(
+            update(Segmento)
+            .where(
+                Segmento.id_audio.in_(select(audios.c.id)),
+                func.lower(func.left(Segmento.nome_arquivo, tamanho)) == prefixo_antigo,
             )
-
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=old_key)
-
-            print(f"Objeto renomeado com sucesso")
-            return True
-        except Exception as e:
-            print(f"Erro ao renomear objeto: {str(e)}")
-            return False
+            .values(nome_arquivo=renomear(Segmento.nome_arquivo))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(Audio)
+            .where(Audio.id.in_(select(audios.c.id)))
+            .values(nome_arquivo=renomear(Audio.nome_arquivo))
+            .execution_options(synchronize_session=False)
+        )
 
     async def update(
         self,
@@ -122,77 +151,34 @@ class VocalizacaoService:
         nome_antigo = vocalizacao_db.nome
         dados_atualizacao = vocalizacao.model_dump(exclude_unset=True)
 
+        if "vad_engine" in dados_atualizacao or "vad_params" in dados_atualizacao:
+            self._validate_vad(
+                dados_atualizacao.get("vad_engine", vocalizacao_db.vad_engine),
+                dados_atualizacao.get("vad_params", vocalizacao_db.vad_params),
+            )
+
         if "nome" in dados_atualizacao and dados_atualizacao["nome"] != nome_antigo:
             print(
                 f"Atualizando nome da vocalização de '{nome_antigo}' para '{dados_atualizacao['nome']}'"
             )
 
-            audios = await self._get_audio_by_vocalizacao(id, db)
-
-            for audio in audios:
-                old_filename = audio.nome_arquivo
-                nome_novo = dados_atualizacao["nome"].lower()
-
-                if old_filename.lower().startswith(nome_antigo.lower()):
-                    new_filename = old_filename.replace(
-                        nome_antigo.lower(), nome_novo, 1
-                    )
-                    print(
-                        f"Renomeando arquivo principal: {old_filename} -> {new_filename}"
-                    )
-
-                    rename_success = self._rename_s3_object(old_filename, new_filename)
-
-                    if rename_success:
-                        audio.nome_arquivo = new_filename
-                        await db.commit()
-
-                        base_old = old_filename[:-4]
-                        base_new = new_filename[:-4]
-
-                        segment_prefix = f"{base_old}_segment_"
-                        segment_files = self._list_s3_objects(segment_prefix)
-
-                        for segment in segment_files:
-                            new_segment = segment.replace(base_old, base_new, 1)
-                            self._rename_s3_object(segment, new_segment)
+            await self._rename_audios(id, nome_antigo, dados_atualizacao["nome"], db)
 
         for key, value in dados_atualizacao.items():
             setattr(vocalizacao_db, key, value)
 
         await db.commit()
+        await invalidate_stats()
         await db.refresh(vocalizacao_db)
         return vocalizacao_db
 
     async def delete(self, id: int, db: AsyncSession) -> None:
-        vocalizacao = await self.__get_by_id(id, db)
-
-        audios = await self._get_audio_by_vocalizacao(id, db)
-
-        for audio in audios:
-            try:
-                print(f"Deletando arquivo principal: {audio.nome_arquivo}")
-                self.s3_client.delete_object(
-                    Bucket=self.bucket_name, Key=audio.nome_arquivo
-                )
-
-                base_filename = audio.nome_arquivo[:-4]
-                segment_prefix = f"{base_filename}_segment_"
-
-                segment_files = self._list_s3_objects(segment_prefix)
-
-                for segment in segment_files:
-                    print(f"Deletando segmento: {segment}")
-                    self.s3_client.delete_object(Bucket=self.bucket_name, Key=segment)
-
-                await db.delete(audio)
-
-            except (NoCredentialsError, ClientError) as e:
-                print(f"Erro ao deletar arquivo no S3: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erro ao deletar arquivo no S3: {str(e)}",
-                )
+        """Remove a vocalização e seus áudios (cascata no banco) em uma transação"""
+        await self.__get_by_id(id, db)
 
-        await db.delete(vocalizacao)
+        await AudioService().enqueue_object_deletion(db, Audio.id_vocalizacao == id)
+        # Classificações não têm ON DELETE CASCADE
+        await db.execute(delete(Classificacao).where(Classificacao.id_vocalizacao == id))
+        await db.execute(delete(Vocalizacao).where(Vocalizacao.id == id))
         await db.commit()
+        await invalidate_stats()
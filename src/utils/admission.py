@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, status
+
+UPLOAD_MAX_CONCURRENT = int(os.getenv("UPLOAD_MAX_CONCURRENT", 2))
+UPLOAD_MAX_BYTES_IN_FLIGHT = int(os.getenv("UPLOAD_MAX_BYTES_IN_FLIGHT", 200 * 1024 * 1024))
+UPLOAD_MAX_QUEUE = int(os.getenv("UPLOAD_MAX_QUEUE", 20))
+UPLOAD_QUEUE_TIMEOUT = float(os.getenv("UPLOAD_QUEUE_TIMEOUT", 10))
+UPLOAD_RETRY_AFTER = int(os.getenv("UPLOAD_RETRY_AFTER", 10))
+
+
+class AdmissionController:
+    """
+    Controle de admissão por processo: limita quantas operações pesadas rodam ao
+    mesmo tempo e quantos bytes elas somam. Acima da capacidade a requisição
+    espera na fila até `queue_timeout` segundos; com a fila cheia ou o prazo
+    esgotado, recebe 503 com Retry-After em vez de disputar CPU e memória com as
+    que já estão em andamento. Uma operação maior que `max_bytes` sozinha só é
+    admitida quando nenhuma outra está em andamento.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_bytes: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_bytes = max_bytes
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._condition = asyncio.Condition()
+        self.active = 0
+        self.bytes_in_flight = 0
+        self.waiting = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _fits(self, size: int) -> bool:
+        if self.active >= self.max_concurrent:
+            return False
+        return self.active == 0 or self.bytes_in_flight + size <= self.max_bytes
+
+    def _reject(self):
+        self.rejected += 1
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado processando outros áudios. Tente novamente em instantes.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    @asynccontextmanager
+    async def admit(self, size: int):
+        start = time.perf_counter()
+        async with self._condition:
+            if not self._fits(size):
+                if self.waiting >= self.max_queue or self.queue_timeout <= 0:
+                    raise self._reject()
+                self.waiting += 1
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self._fits(size)),
+                        timeout=self.queue_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise self._reject()
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self.bytes_in_flight += size
+
+        waited = time.perf_counter() - start
+        self.admitted += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.active -= 1
+                self.bytes_in_flight -= size
+                self._condition.notify_all()
+
+    def status(self) -> dict:
+        return {
+            "em_andamento": self.active,
+            "max_simultaneos": self.max_concurrent,
+            "bytes_em_andamento": self.bytes_in_flight,
+            "max_bytes": self.max_bytes,
+            "na_fila": self.waiting,
+            "max_fila": self.max_queue,
+            "admitidos": self.admitted,
+            "rejeitados": self.rejected,
+            "espera_media_ms": (
+                self.wait_total / self.admitted * 1000 if self.admitted else 0.0
+            ),
+            "espera_max_ms": self.wait_max * 1000,
+        }
+
+
+upload_admission = AdmissionController(
+    max_concurrent=UPLOAD_MAX_CONCURRENT,
+    max_bytes=UPLOAD_MAX_BYTES_IN_FLIGHT,
+    max_queue=UPLOAD_MAX_QUEUE,
+    queue_timeout=UPLOAD_QUEUE_TIMEOUT,
+    retry_after=UPLOAD_RETRY_AFTER,
+)
+
+
+def upload_size(file) -> int:
+    """Tamanho do arquivo enviado, usado como estimativa dos bytes em processamento."""
+    if file.size is not None:
+        return file.size
+    position = file.file.tell()
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(position)
+    return size
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+CLAIMS_CACHE_SIZE = int(os.getenv("CLAIMS_CACHE_SIZE", 10000))
+
+
+class ClaimsCache:
+    """
+    LRU das claims de access tokens já verificados, por hash do token, válidas
+    até o `exp` do próprio token. Evita refazer a verificação da assinatura a
+    cada requisição do mesmo cliente. Guarda apenas o resultado da decodificação:
+    a verificação de revogação continua sendo feita em toda requisição.
+    """
+
+    def __init__(self, maxsize: int = CLAIMS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        exp, claims = entry
+        if exp <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(claims)
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (exp, dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        self._entries.pop(self._key(token), None)
+
+    def status(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "tamanho": len(self._entries),
+            "capacidade": self.maxsize,
+            "acertos": self.hits,
+            "falhas": self.misses,
+            "taxa_acerto": self.hits / total if total else 0.0,
+        }
+
+
+claims_cache = ClaimsCache()
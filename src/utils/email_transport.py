@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+from datetime import UTC, datetime
+
+import sib_api_v3_sdk
+from sib_api_v3_sdk.rest import ApiException
+
+BREVO_API_KEY = os.getenv("BREVO_API_KEY")
+BREVO_SENDER_EMAIL = os.getenv("BREVO_SENDER_EMAIL")
+BREVO_SENDER_NAME = os.getenv("BREVO_SENDER_NAME")
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "brevo")
+EMAIL_FILE_PATH = os.getenv("EMAIL_FILE_PATH", "/tmp/vocalizeai-emails.jsonl")
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", 8))
+EMAIL_CONNECT_TIMEOUT = float(os.getenv("EMAIL_CONNECT_TIMEOUT", 3))
+EMAIL_READ_TIMEOUT = float(os.getenv("EMAIL_READ_TIMEOUT", 10))
+
+
+class EmailSendError(Exception):
+    """Falha no envio. `permanent` indica que repetir o envio não vai resolver."""
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class BrevoTransport:
+    """
+    Envia pela API transacional do Brevo com um único cliente por processo, cujo
+    pool de conexões HTTP comporta EMAIL_SEND_CONCURRENCY envios simultâneos.
+    """
+
+    def __init__(self):
+        configuration = sib_api_v3_sdk.Configuration()
+        configuration.api_key["api-key"] = BREVO_API_KEY
+        configuration.connection_pool_maxsize = EMAIL_SEND_CONCURRENCY
+        self._api = sib_api_v3_sdk.TransactionalEmailsApi(
+            sib_api_v3_sdk.ApiClient(configuration)
+        )
+        self._sender = {"name": BREVO_SENDER_NAME, "email": BREVO_SENDER_EMAIL}
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
+            to=[{"email": to_email}],
+            html_content=html_content,
+            sender=self._sender,
+            subject=subject,
+        )
+        try:
+            self._api.send_transac_email(
+                send_smtp_email,
+                _request_timeout=(EMAIL_CONNECT_TIMEOUT, EMAIL_READ_TIMEOUT),
+            )
+        except ApiException as e:
+            # 4xx (exceto 429) é erro na mensagem ou na conta, não instabilidade
+            permanent = e.status is not None and 400 <= e.status < 500 and e.status != 429
+            raise EmailSendError(f"Erro ao enviar email: {str(e)}", permanent=permanent)
+        except Exception as e:
+            raise EmailSendError(f"Erro ao enviar email: {str(e)}")
+
+
+class FileTransport:
+    """Grava cada email como uma linha JSON em EMAIL_FILE_PATH (desenvolvimento e testes)."""
+
+    def __init__(self, path: str = EMAIL_FILE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        line = json.dumps(
+            {
+                "para": to_email,
+                "assunto": subject,
+                "html": html_content,
+                "enviado_em": datetime.now(UTC).isoformat(),
+            },
+            ensure_ascii=False,
+        )
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+class MemoryTransport:
+    """Guarda os emails em memória, em `sent` (testes e benchmarks)."""
+
+    def __init__(self):
+        self.sent: list[tuple[str, str, str]] = []
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        self.sent.append((to_email, subject, html_content))
+
+
+def create_transport():
+    transports = {"brevo": BrevoTransport, "file": FileTransport, "memory": MemoryTransport}
+    if EMAIL_BACKEND not in transports:
+        raise ValueError(f"EMAIL_BACKEND inválido: {EMAIL_BACKEND}")
+    return transports[EMAIL_BACKEND]()
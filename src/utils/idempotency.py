@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Optional, Type
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from src.redis_client import get_redis
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 86400))
+IDEMPOTENCY_LOCK_TTL = int(os.getenv("IDEMPOTENCY_LOCK_TTL", 300))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 60))
+IDEMPOTENCY_MAX_KEY_LENGTH = 255
+
+STATE_PROCESSING = "processing"
+STATE_DONE = "done"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Gera a impressão digital da requisição a partir das partes informadas."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def fingerprint_file(file_obj, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calcula o hash do conteúdo de um arquivo sem carregá-lo inteiro na memória.
+    A leitura é bloqueante: em código assíncrono, chame via run_in_threadpool.
+    """
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def _replay(record: dict) -> JSONResponse:
+    return JSONResponse(
+        status_code=record["status_code"],
+        content=record["body"],
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+async def run_idempotent(
+    key: Optional[str],
+    scope: str,
+    request_fingerprint: str,
+    operation: Callable[[], Awaitable[Any]],
+    response_model: Type[BaseModel],
+    status_code: int = status.HTTP_201_CREATED,
+):
+    """
+    Executa a operação uma única vez por chave de idempotência.
+
+    A primeira requisição reserva a chave no Redis e grava a resposta final com TTL.
+    Requisições concorrentes com a mesma chave aguardam o término da primeira e
+    recebem a mesma resposta, sem reexecutar a operação.
+    """
+    if not key:
+        return await operation()
+
+    if len(key) > IDEMPOTENCY_MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} deve ter no máximo {IDEMPOTENCY_MAX_KEY_LENGTH} caracteres.",
+        )
+
+    redis = get_redis()
+    redis_key = f"idempotency:{scope}:{key}"
+    owner = uuid.uuid4().hex
+    processing = json.dumps(
+        {"state": STATE_PROCESSING, "fingerprint": request_fingerprint, "owner": owner}
+    )
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + IDEMPOTENCY_WAIT_TIMEOUT
+    delay = 0.05
+
+    while True:
+        try:
+            acquired = await redis.set(
+                redis_key, processing, nx=True, ex=IDEMPOTENCY_LOCK_TTL
+            )
+            raw = None if acquired else await redis.get(redis_key)
+        except RedisError as e:
+            print(f"Idempotência indisponível, executando sem proteção: {str(e)}")
+            return await operation()
+
+        if acquired:
+            break
+
+        if raw is None:
+            # A execução anterior falhou e liberou a chave: tenta assumir de novo
+            continue
+
+        record = json.loads(raw)
+        if record["fingerprint"] != request_fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_HEADER} já utilizada com uma requisição diferente.",
+            )
+        if record["state"] == STATE_DONE:
+            return _replay(record)
+        if loop.time() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Uma requisição com esta chave de idempotência ainda está em processamento.",
+            )
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+    try:
+        result = await operation()
+    except BaseException:
+        try:
+            raw = await redis.get(redis_key)
+            if raw is not None and json.loads(raw).get("owner") == owner:
+                await redis.delete(redis_key)
+        except RedisError:
+            pass
+        raise
+
+    body = jsonable_encoder(response_model.model_validate(result, from_attributes=True))
+    try:
+        await redis.set(
+            redis_key,
+            json.dumps(
+                {
+                    "state": STATE_DONE,
+                    "fingerprint": request_fingerprint,
+                    "status_code": status_code,
+                    "body": body,
+                }
+            ),
+            ex=IDEMPOTENCY_TTL,
+        )
+    except RedisError as e:
+        print(f"Erro ao salvar resposta idempotente: {str(e)}")
+
+    return result
@@ -0,0 +1,93 @@
+import base64
+import json
+import os
+from datetime import UTC, datetime
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+MAX_PAGE_SIZE = int(os.getenv("PAGE_SIZE_MAX", 500))
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Codifica a posição (created_at, id) do último item da página."""
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido.",
+        )
+
+
+class PageParams:
+    """Dependência com os parâmetros de paginação (`cursor` e `limit`)."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(
+            None, description="Valor de next_cursor da página anterior"
+        ),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def _as_column_tz(column, value: datetime) -> datetime:
+    """
+    Ajusta o datetime ao tipo da coluna: colunas sem fuso (como
+    usuario.created_at) guardam UTC sem fuso, e o asyncpg recusa valores com
+    fuso para elas; valores sem fuso comparados a colunas com fuso são UTC.
+    """
+    if column.type.timezone:
+        return value if value.tzinfo else value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+
+
+def date_range(column, data_inicio: datetime = None, data_fim: datetime = None) -> list:
+    """Filtros do período [data_inicio, data_fim) sobre a coluna informada."""
+    conditions = []
+    if data_inicio is not None:
+        conditions.append(column >= _as_column_tz(column, data_inicio))
+    if data_fim is not None:
+        conditions.append(column < _as_column_tz(column, data_fim))
+    return conditions
+
+
+async def paginate(db: AsyncSession, query: Select, model, page: PageParams) -> dict:
+    """
+    Pagina a consulta por keyset em (created_at, id), do mais recente para o
+    mais antigo. A condição redundante `created_at <= cursor` permite que os
+    índices compostos (filtro, created_at) delimitem a varredura; o id desempata
+    registros criados no mesmo instante.
+    """
+    if page.cursor:
+        created_at, id = decode_cursor(page.cursor)
+        created_at = _as_column_tz(model.created_at, created_at)
+        query = query.where(
+            model.created_at <= created_at,
+            or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < id),
+            ),
+        )
+
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(page.limit + 1)
+    items = (await db.execute(query)).scalars().all()
+
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return {"items": items, "next_cursor": next_cursor}
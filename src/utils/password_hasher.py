@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class PasswordHasherExecutor:
+    """
+    Executa o hash e a verificação de senhas em um pool de threads próprio.
+    O Argon2 libera o GIL durante o cálculo, então o event loop continua
+    atendendo as demais requisições; o número de threads limita quantos hashes
+    rodam ao mesmo tempo (e a memória que usam), e os excedentes esperam na fila.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.completed = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.run_total = 0.0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.wait_total += started - submitted
+                    self.wait_max = max(self.wait_max, started - submitted)
+                    self.run_total += finished - started
+
+        # Protegido do cancelamento: um job ainda na fila do executor seria
+        # descartado sem ajustar os contadores
+        future = self._executor.submit(job)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "threads": self.max_workers,
+                "em_execucao": self.running,
+                "na_fila": self.queued,
+                "concluidos": self.completed,
+                "espera_media_ms": (
+                    self.wait_total / self.completed * 1000 if self.completed else 0.0
+                ),
+                "espera_max_ms": self.wait_max * 1000,
+                "execucao_media_ms": (
+                    self.run_total / self.completed * 1000 if self.completed else 0.0
+                ),
+            }
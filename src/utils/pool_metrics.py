@@ -0,0 +1,99 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Limites (em ms) das faixas do histograma de espera por conexão
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """
+    Acumula o tempo que as requisições esperam por uma conexão do pool. Fica
+    fora do pool porque o SQLAlchemy recria a instância do pool ao invalidar
+    conexões ou chamar dispose(), e os contadores devem sobreviver a isso.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        milliseconds = seconds * 1000
+        index = next(
+            (i for i, limit in enumerate(WAIT_BUCKETS_MS) if milliseconds <= limit),
+            len(WAIT_BUCKETS_MS),
+        )
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.buckets[index] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={limit}ms" for limit in WAIT_BUCKETS_MS] + [
+                f">{WAIT_BUCKETS_MS[-1]}ms"
+            ]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "espera_media_ms": (
+                    self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0
+                ),
+                "espera_max_ms": self.wait_max * 1000,
+                "histograma_espera": dict(zip(labels, self.buckets)),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Pool assíncrono padrão que mede a espera de cada checkout. Registra em
+    `pool_metrics` por padrão; outro engine (como a réplica) pode atribuir seu
+    próprio PoolMetrics a `pool.metrics`, preservado quando o pool é recriado.
+    """
+
+    metrics = pool_metrics
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return connection
+
+
+def pool_status(pool: AsyncAdaptedQueuePool) -> dict:
+    """Estado atual do pool mais as métricas acumuladas de espera."""
+    return {
+        "tamanho": pool.size(),
+        "em_uso": pool.checkedout(),
+        "disponiveis": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        **getattr(pool, "metrics", pool_metrics).snapshot(),
+    }
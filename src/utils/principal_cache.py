@@ -0,0 +1,111 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from redis.exceptions import RedisError
+
+from src.redis_client import get_redis
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", 30))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+PRINCIPAL_RECONNECT_SECONDS = float(os.getenv("PRINCIPAL_RECONNECT_SECONDS", 5))
+
+INVALIDATION_CHANNEL = "usuarios:invalidacao"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Dados do usuário autenticado usados na autorização das rotas."""
+
+    id: int
+    role: str
+    verificado: bool
+
+
+class PrincipalCache:
+    """
+    LRU com TTL dos principals por id de usuário, local ao processo. Só é
+    consultado enquanto o processo está inscrito no canal de invalidação: sem
+    ele, alterações feitas por outros workers passariam despercebidas.
+    """
+
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_SIZE, ttl: float = PRINCIPAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.active = False
+        # Incrementada a cada invalidação: uma leitura do banco iniciada antes
+        # dela não pode repor no cache um principal já desatualizado
+        self.version = 0
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+
+    def get(self, usuario_id: int) -> Principal | None:
+        if not self.active:
+            return None
+        entry = self._entries.get(usuario_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            del self._entries[usuario_id]
+            return None
+        self._entries.move_to_end(usuario_id)
+        return principal
+
+    def put(self, principal: Principal, version: int) -> None:
+        if not self.active or self.ttl <= 0 or version != self.version:
+            return
+        self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, usuario_id: int) -> None:
+        self.version += 1
+        self._entries.pop(usuario_id, None)
+
+    def clear(self) -> None:
+        self.version += 1
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+async def invalidate_principal(usuario_id: int) -> None:
+    """
+    Remove o usuário do cache deste processo e avisa os demais pelo Redis.
+    Deve ser chamada após o commit de qualquer alteração no usuário.
+    """
+    principal_cache.invalidate(usuario_id)
+    try:
+        await get_redis().publish(INVALIDATION_CHANNEL, usuario_id)
+    except RedisError as e:
+        print(f"Erro ao publicar invalidação do usuário {usuario_id}: {str(e)}")
+
+
+async def listen_invalidations() -> None:
+    """
+    Tarefa de fundo da aplicação: aplica as invalidações publicadas pelos outros
+    processos. Enquanto a inscrição estiver fora do ar o cache fica desativado,
+    e ao reconectar ele é esvaziado, pois mensagens podem ter sido perdidas.
+    """
+    while True:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            principal_cache.clear()
+            principal_cache.active = True
+            while True:
+                # Espera curta: leituras bloqueantes esbarrariam no REDIS_SOCKET_TIMEOUT
+                message = await pubsub.get_message(timeout=1.0)
+                if message is not None:
+                    principal_cache.invalidate(int(message["data"]))
+        except (RedisError, OSError) as e:
+            print(f"Erro na inscrição de invalidação de usuários: {str(e)}")
+        finally:
+            principal_cache.active = False
+            principal_cache.clear()
+            await pubsub.aclose()
+        await asyncio.sleep(PRINCIPAL_RECONNECT_SECONDS)
@@ -0,0 +1,168 @@
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from src.redis_client import get_redis
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_LEASE_SHARE = float(os.getenv("RATE_LIMIT_LEASE_SHARE", 0.1))
+RATE_LIMIT_LEASE_SECONDS = float(os.getenv("RATE_LIMIT_LEASE_SECONDS", 2))
+RATE_LIMIT_LOCAL_SIZE = int(os.getenv("RATE_LIMIT_LOCAL_SIZE", 10000))
+# Atrás de um proxy que não é o uvicorn local, o IP do cliente vem do X-Forwarded-For
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+
+# Balde de fichas atômico. KEYS[1]: balde. ARGV: capacidade, fichas por
+# segundo, fichas pedidas (reserva) e fichas devolvidas de uma reserva
+# anterior. Concede entre 1 e o pedido, conforme o saldo, ou nenhuma; devolve
+# as fichas concedidas e, se nenhuma, os milissegundos até a próxima ficha.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local wanted = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'fichas', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + refund + math.max(0, now - ts) * rate / 1000)
+
+local granted = 0
+local retry_ms = 0
+if tokens >= 1 then
+    granted = math.min(wanted, math.floor(tokens))
+    tokens = tokens - granted
+else
+    retry_ms = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'fichas', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate))
+return {granted, retry_ms}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """`capacity` requisições seguidas, repostas ao longo de `period` segundos."""
+
+    name: str
+    capacity: int
+    period: float
+
+    @classmethod
+    def from_env(cls, name: str, env: str, default: str) -> "RateLimitRule":
+        capacity, period = os.getenv(env, default).split("/")
+        return cls(name=name, capacity=int(capacity), period=float(period))
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    @property
+    def lease(self) -> int:
+        return max(1, int(self.capacity * RATE_LIMIT_LEASE_SHARE))
+
+
+LOGIN = RateLimitRule.from_env("login", "RATE_LIMIT_LOGIN", "10/60")
+PASSWORD_RESET = RateLimitRule.from_env("password_reset", "RATE_LIMIT_PASSWORD_RESET", "5/900")
+RESEND_CODE = RateLimitRule.from_env("resend_code", "RATE_LIMIT_RESEND_CODE", "5/900")
+AUDIO_UPLOAD = RateLimitRule.from_env("audio_upload", "RATE_LIMIT_AUDIO_UPLOAD", "60/3600")
+
+
+class RateLimiter:
+    """
+    Limitador por balde de fichas no Redis, compartilhado pelos workers. Para
+    não ir ao Redis a cada requisição, o processo reserva até `rule.lease`
+    fichas de uma vez e as gasta localmente por RATE_LIMIT_LEASE_SECONDS; as
+    que sobram são devolvidas ao balde na próxima consulta. Negações também
+    ficam em cache até a próxima ficha, então um cliente insistente não gera
+    uma consulta ao Redis por tentativa. Sem Redis, as requisições passam.
+    """
+
+    def __init__(self, maxsize: int = RATE_LIMIT_LOCAL_SIZE):
+        self.maxsize = maxsize
+        # chave -> (fichas reservadas, expira em) ou (0, negado até)
+        self._local: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._script = None
+
+    def _remember(self, key: str, tokens: int, until: float) -> None:
+        self._local[key] = (tokens, until)
+        self._local.move_to_end(key)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def acquire(self, rule: RateLimitRule, identity: str) -> float:
+        """Consome uma ficha; devolve 0 se permitido ou os segundos até a próxima."""
+        key = f"rate_limit:{rule.name}:{identity}"
+        now = time.monotonic()
+        refund = 0
+        cached = self._local.pop(key, None)
+        if cached is not None:
+            tokens, until = cached
+            if until > now:
+                if tokens == 0:
+                    self._remember(key, 0, until)
+                    return until - now
+                if tokens > 1:
+                    self._remember(key, tokens - 1, until)
+                return 0.0
+            refund = tokens
+
+        if self._script is None:
+            self._script = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+        try:
+            granted, retry_ms = await self._script(
+                keys=[key],
+                args=[rule.capacity, rule.rate, rule.lease, refund],
+                client=get_redis(),
+            )
+        except RedisError as e:
+            print(f"Erro no limitador de requisições ({rule.name}): {str(e)}")
+            return 0.0
+
+        if granted == 0:
+            retry_after = retry_ms / 1000
+            self._remember(key, 0, now + retry_after)
+            return retry_after
+        if granted > 1:
+            self._remember(key, granted - 1, now + RATE_LIMIT_LEASE_SECONDS)
+        return 0.0
+
+
+rate_limiter = RateLimiter()
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "desconhecido"
+
+
+async def rate_limit(rule: RateLimitRule, *identities: str) -> None:
+    """
+    Aplica a regra a cada identidade (IP, usuário, email). Se alguma estiver
+    sem fichas, responde 429 com Retry-After.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    for identity in identities:
+        retry_after = await rate_limiter.acquire(rule, identity)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Muitas requisições. Tente novamente mais tarde.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
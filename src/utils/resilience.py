@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))
+
+CLOSED = "fechado"
+OPEN = "aberto"
+HALF_OPEN = "meio_aberto"
+
+
+class CircuitBreaker:
+    """
+    Disjuntor de uma dependência externa. Após `failure_threshold` falhas
+    seguidas ele abre, e as chamadas falham na hora, sem ocupar o worker
+    esperando timeouts. Depois de `reset_timeout` segundos uma única chamada de
+    teste é liberada (meio aberto): se der certo o disjuntor fecha, senão abre
+    de novo. Usado tanto no event loop quanto em threads (boto3).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started_at = 0.0
+        self.rejected = 0
+        self.last_error = None
+
+    def allow(self) -> bool:
+        """Indica se a chamada pode ser feita agora."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self.trial_started_at = now
+                return True
+            # Uma chamada de teste que nunca terminou não prende o disjuntor
+            if self.state == HALF_OPEN and now - self.trial_started_at >= self.reset_timeout:
+                self.trial_started_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self, error: Exception | str) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "nome": self.name,
+                "estado": self.state,
+                "falhas_seguidas": self.failures,
+                "rejeitadas": self.rejected,
+                "ultimo_erro": self.last_error,
+            }
+
+
+s3_breaker = CircuitBreaker("s3")
+redis_breaker = CircuitBreaker("redis")
+email_breaker = CircuitBreaker("email")
+
+breakers = (s3_breaker, redis_breaker, email_breaker)
+
+
+def breakers_status() -> list[dict]:
+    return [breaker.status() for breaker in breakers]
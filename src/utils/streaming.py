@@ -0,0 +1,44 @@
+import os
+from datetime import datetime
+from typing import Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from src.database import read_sessionmaker
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", 1000))
+
+
+async def _ndjson_lines(query: Select, schema: Type[BaseModel]):
+    # A sessão da requisição é encerrada antes do corpo ser enviado, então o
+    # gerador abre a sua própria (na réplica, se disponível). As linhas vêm de
+    # um cursor no servidor, em blocos de STREAM_CHUNK_SIZE, sem passar pelo
+    # identity map do ORM.
+    session_factory = await read_sessionmaker()
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+        async for rows in result.mappings().partitions():
+            yield "".join(
+                schema.model_validate(row).model_dump_json() + "\n" for row in rows
+            ).encode()
+
+
+def ndjson_response(
+    query: Select, schema: Type[BaseModel], filename: str
+) -> StreamingResponse:
+    """
+    Exporta o resultado da consulta como NDJSON (um objeto JSON por linha),
+    serializando bloco a bloco com memória constante. A consulta deve selecionar
+    colunas da tabela (não entidades ORM).
+    """
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    return StreamingResponse(
+        _ndjson_lines(query, schema),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}_{timestamp}.ndjson"'
+        },
+    )
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+
+from redis.exceptions import RedisError
+
+from src.redis_client import get_redis
+from src.utils.bloom import BloomFilter
+
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", 100000))
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", 0.001))
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", 300))
+REVOCATION_RECONNECT_SECONDS = float(os.getenv("REVOCATION_RECONNECT_SECONDS", 5))
+# Sem Redis: aceitar os tokens (true) ou recusar as requisições com 503 (false)
+REVOCATION_FAIL_OPEN = os.getenv("REVOCATION_FAIL_OPEN", "false").lower() == "true"
+
+REVOCATION_CHANNEL = "tokens:revogados"
+REVOKED_PREFIX = "blacklist:jti:"
+# Tokens emitidos antes do jti continuam na blacklist pelo token completo
+LEGACY_PREFIX = "blacklist:"
+
+
+class RevocationFilter:
+    """
+    Filtro de Bloom local dos jtis revogados. Um jti fora do filtro com certeza
+    não foi revogado e dispensa a consulta ao Redis; um jti no filtro pode ser
+    falso positivo e é confirmado no Redis, que continua sendo a fonte da
+    verdade. O filtro só é usado enquanto o processo está sincronizado.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.bloom = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+        self.rebuilt_at = 0.0
+        self.skipped = 0
+        self.lookups = 0
+
+    def might_be_revoked(self, jti: str) -> bool:
+        if not self.active or jti in self.bloom:
+            self.lookups += 1
+            return True
+        self.skipped += 1
+        return False
+
+    async def rebuild(self) -> None:
+        """Recria o filtro a partir das chaves da blacklist, descartando as expiradas."""
+        redis = get_redis()
+        jtis = [
+            key[len(REVOKED_PREFIX):].decode()
+            async for key in redis.scan_iter(match=f"{REVOKED_PREFIX}*", count=1000)
+        ]
+        bloom = BloomFilter(
+            max(REVOCATION_BLOOM_CAPACITY, 2 * len(jtis)), REVOCATION_BLOOM_ERROR_RATE
+        )
+        for jti in jtis:
+            bloom.add(jti)
+        self.bloom = bloom
+        self.rebuilt_at = time.monotonic()
+
+    def status(self) -> dict:
+        return {
+            "sincronizado": self.active,
+            "itens": self.bloom.count,
+            "bits": self.bloom.size,
+            "consultas_redis": self.lookups,
+            "consultas_evitadas": self.skipped,
+        }
+
+
+revocation_filter = RevocationFilter()
+
+
+async def revoke_jti(jti: str, ttl: int) -> None:
+    """Revoga o jti até a expiração do token e avisa os demais processos."""
+    redis = get_redis()
+    await redis.set(f"{REVOKED_PREFIX}{jti}", 1, ex=max(ttl, 1))
+    revocation_filter.bloom.add(jti)
+    try:
+        await redis.publish(REVOCATION_CHANNEL, jti)
+    except RedisError as e:
+        # Os demais processos verão a revogação na próxima reconstrução
+        print(f"Erro ao publicar revogação do token: {str(e)}")
+
+
+async def is_revoked(jti: str | None, token: str) -> bool:
+    """
+    Verifica a revogação do token. Com jti, consulta o Redis apenas quando o
+    filtro local acusa um possível revogado; tokens sem jti (emitidos antes
+    dele) são verificados no Redis pelo token completo. Se o Redis falhar, o
+    token é aceito com REVOCATION_FAIL_OPEN; senão, o RedisError é propagado.
+    """
+    if jti is None:
+        key = f"{LEGACY_PREFIX}{token}"
+    elif not revocation_filter.might_be_revoked(jti):
+        return False
+    else:
+        key = f"{REVOKED_PREFIX}{jti}"
+    try:
+        return await get_redis().exists(key) > 0
+    except RedisError as e:
+        if not REVOCATION_FAIL_OPEN:
+            raise
+        print(f"Erro ao verificar revogação do token, aceitando: {str(e)}")
+        return False
+
+
+async def sync_revocations() -> None:
+    """
+    Tarefa de fundo da aplicação: inscreve-se no canal de revogações, reconstrói
+    o filtro em seguida (para não perder revogações entre a leitura e a
+    inscrição) e a cada REVOCATION_REBUILD_SECONDS. Sem a inscrição, o filtro é
+    desativado e todas as verificações vão ao Redis.
+    """
+    while True:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(REVOCATION_CHANNEL)
+            await revocation_filter.rebuild()
+            revocation_filter.active = True
+            while True:
+                message = await pubsub.get_message(timeout=1.0)
+                if message is not None:
+                    jti = message["data"].decode()
+                    # As revogações deste processo já foram adicionadas em revoke_jti
+                    if jti not in revocation_filter.bloom:
+                        revocation_filter.bloom.add(jti)
+                if time.monotonic() - revocation_filter.rebuilt_at > REVOCATION_REBUILD_SECONDS:
+                    # Mensagens que chegam durante a reconstrução ficam no buffer
+                    # da inscrição e são aplicadas ao novo filtro em seguida
+                    await revocation_filter.rebuild()
+        except (RedisError, OSError) as e:
+            print(f"Erro na sincronização de tokens revogados: {str(e)}")
+        finally:
+            revocation_filter.active = False
+            await pubsub.aclose()
+        await asyncio.sleep(REVOCATION_RECONNECT_SECONDS)